@@ -1,6 +1,7 @@
 "\"\"\"Automation components for METRC scraping.\"\"\""
 
+from .async_robot import AsyncMetrcRobot
 from .robot import MetrcRobot
 
-__all__ = ["MetrcRobot"]
+__all__ = ["AsyncMetrcRobot", "MetrcRobot"]
 
@@ -0,0 +1,586 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Union
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Frame,
+    Locator,
+    Page,
+    Playwright,
+    TimeoutError,
+    async_playwright,
+)
+
+from src.automation.base import (
+    FILTER_TEXT,
+    LOGIN_BUTTON_TEXT,
+    BaseMetrcRobot,
+    OutcomeCallback,
+    VerificationBudget,
+)
+from src.automation.grid import (
+    GRID_EVENTS_SCRIPT,
+    GRID_FILTER_SCRIPT,
+    GRID_PAGE_SCRIPT,
+    GRID_PAGE_SIZES_SCRIPT,
+    GRID_QUERY_SCRIPT,
+    GRID_READY_SCRIPT,
+    GRID_SETTLED_SCRIPT,
+    GridFilter,
+    map_grid_records,
+    normalize_tag,
+    status_date_filter,
+    tag_filter,
+)
+from src.config import PlaywrightSettings
+from src.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+AsyncScope = Union[Page, Frame]
+
+_GOT_IT_TEXT = re.compile(r"\bGot\s*It\b", re.I)
+
+
+class AsyncMetrcRobot(BaseMetrcRobot):
+    """
+    Coroutine counterpart of :class:`MetrcRobot` built on ``playwright.async_api``.
+
+    Grid work goes through the Kendo DataSource, so several pages of one logged-in
+    browser context can filter and wait on the grid concurrently from one event loop.
+    The column-menu UI is only used when the grid widget cannot be reached.
+    """
+
+    def __init__(
+        self,
+        config: PlaywrightSettings,
+        date_range_days: int = 30,
+        tag_batch_size: int = 1,
+        verify_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            config,
+            date_range_days=date_range_days,
+            tag_batch_size=tag_batch_size,
+            verify_workers=verify_workers,
+        )
+        self._context: Optional[BrowserContext] = None
+        self._page: Optional[Page] = None
+        self._grid_dirty = False
+        self._scopes: Dict[Page, AsyncScope] = {}
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator["AsyncMetrcRobot"]:
+        """Keep one browser, context and login alive for every routine awaited inside the block."""
+        if self._page is not None:
+            yield self
+            return
+
+        async with async_playwright() as playwright:
+            with span("robot.launch"):
+                browser = await self._launch_browser(playwright)
+            context = await self._new_context(browser)
+            page = await context.new_page()
+            try:
+                await self._open_packages_page(page)
+                self._context, self._page = context, page
+                self._grid_dirty = False
+                yield self
+            finally:
+                self._context = self._page = None
+                self._scopes.clear()
+                await self._save_storage_state(context)
+                await browser.close()
+                if self._request_blocker is not None:
+                    self._request_blocker.log_summary()
+
+    @asynccontextmanager
+    async def _routine_page(self) -> AsyncIterator[Page]:
+        async with self.session():
+            page = self._page
+            if self._grid_dirty:
+                self._scopes.pop(page, None)
+                await self._open_packages_page(page)
+            self._grid_dirty = True
+            yield page
+
+    async def fetch_table_rows(self) -> List[Dict[str, str]]:
+        """Async counterpart of :meth:`MetrcRobot.fetch_table_rows`."""
+        rows: List[Dict[str, str]] = []
+        async for page_rows in self.iter_table_pages():
+            rows.extend(page_rows)
+        return rows
+
+    async def iter_table_pages(self) -> AsyncIterator[List[Dict[str, str]]]:
+        """Async counterpart of :meth:`MetrcRobot.iter_table_pages`."""
+        async with self._routine_page() as page:
+            scope = await self._grid_scope(page)
+            start_date, end_date = self._get_date_range()
+            grid_filter = status_date_filter(self.TARGET_STATUS, start_date, end_date)
+            page_size = self.config.grid_page_size or await self._read_page_size(scope)
+            with span("robot.filter.grid"):
+                try:
+                    total = await scope.evaluate(
+                        GRID_FILTER_SCRIPT,
+                        {"filter": grid_filter.to_kendo(), "pageSize": page_size},
+                    )
+                except Exception as exc:
+                    logger.debug("Grid DataSource filter failed: %s", exc)
+                    total = None
+            if total is None:
+                logger.warning("Kendo grid widget not reachable; filtering through the column menu.")
+                with span("robot.filter.status_menu"):
+                    await self._apply_column_filter_via_ui(page, "LabTestingStateName", self.FILTER_TERM)
+                # The column-menu path only filters the status; the date window is applied to extracted rows.
+                async for rows in self._iter_locator_pages(page, scope):
+                    yield self._select_target_rows(rows)
+                return
+
+            fields = list(self.COLUMN_MAP.values())
+            page_number = 1
+            fetched = 0
+            while True:
+                with span("robot.extract.page"):
+                    try:
+                        result = await scope.evaluate(
+                            GRID_PAGE_SCRIPT,
+                            {"page": page_number, "pageSize": page_size, "fields": fields},
+                        )
+                    except Exception as exc:
+                        if page_number > 1:
+                            raise
+                        logger.debug("Grid DataSource evaluation failed: %s", exc)
+                        result = None
+                if result is None:
+                    logger.warning("Kendo grid widget not reachable; falling back to per-cell extraction.")
+                    async for rows in self._iter_locator_pages(page, scope):
+                        yield self._select_target_rows(rows)
+                    return
+                rows = map_grid_records(result["rows"], self.COLUMN_MAP)
+                fetched += len(rows)
+                logger.info("Grid page %d: %d rows (%d of %d).", page_number, len(rows), fetched, result["total"])
+                yield self._select_target_rows(rows)
+                if not rows or fetched >= result["total"]:
+                    return
+                page_number += 1
+
+    async def _read_page_size(self, scope: AsyncScope) -> int:
+        try:
+            return await scope.evaluate(GRID_PAGE_SIZES_SCRIPT) or 0
+        except Exception as exc:
+            logger.debug("Unable to read the grid page sizes: %s", exc)
+            return 0
+
+    async def _iter_locator_pages(self, page: Page, scope: AsyncScope) -> AsyncIterator[List[Dict[str, str]]]:
+        """Read the rendered rows page by page, following the grid pager to the last page."""
+        next_button = scope.locator(
+            "#active-grid .k-pager-wrap a.k-pager-nav[title='Go to the next page'], "
+            "#active-grid .k-pager-wrap a.k-pager-nav[aria-label='Go to the next page']"
+        ).first
+        while True:
+            with span("robot.extract.page"):
+                rows = await self._extract_rows_via_locators(scope)
+            yield rows
+            if not rows or await next_button.count() == 0:
+                return
+            classes = await next_button.get_attribute("class") or ""
+            if "k-state-disabled" in classes or "k-disabled" in classes:
+                return
+            token = await self._arm_grid_events(scope)
+            await next_button.click()
+            await self._wait_for_grid_data(page, scope, token)
+
+    async def _arm_grid_events(self, scope: AsyncScope) -> Optional[int]:
+        """Hook the grid's dataBound/requestEnd events; returns the token for _wait_for_grid_data."""
+        try:
+            return await scope.evaluate(GRID_EVENTS_SCRIPT)
+        except Exception as exc:
+            logger.debug("Unable to hook grid events: %s", exc)
+            return None
+
+    async def _wait_for_grid_data(
+        self,
+        page: Page,
+        scope: AsyncScope,
+        token: Optional[int],
+        timeout_ms: int = 30_000,
+    ) -> None:
+        try:
+            if token is None:
+                await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+            else:
+                await scope.wait_for_function(GRID_SETTLED_SCRIPT, arg=token, timeout=timeout_ms)
+        except TimeoutError:
+            logger.warning("Grid did not bind new data within %d ms; continuing.", timeout_ms)
+
+    async def verify_status_by_tag(
+        self,
+        records: List[Mapping[str, object]],
+        on_outcome: Optional[OutcomeCallback] = None,
+        budget: Optional[VerificationBudget] = None,
+    ) -> List[Dict[str, object]]:
+        """
+        Async counterpart of :meth:`MetrcRobot.verify_status_by_tag`.
+
+        Work units of ``tag_batch_size`` tags are spread over ``verify_workers`` pages of the
+        same browser context, all sharing the session's login. ``on_outcome`` may return an
+        awaitable, which is awaited before the page moves on. Units the ``budget`` no
+        longer admits are returned as ``deferred`` outcomes.
+        """
+        items = self._normalize_records(records)
+        if not items:
+            return []
+
+        async with self._routine_page() as page:
+            self._on_outcome = on_outcome
+            self._budget = budget
+            units = [items[start : start + self.tag_batch_size] for start in range(0, len(items), self.tag_batch_size)]
+            work: "asyncio.Queue[tuple[int, List[tuple[str, str]]]]" = asyncio.Queue()
+            for index, unit in enumerate(units):
+                work.put_nowait((index, unit))
+            results: Dict[int, List[Dict[str, object]]] = {}
+
+            pages = [page]
+            try:
+                extra = min(self.verify_workers, len(units)) - 1
+                if extra > 0:
+                    opened = await asyncio.gather(
+                        *(self._open_worker_page() for _ in range(extra)),
+                        return_exceptions=True,
+                    )
+                    for result in opened:
+                        if isinstance(result, BaseException):
+                            logger.warning("Unable to open a verification page (%s); continuing without it.", result)
+                        else:
+                            pages.append(result)
+                logger.info("Verifying %d tags in %d units with %d pages.", len(items), len(units), len(pages))
+                drained = await asyncio.gather(
+                    *(self._drain_verification_queue(worker, work, results) for worker in pages),
+                    return_exceptions=True,
+                )
+                for number, result in enumerate(drained):
+                    if isinstance(result, BaseException):
+                        logger.warning("Verification page %d stopped: %s", number, result)
+                # A page that failed mid-unit took that unit with it; verify those on the main page.
+                for index, unit in enumerate(units):
+                    if index not in results:
+                        logger.warning("Work unit %d was abandoned by its page; verifying it on the main page.", index)
+                        work.put_nowait((index, unit))
+                await self._drain_verification_queue(page, work, results)
+            finally:
+                self._on_outcome = None
+                self._budget = None
+                for worker in pages[1:]:
+                    self._scopes.pop(worker, None)
+                    await worker.close()
+
+            outcomes: List[Dict[str, object]] = []
+            for index in range(len(units)):
+                outcomes.extend(results[index])
+            self._log_missing_tags(outcomes)
+            return outcomes
+
+    async def _open_worker_page(self) -> Page:
+        page = await self._context.new_page()
+        try:
+            await self._open_packages_page(page)
+        except Exception:
+            await page.close()
+            raise
+        return page
+
+    async def _drain_verification_queue(
+        self,
+        page: Page,
+        work: "asyncio.Queue[tuple[int, List[tuple[str, str]]]]",
+        results: Dict[int, List[Dict[str, object]]],
+    ) -> None:
+        while not work.empty():
+            index, unit = work.get_nowait()
+            if not self._admit(len(unit)):
+                results[index] = self._deferred_outcomes(unit)
+            else:
+                started = time.monotonic()
+                results[index] = await self._verify_unit(page, unit)
+                self._record_unit(len(unit), started)
+            await self._emit_outcomes_async(results[index])
+
+    async def _emit_outcomes_async(self, outcomes: List[Dict[str, object]]) -> None:
+        if self._on_outcome is None or not outcomes:
+            return
+        result = self._on_outcome(outcomes)
+        if inspect.isawaitable(result):
+            await result
+
+    async def _verify_unit(self, page: Page, unit: List[tuple[str, str]]) -> List[Dict[str, object]]:
+        try:
+            with span("robot.verify.batch"):
+                records = await self._query_grid(
+                    page,
+                    tag_filter(metrc_id for metrc_id, _ in unit),
+                    fields=[self.COLUMN_MAP["Tag"], self.COLUMN_MAP["LT Status"]],
+                    page_size=len(unit),
+                )
+        except Exception as exc:
+            logger.warning("Grid query failed (%s); verifying %d tags through the column menu.", exc, len(unit))
+            records = None
+        if records is not None:
+            logger.info("Tag filter returned %d rows for %d tags.", len(records), len(unit))
+            return self._build_batch_outcomes(unit, records)
+
+        outcomes: List[Dict[str, object]] = []
+        for metrc_id, current_status in unit:
+            with span("robot.verify.tag"):
+                outcomes.append(await self._verify_single_tag_via_ui(page, metrc_id, current_status))
+        return outcomes
+
+    async def _verify_single_tag_via_ui(self, page: Page, metrc_id: str, current_status: str) -> Dict[str, object]:
+        error: Optional[str] = None
+        for attempt in range(1, self.max_tag_filter_retries + 1):
+            try:
+                with span("robot.filter.tag"):
+                    await self._apply_column_filter_via_ui(page, "Label", metrc_id, operators=["eq", "equals"])
+                rows = await self._extract_rows_via_locators(await self._grid_scope(page), limit=1)
+            except Exception as exc:
+                logger.warning("Tag %s attempt %d failed: %s", metrc_id, attempt, exc)
+                error = str(exc)
+                continue
+            if rows and normalize_tag(rows[0]["Tag"]) == normalize_tag(metrc_id):
+                lt_status = rows[0]["LT Status"].strip()
+                return {
+                    "metrc_id": metrc_id,
+                    "current_status": current_status,
+                    "fetched_status": lt_status,
+                    "changed": lt_status != current_status,
+                    "attempts": attempt,
+                    "success": True,
+                }
+        logger.error("Tag %s: no matching rows after %d attempts.", metrc_id, self.max_tag_filter_retries)
+        outcome: Dict[str, object] = {
+            "metrc_id": metrc_id,
+            "current_status": current_status,
+            "fetched_status": None,
+            "changed": False,
+            "attempts": self.max_tag_filter_retries,
+            "success": False,
+        }
+        if error:
+            outcome["error"] = error
+        return outcome
+
+    async def _launch_browser(self, playwright: Playwright) -> Browser:
+        if self._warm_browser is not None:
+            browser = await self._warm_browser.connect_async(playwright, self.config.slow_mo_ms)
+            if browser is not None:
+                return browser
+            logger.warning("Warm browser unavailable; launching a private Chromium.")
+        logger.info("Launching Chromium (headless=%s, async)", self.config.headless)
+        return await playwright.chromium.launch(
+            headless=self.config.headless,
+            slow_mo=self.config.slow_mo_ms,
+        )
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        state = self._load_storage_state()
+        context = await (browser.new_context(storage_state=state) if state else browser.new_context())
+        if self._request_blocker is not None:
+            await self._request_blocker.install_async(context)
+        if self._overlay_guard is not None:
+            await self._overlay_guard.install_async(context)
+        return context
+
+    async def _save_storage_state(self, context: BrowserContext) -> None:
+        try:
+            state = await context.storage_state()
+        except Exception as exc:
+            logger.warning("Unable to capture session state: %s", exc)
+            return
+        self._store_storage_state(state)
+
+    async def _open_packages_page(self, page: Page) -> None:
+        await page.goto(self.config.base_url, wait_until="domcontentloaded")
+        await self._login_if_needed(page)
+        with span("robot.navigate"):
+            await self._navigate_to_packages(page)
+        if self._overlay_guard is None:
+            await self._dismiss_overlays(page)
+
+    async def _login_if_needed(self, page: Page) -> None:
+        login_button = page.locator(self.LOGIN_BUTTON_SELECTOR, has_text=LOGIN_BUTTON_TEXT)
+        if await login_button.count() == 0:
+            logger.info("Session already authenticated, skipping login.")
+            return
+
+        logger.info("Logging into METRC portal.")
+        username_field = await self._first_existing_locator(page, self.USERNAME_SELECTORS)
+        password_field = await self._first_existing_locator(page, self.PASSWORD_SELECTORS)
+        if username_field is None or password_field is None:
+            raise RuntimeError("Unable to locate username/password fields on login page.")
+
+        with span("robot.login"):
+            await username_field.fill(self.config.username, timeout=5_000)
+            await password_field.fill(self.config.password, timeout=5_000)
+            async with page.expect_navigation(wait_until="domcontentloaded", timeout=30_000):
+                await login_button.first.click()
+            await page.wait_for_load_state("networkidle", timeout=30_000)
+            logger.info("Login completed.")
+            await self._save_storage_state(page.context)
+            await page.goto(self.config.base_url, wait_until="domcontentloaded")
+
+    async def _navigate_to_packages(self, page: Page) -> None:
+        try:
+            await page.wait_for_url("**/packages*", timeout=20_000)
+        except TimeoutError:
+            logger.warning("URL didn't update to packages explicitly; continuing with manual waits.")
+
+        tab_selector = "li[data-grid-selector='#active-grid'] span.k-link"
+        try:
+            await page.wait_for_selector(tab_selector, timeout=20_000)
+            active_tab = page.locator(tab_selector).first
+            parent_li = active_tab.locator("xpath=ancestor::li[1]")
+            if "k-state-active" not in (await parent_li.get_attribute("class") or ""):
+                await active_tab.click()
+        except TimeoutError:
+            logger.info("Active tab not found; proceeding without explicit click.")
+
+        await self._wait_for_grid_ready(page)
+
+    async def _dismiss_overlays(self, page: Page) -> None:
+        got_it = page.get_by_role("button", name=_GOT_IT_TEXT)
+        if await got_it.count() and await got_it.first.is_visible():
+            try:
+                await got_it.first.click(timeout=2_000)
+                logger.info("Dismissed CSV Templates modal (Got It).")
+            except Exception:
+                logger.warning("Failed to dismiss CSV Templates modal.")
+        if await page.locator("iframe[title='interactive guide'], .stn-wdgt").count():
+            await page.add_style_tag(content=".stn-wdgt { display: none !important; }")
+        alerts = page.locator("span[data-dismiss='alert'][data-donotshow-cookiename]")
+        for index in range(await alerts.count()):
+            button = alerts.nth(index)
+            if await button.is_visible():
+                try:
+                    await button.click(timeout=2_000)
+                except Exception:
+                    logger.warning("Failed to dismiss a system alert.")
+
+    async def _query_grid(
+        self,
+        page: Page,
+        filter: GridFilter,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = 0,
+    ) -> Optional[List[Mapping[str, object]]]:
+        scope = await self._grid_scope(page)
+        return await scope.evaluate(
+            GRID_QUERY_SCRIPT,
+            {
+                "filter": filter.to_kendo(),
+                "pageSize": page_size,
+                "fields": list(fields or self.COLUMN_MAP.values()),
+            },
+        )
+
+    async def _apply_column_filter_via_ui(
+        self,
+        page: Page,
+        data_field: str,
+        value: str,
+        *,
+        operators: Optional[List[str]] = None,
+    ) -> None:
+        logger.info("Applying %s filter '%s' through the column menu.", data_field, value)
+        scope = await self._grid_scope(page)
+        header = scope.locator(f"#active-grid thead.k-grid-header th[data-field='{data_field}']").first
+        await header.wait_for(state="visible", timeout=30_000)
+        await header.locator("a.k-header-column-menu").first.click(timeout=5_000, force=True)
+
+        filter_item = page.locator("div.k-animation-container:visible li.k-item span.k-link", has_text=FILTER_TEXT)
+        await filter_item.last.wait_for(state="visible", timeout=5_000)
+        await filter_item.last.evaluate("el => el.click()")
+
+        popup = page.locator("div.k-animation-container:visible").filter(
+            has=page.locator("button.k-button.k-primary", has_text=FILTER_TEXT)
+        ).last
+        await popup.wait_for(state="visible", timeout=5_000)
+        if operators:
+            dropdown = popup.locator("select[data-role='dropdownlist']").first
+            if await dropdown.count():
+                for operator in operators:
+                    try:
+                        await dropdown.select_option(value=operator, timeout=2_000)
+                        break
+                    except Exception:
+                        continue
+        await popup.locator("input[title='Filter Criteria'], input[type='text']").first.fill(value, timeout=5_000)
+        await popup.locator("button.k-button.k-primary", has_text=FILTER_TEXT).first.click(timeout=5_000)
+        await self._wait_for_grid_ready(page)
+
+    async def _extract_rows_via_locators(self, scope: AsyncScope, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        grid_rows = scope.locator("#active-grid table tbody tr[role='row']")
+        row_count = await grid_rows.count()
+        if limit is not None:
+            row_count = min(row_count, limit)
+        extracted: List[Dict[str, str]] = []
+        for index in range(row_count):
+            row = grid_rows.nth(index)
+            row_data: Dict[str, str] = {}
+            for label, data_field in self.COLUMN_MAP.items():
+                row_data[label] = await self._get_cell_text(row, data_field)
+            extracted.append(row_data)
+        return extracted
+
+    async def _get_cell_text(self, row: Locator, data_field: str) -> str:
+        cell = row.locator(f"td[data-field='{data_field}']").first
+        if await cell.count() == 0:
+            return ""
+        return " ".join((await cell.inner_text(timeout=5_000)).split())
+
+    async def _first_existing_locator(self, page: Page, selectors: List[str]) -> Optional[Locator]:
+        for selector in selectors:
+            locator = page.locator(selector).first
+            if await locator.count() > 0:
+                try:
+                    await locator.wait_for(state="visible", timeout=5_000)
+                except TimeoutError:
+                    continue
+                return locator
+        return None
+
+    async def _wait_for_grid_ready(self, page: Page) -> None:
+        scope = await self._grid_scope(page)
+        await scope.locator("#active-grid table tbody").wait_for(state="visible", timeout=20_000)
+        try:
+            await scope.wait_for_function(GRID_READY_SCRIPT, timeout=20_000)
+        except TimeoutError:
+            logger.warning("Grid reported no rows or finished read after waiting.")
+
+    async def _grid_scope(self, page: Page) -> AsyncScope:
+        if page in self._scopes:
+            return self._scopes[page]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 30
+        while loop.time() < deadline:
+            for scope in [page, *page.frames]:
+                try:
+                    if await scope.locator("#active-grid").count() > 0:
+                        self._scopes[page] = scope
+                        return scope
+                except TimeoutError:
+                    continue
+            await asyncio.sleep(0.5)
+        raise TimeoutError("Unable to locate the METRC packages grid.")
+
+
+__all__ = ["AsyncMetrcRobot"]
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Protocol
+
+from src.automation.browser_server import WarmBrowser
+from src.automation.grid import map_grid_records, normalize_tag
+from src.automation.overlays import OverlayGuard
+from src.automation.routing import RequestBlocker
+from src.config import PlaywrightSettings
+
+logger = logging.getLogger(__name__)
+
+# Called with the outcomes of each verification unit (one tag or one batch) as soon as the
+# unit is settled (see ``verify_status_by_tag``).
+OutcomeCallback = Callable[[List[Dict[str, object]]], object]
+
+
+class VerificationBudget(Protocol):
+    """Time budget consulted before each verification unit (see ``RunScheduler``)."""
+
+    def admit(self, tag_count: int) -> bool: ...
+
+    def record(self, tag_count: int, seconds: float) -> None: ...
+
+
+LOGIN_BUTTON_TEXT = re.compile(r"\bLog in\b", re.I)
+FILTER_TEXT = re.compile(r"\bFilter\b", re.I)
+
+
+class BaseMetrcRobot:
+    """Engine-independent state and row/outcome handling shared by the sync and async robots."""
+
+    COLUMN_MAP: Mapping[str, str] = {
+        "Tag": "Label",
+        "Src H's": "SourceHarvestNames",
+        "Src Pkg's": "SourcePackageLabels",
+        "Src Pj's": "SourceProcessingJobNames",
+        "Location": "LocationName",
+        "Sublocation": "SublocationName",
+        "Item": "Item.Name",
+        "Category": "Item.ProductCategoryName",
+        "Item Strain": "Item.StrainName",
+        "Quantity": "Quantity",
+        "UoM": "UnitOfMeasureAbbreviation",
+        "P.B. No.": "ProductionBatchNumber",
+        "LT Status": "LabTestingStateName",
+        "A.H.": "IsOnHold",
+        "Date": "PackagedDate",
+        "Rcv'd": "ReceivedDateTime",
+        "L.T.E.": "LabTestResultExpirationDateTime",
+    }
+
+    FILTER_TERM = "pro"
+    TARGET_STATUS = "TestingInProgress"
+
+    LOGIN_BUTTON_SELECTOR = "button.metrc-btn.metrc-btn-confirm"
+    USERNAME_SELECTORS: List[str] = [
+        "input[name='userName']",
+        "input[name='username']",
+        "input#UserName",
+        "input[id='username']",
+        "input[type='text']",
+    ]
+    PASSWORD_SELECTORS: List[str] = [
+        "input[name='password']",
+        "input#Password",
+        "input[id='password']",
+        "input[type='password']",
+    ]
+
+    def __init__(
+        self,
+        config: PlaywrightSettings,
+        date_range_days: int = 30,
+        tag_batch_size: int = 1,
+        verify_workers: int = 1,
+    ) -> None:
+        self.config = config
+        self.date_range_days = max(1, date_range_days)
+        self.tag_batch_size = max(1, tag_batch_size)
+        self.verify_workers = max(1, verify_workers)
+        self.max_tag_filter_retries = 3
+        self._storage_state_path = Path(config.storage_state_path) if config.storage_state_path else None
+        self._storage_state: Optional[Dict[str, object]] = None
+        self._request_blocker = RequestBlocker.from_settings(config)
+        self._overlay_guard = OverlayGuard() if config.overlay_guard else None
+        self._warm_browser = WarmBrowser.from_settings(config)
+        self._on_outcome: Optional[OutcomeCallback] = None
+        self._budget: Optional[VerificationBudget] = None
+
+    def _normalize_records(self, records: List[Mapping[str, object]]) -> List[tuple[str, str]]:
+        items: List[tuple[str, str]] = []
+        for record in records:
+            metrc_id = (record.get("Tag") or "").strip()
+            if not metrc_id:
+                logger.warning("Skipping record with empty Tag.")
+                continue
+            items.append((metrc_id, (record.get("LT Status") or "").strip()))
+        return items
+
+    def _select_target_rows(self, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Apply the date window and TestingInProgress checks to freshly extracted rows."""
+        filtered = self._filter_rows_by_date(rows)
+        logger.info(
+            "Date validation (last %d days): kept %d of %d rows",
+            self.date_range_days,
+            len(filtered),
+            len(rows),
+        )
+        if len(filtered) < len(rows):
+            logger.warning("Discarded %d rows outside date range.", len(rows) - len(filtered))
+        filtered_testing = [
+            row for row in filtered if (row.get("LT Status") or "").strip() == self.TARGET_STATUS
+        ]
+        logger.info(
+            "TestingInProgress filter: kept %d of %d rows after date check.",
+            len(filtered_testing),
+            len(filtered),
+        )
+        return filtered_testing
+
+    def _filter_rows_by_date(self, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Keep only rows whose 'Date' is within [today - date_range_days, today] inclusive."""
+        if not rows:
+            return rows
+        start_date, today = self._get_date_range()
+        kept: List[Dict[str, str]] = []
+        for row in rows:
+            raw_date = row.get("Date")
+            parsed = self._parse_row_date(raw_date)
+            if parsed is None:
+                logger.debug("Skipping row with unparsable Date: %s", raw_date)
+                continue
+            if start_date <= parsed <= today:
+                kept.append(row)
+            else:
+                logger.debug("Dropping row with Date %s outside range %s - %s", parsed, start_date, today)
+        return kept
+
+    def _parse_row_date(self, value: object) -> Optional[date]:
+        if value is None:
+            return None
+        text = str(value).strip()
+        if not text:
+            return None
+        text = text.split()[0]  # drop time if present
+        try:
+            return datetime.strptime(text, "%m/%d/%Y").date()
+        except ValueError:
+            return None
+
+    def _get_date_range(self) -> tuple[date, date]:
+        today = datetime.now(timezone.utc).date()
+        return today - timedelta(days=self.date_range_days), today
+
+    def _load_storage_state(self) -> Optional[Dict[str, object]]:
+        if self._storage_state is not None:
+            return self._storage_state
+        path = self._storage_state_path
+        if path is None or not path.exists():
+            return None
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable session state %s: %s", path, exc)
+            return None
+        logger.info("Restoring saved METRC session from %s.", path)
+        self._storage_state = state
+        return state
+
+    def _store_storage_state(self, state: Dict[str, object]) -> None:
+        self._storage_state = state
+        path = self._storage_state_path
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            # The state holds live METRC session cookies: owner-only, whatever the umask.
+            # A leftover tmp file would keep its old mode, so start from a fresh one.
+            tmp_path.unlink(missing_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(state, handle)
+            os.replace(tmp_path, path)
+            logger.debug("Saved METRC session state to %s.", path)
+        except OSError as exc:
+            logger.warning("Unable to save session state to %s: %s", path, exc)
+
+    def _build_batch_outcomes(
+        self,
+        batch: List[tuple[str, str]],
+        records: List[Mapping[str, object]],
+    ) -> List[Dict[str, object]]:
+        statuses: Dict[str, str] = {}
+        for row in map_grid_records(records, self.COLUMN_MAP):
+            statuses.setdefault(normalize_tag(row["Tag"]), row["LT Status"].strip())
+
+        outcomes: List[Dict[str, object]] = []
+        for metrc_id, current_status in batch:
+            lt_status = statuses.get(normalize_tag(metrc_id))
+            if lt_status is None:
+                outcomes.append(
+                    {
+                        "metrc_id": metrc_id,
+                        "current_status": current_status,
+                        "fetched_status": None,
+                        "changed": False,
+                        "attempts": 1,
+                        "success": False,
+                        "missing": True,
+                        "error": "Tag not present in batch filter result.",
+                    }
+                )
+                continue
+            outcomes.append(
+                {
+                    "metrc_id": metrc_id,
+                    "current_status": current_status,
+                    "fetched_status": lt_status,
+                    "changed": lt_status != current_status,
+                    "attempts": 1,
+                    "success": True,
+                }
+            )
+        return outcomes
+
+    def _admit(self, tag_count: int) -> bool:
+        return self._budget is None or self._budget.admit(tag_count)
+
+    def _record_unit(self, tag_count: int, started: float) -> None:
+        if self._budget is not None:
+            self._budget.record(tag_count, time.monotonic() - started)
+
+    def _deferred_outcomes(self, items: List[tuple[str, str]]) -> List[Dict[str, object]]:
+        """Outcomes for tags left unverified because the run budget is spent."""
+        return [
+            {
+                "metrc_id": metrc_id,
+                "current_status": current_status,
+                "fetched_status": None,
+                "changed": False,
+                "attempts": 0,
+                "success": False,
+                "deferred": True,
+            }
+            for metrc_id, current_status in items
+        ]
+
+    def _emit_outcomes(self, outcomes: List[Dict[str, object]]) -> None:
+        if self._on_outcome is not None and outcomes:
+            self._on_outcome(outcomes)
+
+    def _log_missing_tags(self, outcomes: List[Dict[str, object]]) -> None:
+        missing = [outcome["metrc_id"] for outcome in outcomes if outcome.get("missing")]
+        if missing:
+            logger.warning("%d tag(s) not found in the grid: %s", len(missing), ", ".join(missing))
+
+
+__all__ = ["BaseMetrcRobot", "FILTER_TEXT", "LOGIN_BUTTON_TEXT"]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser as AsyncBrowser, Playwright as AsyncPlaywright
+from playwright.sync_api import Browser, Error as PlaywrightError, Playwright
+
+from src.config import PlaywrightSettings
+
+logger = logging.getLogger(__name__)
+
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+class WarmBrowser:
+    """
+    Long-lived Chromium shared by successive runs, so a run connects in well under a
+    second instead of paying a cold launch.
+
+    ``http://host:port`` endpoints are Chromium DevTools endpoints reached with
+    ``connect_over_cdp``; a local one that does not answer its health check is
+    (re)launched as a detached process when ``autolaunch`` is on. ``ws://`` endpoints
+    point at a Playwright browser server (``npx playwright run-server``) and are reached
+    with ``connect``. Closing a connected browser only disconnects from it.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        autolaunch: bool = True,
+        headless: bool = True,
+        profile_dir: Optional[Path] = None,
+        startup_timeout_s: float = 15.0,
+    ) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.autolaunch = autolaunch
+        self.headless = headless
+        self.profile_dir = profile_dir
+        self.startup_timeout_s = startup_timeout_s
+
+    @classmethod
+    def from_settings(cls, config: PlaywrightSettings, endpoint: Optional[str] = None) -> Optional["WarmBrowser"]:
+        endpoint = endpoint or config.browser_endpoint
+        if not endpoint:
+            return None
+        return cls(
+            endpoint,
+            autolaunch=config.browser_autolaunch,
+            headless=config.headless,
+            profile_dir=Path(config.browser_profile_dir) if config.browser_profile_dir else None,
+        )
+
+    @property
+    def uses_cdp(self) -> bool:
+        return urlsplit(self.endpoint).scheme in {"http", "https"}
+
+    def healthy(self) -> bool:
+        """Whether the DevTools endpoint answers; websocket servers are checked by connecting."""
+        if not self.uses_cdp:
+            return True
+        try:
+            with urllib.request.urlopen(f"{self.endpoint}/json/version", timeout=1.0) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+
+    def browser_version(self) -> Optional[str]:
+        """The ``Browser`` string the DevTools endpoint reports (``HeadlessChrome/<version>``)."""
+        if not self.uses_cdp:
+            return None
+        try:
+            with urllib.request.urlopen(f"{self.endpoint}/json/version", timeout=1.0) as response:
+                payload = json.load(response)
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+        return payload.get("Browser") if isinstance(payload, dict) else None
+
+    def ensure_running(self, executable_path: str) -> bool:
+        """Make sure the endpoint is up, launching a detached Chromium if allowed."""
+        if self.healthy():
+            return True
+        parts = urlsplit(self.endpoint)
+        if not (self.autolaunch and self.uses_cdp and parts.hostname in _LOCAL_HOSTS and parts.port):
+            logger.warning("Warm browser at %s is not reachable.", self.endpoint)
+            return False
+        logger.info("Starting warm Chromium on port %d.", parts.port)
+        subprocess.Popen(
+            self._chromium_args(executable_path, parts.port),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + self.startup_timeout_s
+        while time.monotonic() < deadline:
+            if self.healthy():
+                return True
+            time.sleep(0.2)
+        logger.warning("Warm Chromium did not come up within %.0fs.", self.startup_timeout_s)
+        return False
+
+    def connect(self, playwright: Playwright, slow_mo_ms: int = 0) -> Optional[Browser]:
+        """Connect to the warm browser, or return None so the caller launches its own."""
+        try:
+            if self.uses_cdp:
+                if not self.ensure_running(playwright.chromium.executable_path):
+                    return None
+                browser = playwright.chromium.connect_over_cdp(self.endpoint, timeout=10_000, slow_mo=slow_mo_ms)
+            else:
+                browser = playwright.chromium.connect(self.endpoint, timeout=10_000, slow_mo=slow_mo_ms)
+        except PlaywrightError as exc:
+            logger.warning("Unable to connect to the warm browser at %s: %s", self.endpoint, exc)
+            return None
+        logger.info("Connected to warm browser at %s.", self.endpoint)
+        return browser
+
+    async def connect_async(self, playwright: AsyncPlaywright, slow_mo_ms: int = 0) -> Optional[AsyncBrowser]:
+        try:
+            if self.uses_cdp:
+                running = await asyncio.to_thread(self.ensure_running, playwright.chromium.executable_path)
+                if not running:
+                    return None
+                browser = await playwright.chromium.connect_over_cdp(self.endpoint, timeout=10_000, slow_mo=slow_mo_ms)
+            else:
+                browser = await playwright.chromium.connect(self.endpoint, timeout=10_000, slow_mo=slow_mo_ms)
+        except PlaywrightError as exc:
+            logger.warning("Unable to connect to the warm browser at %s: %s", self.endpoint, exc)
+            return None
+        logger.info("Connected to warm browser at %s.", self.endpoint)
+        return browser
+
+    def _chromium_args(self, executable_path: str, port: int) -> List[str]:
+        args = [
+            executable_path,
+            f"--remote-debugging-port={port}",
+            "--remote-debugging-address=127.0.0.1",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-dev-shm-usage",
+        ]
+        if self.profile_dir is not None:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            args.append(f"--user-data-dir={self.profile_dir.resolve()}")
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+        return args
+
+
+__all__ = ["WarmBrowser"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from playwright.sync_api import APIRequestContext, Error as PlaywrightError
+
+from src.automation.grid import GridFilter, extract_grid_records
+from src.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class MetrcDataClientError(RuntimeError):
+    """Raised when the grid data endpoint cannot be queried directly."""
+
+
+@dataclass(frozen=True)
+class GridEndpoint:
+    url: str
+    method: str = "GET"
+    content_type: Optional[str] = None
+
+    @property
+    def sends_json(self) -> bool:
+        return self.method != "GET" and "json" in (self.content_type or "").lower()
+
+
+class MetrcDataClient:
+    """
+    Calls the packages grid data endpoint directly, reusing the authenticated browser
+    context's cookies through Playwright's APIRequestContext.
+
+    Requests carry the same server-side operations the Kendo grid sends (filter, sort,
+    page, pageSize), so one HTTP call replaces a whole popup-driven UI flow.
+    """
+
+    DEFAULT_PAGE_SIZE = 500
+
+    def __init__(self, request: APIRequestContext, endpoint: GridEndpoint, *, timeout_ms: int = 30_000) -> None:
+        self.request = request
+        self.endpoint = endpoint
+        self.timeout_ms = timeout_ms
+
+    def fetch_page(
+        self,
+        *,
+        filter: Optional[GridFilter] = None,
+        sort: Optional[Sequence[Mapping[str, str]]] = None,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        skip: Optional[int] = None,
+    ) -> Tuple[List[Mapping[str, object]], Optional[int]]:
+        """Return the records of one page and the server-side total (when reported)."""
+        query: Dict[str, object] = {
+            "take": page_size,
+            "skip": (page - 1) * page_size if skip is None else skip,
+            "page": page,
+            "pageSize": page_size,
+        }
+        if sort:
+            query["sort"] = list(sort)
+        if filter is not None:
+            query["filter"] = filter.to_kendo()
+        query = _to_jsonable(query)
+
+        options: Dict[str, object] = {
+            "method": self.endpoint.method,
+            "headers": {"X-Requested-With": "XMLHttpRequest", "Accept": "application/json"},
+            "timeout": self.timeout_ms,
+        }
+        if self.endpoint.method == "GET":
+            options["params"] = _flatten_params(query)
+        elif self.endpoint.sends_json:
+            options["headers"]["Content-Type"] = self.endpoint.content_type
+            options["data"] = json.dumps(query)
+        else:
+            options["form"] = _flatten_params(query)
+
+        try:
+            with span("robot.data_client.request"):
+                response = self.request.fetch(self.endpoint.url, **options)
+        except PlaywrightError as exc:
+            raise MetrcDataClientError(f"Grid data request failed: {exc}") from exc
+        if not response.ok:
+            raise MetrcDataClientError(f"Grid data endpoint answered HTTP {response.status} for {self.endpoint.url}")
+        try:
+            payload = response.json()
+        except Exception as exc:
+            raise MetrcDataClientError("Grid data endpoint did not return JSON (session expired?)") from exc
+
+        extracted = extract_grid_records(payload)
+        if extracted is None:
+            raise MetrcDataClientError("Unrecognized grid data payload.")
+        return extracted
+
+    def iter_pages(
+        self,
+        *,
+        filter: Optional[GridFilter] = None,
+        sort: Optional[Sequence[Mapping[str, str]]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[List[Mapping[str, object]]]:
+        """
+        Yield every page of the filtered result, one request per page.
+
+        Paging stops on an empty page or once the reported total is reached; a short page
+        alone is not the end, since servers may cap ``pageSize`` below what was asked.
+        """
+        fetched = 0
+        while True:
+            page = fetched // page_size + 1
+            records, total = self.fetch_page(filter=filter, sort=sort, page=page, page_size=page_size, skip=fetched)
+            logger.debug("Data client page %d: %d records (total %s).", page, len(records), total)
+            if not records:
+                return
+            fetched += len(records)
+            yield records
+            if total is not None and fetched >= total:
+                return
+            if len(records) < page_size:
+                # Capped (or last) page: ask for what the server serves so page and skip agree.
+                page_size = len(records)
+
+    def fetch_records(
+        self,
+        *,
+        filter: Optional[GridFilter] = None,
+        sort: Optional[Sequence[Mapping[str, str]]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> List[Mapping[str, object]]:
+        records: List[Mapping[str, object]] = []
+        for chunk in self.iter_pages(filter=filter, sort=sort, page_size=page_size):
+            records.extend(chunk)
+        return records
+
+
+def _to_jsonable(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return {key: _to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    return value
+
+
+def _flatten_params(value: object, prefix: str = "") -> Dict[str, str]:
+    """Encode nested request options the way jQuery.param does (``filter[filters][0][field]``)."""
+    flat: Dict[str, str] = {}
+    if isinstance(value, Mapping):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        if isinstance(value, bool):
+            flat[prefix] = "true" if value else "false"
+        else:
+            flat[prefix] = "" if value is None else str(value)
+        return flat
+    for key, item in items:
+        flat.update(_flatten_params(item, f"{prefix}[{key}]" if prefix else str(key)))
+    return flat
+
+
+__all__ = ["GridEndpoint", "MetrcDataClient", "MetrcDataClientError"]
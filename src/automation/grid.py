@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+# Shared helpers prepended to the grid scripts below. `findGrid` returns null when jQuery
+# or the kendoGrid widget cannot be reached so callers can fall back to the DOM locators.
+_GRID_HELPERS = """
+    const findGrid = () => {
+        const element = document.querySelector('#active-grid');
+        const jq = window.jQuery || window.$;
+        if (!element || !jq) { return null; }
+        const grid = jq(element).data('kendoGrid');
+        return grid && grid.dataSource ? grid : null;
+    };
+    const pad = n => String(n).padStart(2, '0');
+    const serialize = value => {
+        if (value === null || value === undefined) { return null; }
+        if (value instanceof Date) {
+            return `${value.getFullYear()}-${pad(value.getMonth() + 1)}-${pad(value.getDate())}` +
+                `T${pad(value.getHours())}:${pad(value.getMinutes())}:${pad(value.getSeconds())}`;
+        }
+        if (typeof value.toJSON === 'function') { value = value.toJSON(); }
+        if (Array.isArray(value)) { return value.map(serialize); }
+        return value;
+    };
+    const resolve = (item, path) => path.split('.').reduce(
+        (current, key) => (current === null || current === undefined ? undefined : current[key]),
+        item,
+    );
+    const readView = (grid, fields) => grid.dataSource.view().map(item => {
+        const record = {};
+        for (const field of fields) { record[field] = serialize(resolve(item, field)); }
+        return record;
+    });
+"""
+
+# Reads the rows currently held by the grid's DataSource in a single round trip.
+GRID_ROWS_SCRIPT = (
+    "(fields) => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    return grid ? readView(grid, fields) : null;
+}
+"""
+)
+
+# Applies a filter to the DataSource (first page, at least `pageSize` rows), waits for the
+# read to finish and returns the resulting rows, all in a single round trip.
+GRID_QUERY_SCRIPT = (
+    "async ({ filter, pageSize, fields }) => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    if (!grid) { return null; }
+    const dataSource = grid.dataSource;
+    const size = Math.max(pageSize || 0, dataSource.pageSize() || 0) || undefined;
+    await dataSource.query({ filter, page: 1, pageSize: size, sort: dataSource.sort(), group: dataSource.group() });
+    return readView(grid, fields);
+}
+"""
+)
+
+# Applies a filter to the DataSource (first page of `pageSize` rows, or the current page
+# size), waits for the read to finish and returns the number of matching rows, or null
+# when the widget is unreachable.
+GRID_FILTER_SCRIPT = (
+    "async ({ filter, pageSize }) => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    if (!grid) { return null; }
+    const dataSource = grid.dataSource;
+    await dataSource.query({
+        filter,
+        page: 1,
+        pageSize: pageSize || dataSource.pageSize(),
+        sort: dataSource.sort(),
+        group: dataSource.group(),
+    });
+    return dataSource.total();
+}
+"""
+)
+
+# Loads page `page` of the current filter (only when it is not already the loaded page)
+# and returns its rows (when `fields` is non-empty) together with the DataSource total.
+GRID_PAGE_SCRIPT = (
+    "async ({ page, pageSize, fields }) => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    if (!grid) { return null; }
+    const dataSource = grid.dataSource;
+    const size = pageSize || dataSource.pageSize();
+    if ((dataSource.page() || 1) !== page || (size && dataSource.pageSize() !== size)) {
+        await dataSource.query({
+            filter: dataSource.filter(),
+            page,
+            pageSize: size,
+            sort: dataSource.sort(),
+            group: dataSource.group(),
+        });
+    }
+    return { rows: fields.length ? readView(grid, fields) : null, total: dataSource.total() };
+}
+"""
+)
+
+# Largest page size offered by the grid's pager (`pageable.pageSizes`), or null.
+GRID_PAGE_SIZES_SCRIPT = (
+    "() => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    const pageable = grid && grid.options.pageable;
+    const sizes = (pageable && Array.isArray(pageable.pageSizes) ? pageable.pageSizes : [])
+        .map(Number)
+        .filter(size => Number.isFinite(size) && size > 0);
+    return sizes.length ? Math.max(...sizes) : null;
+}
+"""
+)
+
+# Describes the DataSource transport (read URL, verb, content type) the grid loads its rows from.
+GRID_TRANSPORT_SCRIPT = (
+    "() => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    const transport = grid && grid.dataSource.transport;
+    const read = transport && transport.options && transport.options.read;
+    if (!read) { return null; }
+    const url = typeof read === 'string' ? read : (typeof read.url === 'function' ? read.url({}) : read.url);
+    if (!url) { return null; }
+    return {
+        url: new URL(url, document.baseURI).href,
+        method: ((read && read.type) || 'GET').toUpperCase(),
+        contentType: (read && read.contentType) || null,
+    };
+}
+"""
+)
+
+# Installs (once per document) listeners that count the grid's dataBound/error events and
+# track in-flight DataSource requests. Returns the current event count, to be passed to
+# GRID_SETTLED_SCRIPT, or null when the widget cannot be reached.
+GRID_EVENTS_SCRIPT = (
+    "() => {"
+    + _GRID_HELPERS
+    + """
+    const grid = findGrid();
+    if (!grid) { return null; }
+    let state = window.__rpaGridEvents;
+    if (!state || state.grid !== grid) {
+        state = window.__rpaGridEvents = { grid, events: 0, pending: false };
+        const settle = () => { state.pending = false; state.events += 1; };
+        grid.bind('dataBound', settle);
+        grid.dataSource.bind('error', settle);
+        grid.dataSource.bind('requestStart', () => { state.pending = true; });
+        grid.dataSource.bind('requestEnd', () => { state.pending = false; });
+    }
+    return state.events;
+}
+"""
+)
+
+# Resolves once the grid bound new data (or failed) after the event count `token`.
+GRID_SETTLED_SCRIPT = """
+(token) => {
+    const state = window.__rpaGridEvents;
+    return !!state && state.events > token && !state.pending;
+}
+"""
+
+# Resolves once the grid has rows (or a finished read) and no loading mask is visible.
+GRID_READY_SCRIPT = """
+() => {
+    const masked = Array.from(document.querySelectorAll('div.k-loading-mask')).some(el => el.offsetParent !== null);
+    if (masked) { return false; }
+    const state = window.__rpaGridEvents;
+    if (state && state.pending) { return false; }
+    if (state && state.events > 0) { return true; }
+    return document.querySelector('#active-grid table tbody tr') !== null;
+}
+"""
+
+_RECORD_KEYS = ("Data", "data", "Items", "items", "Results", "results", "value")
+_TOTAL_KEYS = ("Total", "total", "TotalCount", "totalCount", "Count", "count")
+
+_ISO_DATETIME = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$"
+)
+_MS_JSON_DATE = re.compile(r"^/Date\((-?\d+)(?:[+-]\d{4})?\)/$")
+
+
+def resolve_field(record: Mapping[str, object], path: str) -> object:
+    """Return a (possibly dotted) data field from a flat or nested grid record."""
+    if path in record:
+        return record[path]
+    current: object = record
+    for key in path.split("."):
+        if not isinstance(current, Mapping):
+            return None
+        current = current.get(key)
+    return current
+
+
+def format_grid_value(value: object) -> str:
+    """Render a raw DataSource value the way the grid cell displays it."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(text for text in (format_grid_value(item) for item in value) if text)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, str):
+        return _format_date_string(value.strip())
+    return " ".join(str(value).split())
+
+
+def map_grid_record(record: Mapping[str, object], column_map: Mapping[str, str]) -> Dict[str, str]:
+    """Key a DataSource record by the grid column labels used throughout the robot."""
+    return {
+        label: format_grid_value(resolve_field(record, data_field))
+        for label, data_field in column_map.items()
+    }
+
+
+def map_grid_records(
+    records: Iterable[Mapping[str, object]],
+    column_map: Mapping[str, str],
+) -> List[Dict[str, str]]:
+    return [map_grid_record(record, column_map) for record in records]
+
+
+def extract_grid_records(payload: object) -> Optional[Tuple[List[Mapping[str, object]], Optional[int]]]:
+    """
+    Pull the row list (and server total, when present) out of a grid data response.
+
+    Accepts the shapes Kendo transports commonly return: a bare list, a ``DataSourceResult``
+    style object (``Data``/``Total``) or an ASP.NET ``{"d": ...}`` wrapper.
+    """
+    if isinstance(payload, Mapping) and "d" in payload and len(payload) == 1:
+        payload = payload["d"]
+    if isinstance(payload, list):
+        return [row for row in payload if isinstance(row, Mapping)], None
+    if not isinstance(payload, Mapping):
+        return None
+    for key in _RECORD_KEYS:
+        rows = payload.get(key)
+        if isinstance(rows, list):
+            total = next((payload[name] for name in _TOTAL_KEYS if isinstance(payload.get(name), int)), None)
+            return [row for row in rows if isinstance(row, Mapping)], total
+    return None
+
+
+@dataclass(frozen=True)
+class FilterCondition:
+    """One Kendo filter expression: ``field operator value``."""
+
+    field: str
+    operator: str
+    value: object
+
+    def to_kendo(self) -> Dict[str, object]:
+        return {"field": self.field, "operator": self.operator, "value": _kendo_value(self.value)}
+
+
+@dataclass(frozen=True)
+class GridFilter:
+    """
+    Compound Kendo DataSource filter: conditions (or nested filters) joined by one logic.
+
+    ``to_kendo()`` renders the descriptor accepted by ``dataSource.query({filter})`` and by
+    the grid's data endpoint; plain dates become UTC midnight datetimes so Playwright can
+    pass them to the page as JS ``Date`` objects without the host's timezone shifting them.
+    """
+
+    conditions: Tuple[Union[FilterCondition, "GridFilter"], ...]
+    logic: str = "and"
+
+    @classmethod
+    def all_of(cls, *conditions: Union[FilterCondition, "GridFilter"]) -> "GridFilter":
+        return cls(tuple(conditions), "and")
+
+    @classmethod
+    def any_of(cls, *conditions: Union[FilterCondition, "GridFilter"]) -> "GridFilter":
+        return cls(tuple(conditions), "or")
+
+    def to_kendo(self) -> Dict[str, object]:
+        return {"logic": self.logic, "filters": [condition.to_kendo() for condition in self.conditions]}
+
+
+def tag_filter(tags: Iterable[str]) -> GridFilter:
+    """Filter matching any of the given Tags exactly."""
+    return GridFilter.any_of(*(FilterCondition("Label", "eq", tag) for tag in tags))
+
+
+def status_date_filter(status: str, start: date, end: date) -> GridFilter:
+    """
+    Filter for one Lab Test Status within an inclusive PackagedDate window.
+
+    The end bound is exclusive midnight of the following day, so packages stamped with a
+    time on the last day still match.
+    """
+    return GridFilter.all_of(
+        FilterCondition("LabTestingStateName", "eq", status),
+        FilterCondition("PackagedDate", "gte", start),
+        FilterCondition("PackagedDate", "lt", end + timedelta(days=1)),
+    )
+
+
+def normalize_tag(value: object) -> str:
+    # Some views render the Tag as "TAG ," or "TAG ".
+    return str(value or "").strip(" ,").lower()
+
+
+def _kendo_value(value: object) -> object:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    return value
+
+
+def _format_date_string(text: str) -> str:
+    parsed = _parse_date_string(text)
+    if parsed is None:
+        return " ".join(text.split())
+    if (parsed.hour, parsed.minute, parsed.second) == (0, 0, 0):
+        return parsed.strftime("%m/%d/%Y")
+    return parsed.strftime("%m/%d/%Y %H:%M")
+
+
+def _parse_date_string(text: str) -> Optional[datetime]:
+    match = _MS_JSON_DATE.match(text)
+    if match:
+        return datetime.fromtimestamp(int(match.group(1)) / 1000, tz=timezone.utc)
+    match = _ISO_DATETIME.match(text)
+    if not match:
+        return None
+    year, month, day, hour, minute, second = (int(part or 0) for part in match.groups())
+    try:
+        return datetime(year, month, day, hour, minute, second)
+    except ValueError:
+        return None
+
+
+__all__ = [
+    "FilterCondition",
+    "GRID_EVENTS_SCRIPT",
+    "GRID_FILTER_SCRIPT",
+    "GRID_PAGE_SCRIPT",
+    "GRID_PAGE_SIZES_SCRIPT",
+    "GRID_QUERY_SCRIPT",
+    "GRID_READY_SCRIPT",
+    "GRID_ROWS_SCRIPT",
+    "GRID_SETTLED_SCRIPT",
+    "GRID_TRANSPORT_SCRIPT",
+    "GridFilter",
+    "extract_grid_records",
+    "format_grid_value",
+    "map_grid_record",
+    "map_grid_records",
+    "normalize_tag",
+    "resolve_field",
+    "status_date_filter",
+    "tag_filter",
+]
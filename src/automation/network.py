@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import List, Mapping, Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Page, Response
+
+from src.automation.grid import extract_grid_records
+
+logger = logging.getLogger(__name__)
+
+
+class GridResponseRecorder:
+    """Collects the XHR responses the packages grid receives from its data endpoint."""
+
+    def __init__(self, url_pattern: str) -> None:
+        self._pattern = re.compile(url_pattern, re.I)
+        self._endpoint_path: Optional[str] = None
+        self._responses: List[Response] = []
+        self._page: Optional[Page] = None
+
+    def attach(self, page: Page, endpoint_url: Optional[str] = None) -> None:
+        """
+        Start listening on ``page``. When the grid's transport URL is known it takes
+        precedence over the configured URL pattern.
+        """
+        if endpoint_url:
+            self._endpoint_path = urlsplit(endpoint_url).path
+            logger.debug("Recording grid responses for endpoint %s", self._endpoint_path)
+        self._page = page
+        page.on("response", self._on_response)
+
+    def detach(self) -> None:
+        if self._page is not None:
+            self._page.remove_listener("response", self._on_response)
+            self._page = None
+
+    def reset(self) -> None:
+        """Forget the responses seen so far (e.g. before requesting the next page)."""
+        self._responses.clear()
+
+    def latest_records(self) -> Optional[List[Mapping[str, object]]]:
+        """Records of the newest grid response received since :meth:`attach`, if any."""
+        for response in reversed(self._responses):
+            try:
+                payload = response.json()
+            except Exception as exc:
+                logger.debug("Ignoring non-JSON grid response %s: %s", response.url, exc)
+                continue
+            extracted = extract_grid_records(payload)
+            if extracted is not None:
+                records, total = extracted
+                logger.info(
+                    "Captured %d grid records from %s (server total: %s).",
+                    len(records),
+                    urlsplit(response.url).path,
+                    total if total is not None else "n/a",
+                )
+                return records
+        return None
+
+    def _on_response(self, response: Response) -> None:
+        if response.request.resource_type not in {"xhr", "fetch"} or not response.ok:
+            return
+        if self._endpoint_path is not None:
+            matched = urlsplit(response.url).path == self._endpoint_path
+        else:
+            matched = bool(self._pattern.search(response.url))
+        if matched:
+            self._responses.append(response)
+
+
+__all__ = ["GridResponseRecorder"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.sync_api import BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+# Installed in every document of the context before METRC's own scripts run. It hides the
+# Stonly guide with CSS and clicks away the CSV Templates modal ("Got It") and the
+# `data-donotshow-cookiename` system alerts as soon as a DOM mutation shows them.
+OVERLAY_GUARD_SCRIPT = """
+(() => {
+    if (window.__rpaOverlayGuard) { return; }
+    const guard = window.__rpaOverlayGuard = { gotIt: 0, alerts: 0 };
+    const gotItText = /\\bGot\\s*It\\b/i;
+    const visible = el => el.offsetParent !== null || el.getClientRects().length > 0;
+
+    const hideStonly = () => {
+        if (document.getElementById('rpa-overlay-guard-style')) { return; }
+        const style = document.createElement('style');
+        style.id = 'rpa-overlay-guard-style';
+        style.textContent = ".stn-wdgt, iframe[title='interactive guide'] { display: none !important; }";
+        (document.head || document.documentElement).appendChild(style);
+    };
+
+    const sweep = () => {
+        hideStonly();
+        for (const button of document.querySelectorAll('button, [role="button"]')) {
+            if (gotItText.test(button.textContent || '') && visible(button)) {
+                button.click();
+                guard.gotIt += 1;
+            }
+        }
+        for (const close of document.querySelectorAll("span[data-dismiss='alert'][data-donotshow-cookiename]")) {
+            if (visible(close)) {
+                close.click();
+                guard.alerts += 1;
+            }
+        }
+    };
+    guard.sweep = sweep;
+
+    let scheduled = false;
+    const schedule = () => {
+        if (scheduled) { return; }
+        scheduled = true;
+        setTimeout(() => { scheduled = false; sweep(); }, 50);
+    };
+    new MutationObserver(schedule).observe(document.documentElement, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        attributeFilter: ['style', 'class'],
+    });
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', schedule, { once: true });
+    } else {
+        schedule();
+    }
+})();
+"""
+
+# Runs the guard immediately (installing it first if the document predates it) and
+# returns its dismissal counters.
+OVERLAY_SWEEP_SCRIPT = (
+    "() => {"
+    + OVERLAY_GUARD_SCRIPT
+    + """
+    window.__rpaOverlayGuard.sweep();
+    return { gotIt: window.__rpaOverlayGuard.gotIt, alerts: window.__rpaOverlayGuard.alerts };
+}
+"""
+)
+
+
+class OverlayGuard:
+    """
+    Keeps METRC's blocking overlays out of the way for a whole browser context, so the
+    robot does not probe for them before every step.
+    """
+
+    def install(self, context: BrowserContext) -> None:
+        context.add_init_script(OVERLAY_GUARD_SCRIPT)
+
+    async def install_async(self, context: AsyncBrowserContext) -> None:
+        await context.add_init_script(OVERLAY_GUARD_SCRIPT)
+
+    def sweep(self, page: Page) -> None:
+        """Dismiss whatever is currently shown, without waiting for a mutation."""
+        try:
+            counts = page.evaluate(OVERLAY_SWEEP_SCRIPT)
+        except Exception as exc:
+            logger.debug("Overlay sweep failed: %s", exc)
+            return
+        logger.debug("Overlay guard dismissals so far: %s", counts)
+
+
+__all__ = ["OverlayGuard"]
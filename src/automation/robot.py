@@ -1,14 +1,57 @@
 from __future__ import annotations
 
+import itertools
 import logging
-from datetime import datetime, timedelta, timezone
+import queue
 import re
+import socket
+import threading
 import time
-from typing import Dict, List, Mapping, Optional, Union
-
-from playwright.sync_api import Browser, Frame, Locator, Page, Playwright, TimeoutError, sync_playwright
-
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Union
+
+from playwright.sync_api import (
+    Browser,
+    BrowserContext,
+    Frame,
+    Locator,
+    Page,
+    Playwright,
+    TimeoutError,
+    sync_playwright,
+)
+
+from src.automation.base import (
+    FILTER_TEXT,
+    LOGIN_BUTTON_TEXT,
+    BaseMetrcRobot,
+    OutcomeCallback,
+    VerificationBudget,
+)
+from src.automation.browser_server import WarmBrowser
+from src.automation.data_client import GridEndpoint, MetrcDataClient, MetrcDataClientError
+from src.automation.grid import (
+    GRID_EVENTS_SCRIPT,
+    GRID_FILTER_SCRIPT,
+    GRID_PAGE_SCRIPT,
+    GRID_PAGE_SIZES_SCRIPT,
+    GRID_QUERY_SCRIPT,
+    GRID_READY_SCRIPT,
+    GRID_ROWS_SCRIPT,
+    GRID_SETTLED_SCRIPT,
+    GRID_TRANSPORT_SCRIPT,
+    GridFilter,
+    map_grid_records,
+    normalize_tag,
+    resolve_field,
+    status_date_filter,
+    tag_filter,
+)
+from src.automation.network import GridResponseRecorder
+from src.automation.strategies import StrategyStats
 from src.config import PlaywrightSettings, settings
+from src.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -16,146 +59,299 @@ logger = logging.getLogger(__name__)
 Scope = Union[Page, Frame]
 
 
-class MetrcRobot:
+# Launch attempts for a Chromium whose DevTools port the verification workers can attach to.
+_DEVTOOLS_LAUNCH_ATTEMPTS = 3
+
+
+def _free_local_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _serves_devtools(endpoint: str, browser: Browser, timeout_s: float = 5.0) -> bool:
+    """
+    Whether ``browser`` itself answers on ``endpoint``.
+
+    The port is probed before Chromium binds it, so another process may take it first;
+    Chromium then runs without a DevTools server and the port answers for someone else.
+    """
+    probe = WarmBrowser(endpoint, autolaunch=False)
+    deadline = time.monotonic() + timeout_s
+    while True:
+        reported = probe.browser_version()
+        if reported is not None:
+            return reported.endswith(f"/{browser.version}")
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+
+
+class MetrcRobot(BaseMetrcRobot):
     """Encapsulates the Playwright automation that extracts table rows from METRC."""
 
-    COLUMN_MAP: Mapping[str, str] = {
-        "Tag": "Label",
-        "Src H's": "SourceHarvestNames",
-        "Src Pkg's": "SourcePackageLabels",
-        "Src Pj's": "SourceProcessingJobNames",
-        "Location": "LocationName",
-        "Sublocation": "SublocationName",
-        "Item": "Item.Name",
-        "Category": "Item.ProductCategoryName",
-        "Item Strain": "Item.StrainName",
-        "Quantity": "Quantity",
-        "UoM": "UnitOfMeasureAbbreviation",
-        "P.B. No.": "ProductionBatchNumber",
-        "LT Status": "LabTestingStateName",
-        "A.H.": "IsOnHold",
-        "Date": "PackagedDate",
-        "Rcv'd": "ReceivedDateTime",
-        "L.T.E.": "LabTestResultExpirationDateTime",
-    }
-
-    FILTER_TERM = "pro"
-
-    def __init__(self, config: PlaywrightSettings, date_range_days: int = 30) -> None:
-        self.config = config
+    def __init__(
+        self,
+        config: PlaywrightSettings,
+        date_range_days: int = 30,
+        tag_batch_size: int = 1,
+        verify_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            config,
+            date_range_days=date_range_days,
+            tag_batch_size=tag_batch_size,
+            verify_workers=verify_workers,
+        )
         self._grid_scope: Optional[Scope] = None
-        self.date_range_days = max(1, date_range_days)
-        self.max_tag_filter_retries = 3
+        self._page: Optional[Page] = None
+        self._grid_dirty = False
+        self._is_worker = False
+        # DevTools/Playwright endpoint of this session's browser, for verification workers.
+        self._worker_endpoint: Optional[str] = None
+        self._strategy_stats = StrategyStats(
+            Path(config.strategy_stats_path) if config.strategy_stats_path else None
+        )
+
+    @contextmanager
+    def session(self) -> Iterator["MetrcRobot"]:
+        """
+        Keep one browser, page and login alive for every routine run inside the block.
+
+        Routines called outside a session open (and close) a private one, as before.
+        """
+        if self._page is not None:
+            yield self
+            return
 
-    def fetch_table_rows(self) -> List[Dict[str, str]]:
-        """Main entrypoint for the robot."""
         self._grid_scope = None
         with sync_playwright() as playwright:
-            browser = self._launch_browser(playwright)
-            page = browser.new_page()
+            with span("robot.launch"):
+                browser = self._launch_browser(playwright)
+            page = self._new_page(browser)
             try:
-                self._open_base_url(page)
-                self._login_if_needed(page)
-                self._navigate_to_packages(page)
-                self._dismiss_stonly_widget(page)
-                self._apply_filters(page)
-                rows = self._extract_table_rows(page)
-                filtered = self._filter_rows_by_date(rows)
-                logger.info(
-                    "Date validation (last %d days): kept %d of %d rows",
-                    self.date_range_days,
-                    len(filtered),
-                    len(rows),
-                )
-                if len(filtered) < len(rows):
-                    logger.warning("Discarded %d rows outside date range.", len(rows) - len(filtered))
-                filtered_testing = [
-                    row for row in filtered if (row.get("LT Status") or "").strip() == "TestingInProgress"
-                ]
-                logger.info(
-                    "TestingInProgress filter: kept %d of %d rows after date check.",
-                    len(filtered_testing),
-                    len(filtered),
-                )
-                return filtered_testing
+                self._open_packages_page(page)
+                self._page = page
+                self._grid_dirty = False
+                yield self
             finally:
+                self._page = None
+                self._worker_endpoint = None
+                self._save_storage_state(page.context)
                 browser.close()
+                if not self._is_worker:
+                    self._strategy_stats.save()
+                    if self._request_blocker is not None:
+                        self._request_blocker.log_summary()
+
+    @contextmanager
+    def _routine_page(self) -> Iterator[Page]:
+        with self.session():
+            page = self._page
+            if self._grid_dirty:
+                # A previous routine left its filters on the grid; start from a clean packages view.
+                self._grid_scope = None
+                self._open_packages_page(page)
+            self._grid_dirty = True
+            yield page
+
+    def _open_packages_page(self, page: Page) -> None:
+        self._open_base_url(page)
+        self._login_if_needed(page)
+        self._navigate_to_packages(page)
+        if self._overlay_guard is None:
+            self._dismiss_overlays(page)
+
+    def fetch_table_rows(self) -> List[Dict[str, str]]:
+        """Main entrypoint for the robot."""
+        rows: List[Dict[str, str]] = []
+        for page_rows in self.iter_table_pages():
+            rows.extend(page_rows)
+        return rows
+
+    def iter_table_pages(self) -> Iterator[List[Dict[str, str]]]:
+        """
+        Yield the filtered rows one grid page at a time, as each page arrives.
+
+        Pages use ``GRID_PAGE_SIZE`` or the largest size the grid's pager offers and run
+        until the DataSource total is reached, so long date windows are read completely.
+        """
+        with self._routine_page() as page:
+            pages = self._iter_pages_via_data_client(page)
+            if pages is None:
+                recorder = self._start_response_recorder(page)
+                page_size = self._resolve_page_size(page)
+                self._apply_filters(page, page_size)
+                pages = self._iter_extracted_pages(page, recorder, page_size)
+            for rows in pages:
+                yield self._select_target_rows(rows)
+
+    def _build_data_client(self, page: Page) -> Optional[MetrcDataClient]:
+        if not self.config.data_client:
+            return None
+        transport = self._get_grid_transport(page) or {}
+        url = self.config.grid_data_url or transport.get("url")
+        if not url:
+            logger.warning("Grid data endpoint unknown; direct data client disabled for this run.")
+            return None
+        endpoint = GridEndpoint(
+            url=url,
+            method=transport.get("method") or "GET",
+            content_type=transport.get("contentType"),
+        )
+        logger.info("Using direct data client against %s %s.", endpoint.method, endpoint.url)
+        return MetrcDataClient(page.context.request, endpoint)
+
+    def _iter_pages_via_data_client(self, page: Page) -> Optional[Iterator[List[Dict[str, str]]]]:
+        client = self._build_data_client(page)
+        if client is None:
+            return None
+        start_date, end_date = self._get_date_range()
+        pages = client.iter_pages(
+            filter=status_date_filter(self.TARGET_STATUS, start_date, end_date),
+            page_size=self.config.grid_page_size or client.DEFAULT_PAGE_SIZE,
+        )
+        try:
+            first_page = next(pages, [])
+        except MetrcDataClientError as exc:
+            logger.warning("Direct data client failed (%s); falling back to the grid UI.", exc)
+            return None
+        return (
+            map_grid_records(records, self.COLUMN_MAP)
+            for records in itertools.chain([first_page], pages)
+        )
 
     def _launch_browser(self, playwright: Playwright) -> Browser:
+        if self._warm_browser is not None:
+            browser = self._warm_browser.connect(playwright, self.config.slow_mo_ms)
+            if browser is not None:
+                # Each connect to a Playwright server (ws://) starts a new browser there, so
+                # only DevTools endpoints are shared with the verification workers.
+                if self._warm_browser.uses_cdp:
+                    self._worker_endpoint = self._warm_browser.endpoint
+                return browser
+            if self._is_worker:
+                # A worker never launches its own Chromium; its units go back to the other workers.
+                raise RuntimeError(f"Unable to attach to the session browser at {self._warm_browser.endpoint}.")
+            logger.warning("Warm browser unavailable; launching a private Chromium.")
+        if self.verify_workers > 1:
+            # Verification workers attach to this browser over CDP instead of launching their own.
+            for _ in range(_DEVTOOLS_LAUNCH_ATTEMPTS):
+                port = _free_local_port()
+                browser = self._launch_chromium(
+                    playwright, [f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+                )
+                endpoint = f"http://127.0.0.1:{port}"
+                if _serves_devtools(endpoint, browser):
+                    self._worker_endpoint = endpoint
+                    return browser
+                logger.warning("DevTools port %d was taken before Chromium could bind it; relaunching.", port)
+                browser.close()
+            logger.warning("No DevTools port for the verification workers; they will not run.")
+        return self._launch_chromium(playwright, [])
+
+    def _launch_chromium(self, playwright: Playwright, args: List[str]) -> Browser:
         logger.info("Launching Chromium (headless=%s)", self.config.headless)
         return playwright.chromium.launch(
             headless=self.config.headless,
             slow_mo=self.config.slow_mo_ms,
+            args=args,
         )
 
+    def _new_page(self, browser: Browser) -> Page:
+        state = self._load_storage_state()
+        context = browser.new_context(storage_state=state) if state else browser.new_context()
+        if self._request_blocker is not None:
+            self._request_blocker.install(context)
+        if self._overlay_guard is not None:
+            self._overlay_guard.install(context)
+        return context.new_page()
+
+    def _save_storage_state(self, context: BrowserContext) -> None:
+        try:
+            state = context.storage_state()
+        except Exception as exc:
+            logger.warning("Unable to capture session state: %s", exc)
+            return
+        self._store_storage_state(state)
+
     def _open_base_url(self, page: Page) -> None:
         logger.debug("Opening %s", self.config.base_url)
         page.goto(self.config.base_url, wait_until="domcontentloaded")
 
     def _login_if_needed(self, page: Page) -> None:
-        login_button = page.locator("button.metrc-btn.metrc-btn-confirm", has_text=re.compile(r"\bLog in\b", re.I))
+        login_button = page.locator(self.LOGIN_BUTTON_SELECTOR, has_text=LOGIN_BUTTON_TEXT)
         if login_button.count() == 0:
             logger.info("Session already authenticated, skipping login.")
             return
 
+        if self._storage_state is not None:
+            logger.info("Saved session expired; performing full login.")
         logger.info("Logging into METRC portal.")
-        username_field = self._first_existing_locator(
-            page,
-            [
-                "input[name='userName']",
-                "input[name='username']",
-                "input#UserName",
-                "input[id='username']",
-                "input[type='text']",
-            ],
-        )
-        password_field = self._first_existing_locator(
-            page,
-            [
-                "input[name='password']",
-                "input#Password",
-                "input[id='password']",
-                "input[type='password']",
-            ],
-        )
+        username_field = self._first_existing_locator(page, self.USERNAME_SELECTORS)
+        password_field = self._first_existing_locator(page, self.PASSWORD_SELECTORS)
         if username_field is None or password_field is None:
             raise RuntimeError("Unable to locate username/password fields on login page.")
 
-        username_field.fill(self.config.username, timeout=5_000)
-        password_field.fill(self.config.password, timeout=5_000)
+        with span("robot.login"):
+            username_field.fill(self.config.username, timeout=5_000)
+            password_field.fill(self.config.password, timeout=5_000)
 
-        with page.expect_navigation(wait_until="domcontentloaded", timeout=30_000):
-            login_button.first.click()
+            with page.expect_navigation(wait_until="domcontentloaded", timeout=30_000):
+                login_button.first.click()
 
-        page.wait_for_load_state("networkidle", timeout=30_000)
-        logger.info("Login completed.")
-        page.goto(self.config.base_url, wait_until="domcontentloaded")
+            page.wait_for_load_state("networkidle", timeout=30_000)
+            logger.info("Login completed.")
+            self._save_storage_state(page.context)
+            page.goto(self.config.base_url, wait_until="domcontentloaded")
 
     def _navigate_to_packages(self, page: Page) -> None:
-        try:
-            page.wait_for_url("**/packages*", timeout=20_000)
-        except TimeoutError:
-            logger.warning("URL didn't update to packages explicitly; continuing with manual waits.")
+        with span("robot.navigate"):
+            try:
+                page.wait_for_url("**/packages*", timeout=20_000)
+            except TimeoutError:
+                logger.warning("URL didn't update to packages explicitly; continuing with manual waits.")
 
-        tab_selector = "li[data-grid-selector='#active-grid'] span.k-link"
-        try:
-            page.wait_for_selector(tab_selector, timeout=20_000)
-            active_tab = page.locator(tab_selector).first
-            parent_li = active_tab.locator("xpath=ancestor::li[1]")
-            if "k-state-active" not in (parent_li.get_attribute("class") or ""):
-                active_tab.click()
-        except TimeoutError:
-            logger.info("Active tab not found; proceeding without explicit click.")
+            tab_selector = "li[data-grid-selector='#active-grid'] span.k-link"
+            try:
+                page.wait_for_selector(tab_selector, timeout=20_000)
+                active_tab = page.locator(tab_selector).first
+                parent_li = active_tab.locator("xpath=ancestor::li[1]")
+                if "k-state-active" not in (parent_li.get_attribute("class") or ""):
+                    active_tab.click()
+            except TimeoutError:
+                logger.info("Active tab not found; proceeding without explicit click.")
 
-        self._wait_for_grid_ready(page)
+            self._wait_for_grid_ready(page)
 
-    def _apply_filters(self, page: Page) -> None:
-        self._dismiss_csv_templates_popup(page)
-        self._dismiss_stonly_widget(page)
-        self._dismiss_system_alerts(page)
-        self._apply_status_filter(page)
-        self._dismiss_stonly_widget(page)
-        # Date filtering is now handled internally on extracted rows.
+    def _apply_filters(self, page: Page, page_size: Optional[int] = None) -> None:
+        start_date, end_date = self._get_date_range()
+        grid_filter = status_date_filter(self.TARGET_STATUS, start_date, end_date)
+        with span("robot.filter.grid"):
+            applied = self._apply_grid_filter(page, grid_filter, page_size)
+        if applied:
+            return
+        logger.warning("Kendo grid widget not reachable; filtering through the column menu.")
+        with span("robot.filter.status_menu"):
+            self._apply_status_filter(page)
+        # The column-menu path only filters the status; the date window is applied to extracted rows.
+
+    def _apply_grid_filter(self, page: Page, grid_filter: GridFilter, page_size: Optional[int] = None) -> bool:
+        """Apply ``grid_filter`` through the grid's DataSource in one round trip."""
+        scope = self._ensure_grid_scope(page)
+        try:
+            total = scope.evaluate(
+                GRID_FILTER_SCRIPT,
+                {"filter": grid_filter.to_kendo(), "pageSize": page_size or 0},
+            )
+        except Exception as exc:
+            logger.debug("Grid DataSource filter failed: %s", exc)
+            return False
+        if total is None:
+            return False
+        logger.info("Grid DataSource filter matched %d rows.", total)
+        self._wait_for_grid_ready(page)
+        return True
 
     def _apply_status_filter(self, page: Page) -> None:
         logger.info("Applying Lab Test Status filter (term '%s').", self.FILTER_TERM)
@@ -179,32 +375,6 @@ class MetrcRobot:
         self._wait_for_grid_ready(page)
         self._log_row_count(page, context="after status filter")
 
-    def _apply_date_filter(self, page: Page) -> None:
-        logger.info(
-            "Applying Date filter for the last %d days (UTC).",
-            self.date_range_days,
-        )
-        scope = self._ensure_grid_scope(page)
-        column_header = scope.locator(
-            "#active-grid thead.k-grid-header th[data-field='PackagedDate']"
-        ).first
-        column_header.wait_for(state="visible", timeout=30_000)
-
-        filter_menu = self._open_filter_popup(
-            page,
-            column_header,
-            input_selector="input[data-role='datepicker']",
-            tab_presses=0,
-            allow_keyboard=True,
-        )
-
-        start_date, end_date = self._get_date_range_strings()
-        self._set_date_filter_values(filter_menu, start_date, end_date)
-
-        self._click_filter_button(page, filter_menu)
-        self._wait_for_grid_ready(page)
-        self._log_row_count(page, context="after date filter")
-
     def _open_filter_popup(
         self,
         page: Page,
@@ -216,10 +386,9 @@ class MetrcRobot:
     ) -> Locator:
         menu_button = column_header.locator("a.k-header-column-menu").first
         for attempt in range(6):
-            self._dismiss_csv_templates_popup(page)
-            self._dismiss_csv_templates_popup(page)
-            self._dismiss_stonly_widget(page)
-            self._dismiss_system_alerts(page)
+            if attempt:
+                # Something swallowed the previous attempt; clear overlays before retrying.
+                self._clear_overlays(page)
             try:
                 menu_button.scroll_into_view_if_needed(timeout=2_000)
             except Exception:
@@ -231,73 +400,86 @@ class MetrcRobot:
                 handle = menu_button.element_handle()
                 if handle is not None:
                     page.evaluate("el => el.click()", handle)
-            page.wait_for_timeout(400)
-            activated = False
+            if not self._wait_for_column_menu(page):
+                logger.debug("Column menu did not open on attempt %d.", attempt + 1)
+                continue
+            target_selector = f"div.k-animation-container {input_selector}"
+            strategies: Dict[str, Callable[[], bool]] = {}
             if allow_keyboard:
-                activated = self._select_filter_via_keyboard(
+                strategies["keyboard"] = lambda: self._select_filter_via_keyboard(
                     page,
-                    target_selector=f"div.k-animation-container {input_selector}",
+                    target_selector=target_selector,
                     tab_presses=tab_presses,
                 )
-            if not activated:
-                activated = self._click_filter_option_via_js(page)
-            if activated:
+            strategies["js_click"] = lambda: self._click_filter_option_via_js(
+                page, target_selector=target_selector
+            )
+            if self._run_strategies(f"filter_menu:{input_selector}", strategies) is not None:
                 popup_container = page.locator("div.k-animation-container:visible")
                 popup = popup_container.filter(has=page.locator(input_selector))
                 if popup.count():
                     target = popup.first
                     target.wait_for(state="visible", timeout=5_000)
                     return target
-            page.wait_for_timeout(700)
         raise TimeoutError("Unable to activate Filter option after multiple attempts.")
 
+    def _wait_for_column_menu(self, page: Page, timeout_ms: int = 2_000) -> bool:
+        menu_item = page.locator("div.k-animation-container li.k-item span.k-link", has_text=FILTER_TEXT)
+        try:
+            menu_item.last.wait_for(state="visible", timeout=timeout_ms)
+            return True
+        except TimeoutError:
+            return False
+
     def _click_filter_button(self, page: Page, filter_menu: Locator) -> None:
+        token = self._arm_grid_events(page)
         filter_button = filter_menu.locator(
-            "button.k-button.k-primary:visible", has_text=re.compile(r"\bFilter\b", re.I)
+            "button.k-button.k-primary:visible", has_text=FILTER_TEXT
         ).first
-        try:
+
+        def click() -> bool:
             filter_button.wait_for(state="visible", timeout=5_000)
             filter_button.click()
-        except TimeoutError:
-            logger.warning("Standard click on Filter button failed; retrying with JS.")
+            return True
+
+        def js_click() -> bool:
             popup_handle = filter_menu.element_handle(timeout=5_000)
             if popup_handle is None:
-                raise
-            page.evaluate(
-                """
-                popup => {
-                    const btn = popup.querySelector('button.k-button.k-primary');
-                    if (btn) { btn.click(); }
-                }
-                """,
-                popup_handle,
+                return False
+            return bool(
+                page.evaluate(
+                    """
+                    popup => {
+                        const btn = popup.querySelector('button.k-button.k-primary');
+                        if (btn) { btn.click(); return true; }
+                        return false;
+                    }
+                    """,
+                    popup_handle,
+                )
             )
-        self._wait_for_network_idle(page)
 
-    def _set_date_filter_values(self, filter_menu: Locator, start_date: str, end_date: str) -> None:
-        # Prefer selecting operators (>=, <=) via the dropdowns if present.
-        operators = filter_menu.locator("select[data-role='dropdownlist']")
-        if operators.count() >= 2:
-            self._select_dropdown_option(operators.nth(0), ["gte", "after", "greater"])
-            self._select_dropdown_option(operators.nth(1), ["lte", "before", "less"])
-
-        date_inputs = filter_menu.locator("input[data-role='datepicker']")
-        if date_inputs.count() < 2:
-            raise TimeoutError("Date inputs not found inside filter menu.")
-
-        start_input = date_inputs.nth(0)
-        end_input = date_inputs.nth(1)
-        start_input.scroll_into_view_if_needed()
-        logger.debug("Setting start date to %s", start_date)
-        start_input.fill(start_date)
-        end_input.scroll_into_view_if_needed()
-        logger.debug("Setting end date to %s", end_date)
-        end_input.fill(end_date)
-        logger.info(
-            "Date inputs filled: start=%s, end=%s",
-            start_input.input_value(),
-            end_input.input_value(),
-        )
+        if self._run_strategies("filter_button", {"click": click, "js_click": js_click}) is None:
+            raise TimeoutError("Unable to click the Filter button.")
+        self._wait_for_grid_data(page, token)
+
+    def _run_strategies(self, step: str, strategies: Mapping[str, Callable[[], bool]]) -> Optional[str]:
+        """
+        Try the alternative implementations of ``step`` in the order the statistics
+        favour, recording each outcome. Returns the strategy that worked, if any.
+        """
+        for name in self._strategy_stats.order(step, list(strategies)):
+            started = time.monotonic()
+            try:
+                succeeded = strategies[name]()
+            except Exception as exc:
+                logger.debug("Strategy '%s' for %s raised: %s", name, step, exc)
+                succeeded = False
+            self._strategy_stats.record(step, name, succeeded, time.monotonic() - started)
+            if succeeded:
+                return name
+            logger.warning("Strategy '%s' for %s failed; trying the next one.", name, step)
+        return None
 
     def _select_dropdown_option(self, select_locator: Locator, candidates: List[str]) -> None:
         # First try the value attribute; then fallback to matching by label text via evaluation.
@@ -334,97 +516,259 @@ class MetrcRobot:
         except TimeoutError:
             logger.warning("Network idle not reached within %d ms; continuing.", timeout_ms)
 
-    def _filter_rows_by_date(self, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
-        """Keep only rows whose 'Date' is within [today - date_range_days, today] inclusive."""
-        if not rows:
-            return rows
-        today = datetime.now(timezone.utc).date()
-        start_date = today - timedelta(days=self.date_range_days)
-        kept: List[Dict[str, str]] = []
-        for row in rows:
-            raw_date = row.get("Date")
-            parsed = self._parse_row_date(raw_date)
-            if parsed is None:
-                logger.debug("Skipping row with unparsable Date: %s", raw_date)
-                continue
-            if start_date <= parsed <= today:
-                kept.append(row)
-            else:
-                logger.debug("Dropping row with Date %s outside range %s - %s", parsed, start_date, today)
-        return kept
-
-    def _parse_row_date(self, value: object) -> Optional[datetime.date]:
-        if value is None:
-            return None
-        text = str(value).strip()
-        if not text:
-            return None
-        text = text.split()[0]  # drop time if present
-        try:
-            return datetime.strptime(text, "%m/%d/%Y").date()
-        except ValueError:
-            return None
-
     # --- Secondary routine: verify and update statuses by Tag ---
 
-    def verify_status_by_tag(self, records: List[Mapping[str, object]]) -> List[Dict[str, object]]:
+    def verify_status_by_tag(
+        self,
+        records: List[Mapping[str, object]],
+        on_outcome: Optional[OutcomeCallback] = None,
+        budget: Optional[VerificationBudget] = None,
+    ) -> List[Dict[str, object]]:
         """
         For each record, apply a Tag equals filter, fetch LT Status, and return results.
+
+        With ``tag_batch_size > 1`` the Tags are checked in batches through one compound
+        OR filter each; Tags absent from a batch result are flagged with ``missing=True``.
+        ``on_outcome`` receives the outcomes of each tag (or batch) as soon as it is
+        settled, possibly from a worker thread, so callers can persist progress incrementally.
+        Once ``budget`` stops admitting work, the remaining tags are returned with
+        ``deferred=True`` instead of being verified.
         """
         if not records:
             return []
 
+        items = self._normalize_records(records)
+        self._on_outcome = on_outcome
+        self._budget = budget
+        try:
+            with self._routine_page() as page:
+                if self.verify_workers > 1 and len(items) > self.tag_batch_size:
+                    outcomes = self._verify_tags_in_parallel(page, items)
+                else:
+                    outcomes = self._verify_items(page, items, self._build_data_client(page))
+                self._log_missing_tags(outcomes)
+                return outcomes
+        finally:
+            self._on_outcome = None
+            self._budget = None
+
+    def _verify_items(
+        self,
+        page: Page,
+        items: List[tuple[str, str]],
+        client: Optional[MetrcDataClient],
+    ) -> List[Dict[str, object]]:
+        if client is not None or self.tag_batch_size > 1:
+            return self._verify_tags_in_batches(page, items, client)
+        return self._verify_tags_individually(page, items)
+
+    def _verify_tags_in_parallel(self, page: Page, items: List[tuple[str, str]]) -> List[Dict[str, object]]:
+        """
+        Verify tags with a pool of browser contexts pulling work units from a shared queue.
+
+        Playwright's sync API is bound to the thread that started it, so each extra worker
+        runs in a thread with its own Playwright connection, attaches to this session's
+        Chromium (``_worker_endpoint``) and opens a context seeded with this session's
+        login through its storage_state. The current page acts as one more worker.
+        """
+        if self._worker_endpoint is None:
+            logger.warning("Session browser cannot be shared; verifying on the main page only.")
+            return self._verify_items(page, items, self._build_data_client(page))
+        self._save_storage_state(page.context)
+        units = [items[start : start + self.tag_batch_size] for start in range(0, len(items), self.tag_batch_size)]
+        work: "queue.Queue[tuple[int, List[tuple[str, str]]]]" = queue.Queue()
+        for index, unit in enumerate(units):
+            work.put((index, unit))
+        results: Dict[int, List[Dict[str, object]]] = {}
+
+        worker_count = min(self.verify_workers, len(units))
+        logger.info("Verifying %d tags in %d units with %d workers.", len(items), len(units), worker_count)
+        threads = [
+            threading.Thread(
+                target=self._run_verification_worker,
+                args=(worker_id, work, results),
+                name=f"verify-worker-{worker_id}",
+                daemon=True,
+            )
+            for worker_id in range(1, worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+        self._drain_verification_queue(page, self._build_data_client(page), work, results)
+        for thread in threads:
+            thread.join()
+
         outcomes: List[Dict[str, object]] = []
-        self._grid_scope = None
-        with sync_playwright() as playwright:
-            browser = self._launch_browser(playwright)
-            page = browser.new_page()
+        for index, unit in enumerate(units):
+            if index not in results:
+                logger.warning("Work unit %d was abandoned by its worker; verifying it on the main page.", index)
+                results[index] = self._verify_items(page, unit, None)
+            outcomes.extend(results[index])
+        return outcomes
+
+    def _run_verification_worker(
+        self,
+        worker_id: int,
+        work: "queue.Queue[tuple[int, List[tuple[str, str]]]]",
+        results: Dict[int, List[Dict[str, object]]],
+    ) -> None:
+        worker = MetrcRobot(
+            self.config,
+            date_range_days=self.date_range_days,
+            tag_batch_size=self.tag_batch_size,
+        )
+        # Share the login, blocklist counters and strategy statistics but not the state
+        # file; only the owning session writes files and reports the blocked requests.
+        worker._storage_state = self._storage_state
+        worker._storage_state_path = None
+        worker._warm_browser = WarmBrowser(self._worker_endpoint, autolaunch=False)
+        worker._request_blocker = self._request_blocker
+        worker._strategy_stats = self._strategy_stats
+        worker._on_outcome = self._on_outcome
+        worker._budget = self._budget
+        worker._is_worker = True
+        try:
+            with worker.session():
+                page = worker._page
+                worker._drain_verification_queue(page, worker._build_data_client(page), work, results)
+        except Exception:
+            logger.exception("Verification worker %d stopped.", worker_id)
+
+    def _drain_verification_queue(
+        self,
+        page: Page,
+        client: Optional[MetrcDataClient],
+        work: "queue.Queue[tuple[int, List[tuple[str, str]]]]",
+        results: Dict[int, List[Dict[str, object]]],
+    ) -> None:
+        while True:
             try:
-                self._open_base_url(page)
-                self._login_if_needed(page)
-                self._navigate_to_packages(page)
-                self._dismiss_csv_templates_popup(page)
-                self._dismiss_stonly_widget(page)
-                for record in records:
-                    metrc_id = (record.get("Tag") or "").strip()
-                    current_status = (record.get("LT Status") or "").strip()
-                    if not metrc_id:
-                        logger.warning("Skipping record with empty Tag.")
-                        continue
-                    
-                    try:
+                index, unit = work.get_nowait()
+            except queue.Empty:
+                return
+            results[index] = self._verify_items(page, unit, client)
+
+    def _verify_tags_individually(
+        self,
+        page: Page,
+        items: List[tuple[str, str]],
+        admitted: bool = False,
+    ) -> List[Dict[str, object]]:
+        """Verify tags one at a time; ``admitted`` tags were already let in by the budget."""
+        outcomes: List[Dict[str, object]] = []
+        for position, (metrc_id, current_status) in enumerate(items):
+            if not admitted and not self._admit(1):
+                deferred = self._deferred_outcomes(items[position:])
+                self._emit_outcomes(deferred)
+                return outcomes + deferred
+            started = time.monotonic()
+            try:
+                with span("robot.verify.tag"):
+                    outcome = self._verify_single_tag(page, metrc_id, current_status)
+            except Exception as e:
+                logger.warning("Error verifying tag %s: %s. Attempting session recovery...", metrc_id, e)
+                try:
+                    # Attempt to restore session and navigating back
+                    self._login_if_needed(page)
+                    self._navigate_to_packages(page)
+                    self._clear_overlays(page)
+
+                    logger.info("Retrying tag %s after session recovery.", metrc_id)
+                    with span("robot.verify.tag_retry"):
                         outcome = self._verify_single_tag(page, metrc_id, current_status)
-                    except Exception as e:
-                        logger.warning("Error verifying tag %s: %s. Attempting session recovery...", metrc_id, e)
-                        try:
-                            # Attempt to restore session and navigating back
-                            self._login_if_needed(page)
-                            self._navigate_to_packages(page)
-                            self._dismiss_csv_templates_popup(page)
-                            self._dismiss_stonly_widget(page)
-                            self._dismiss_system_alerts(page)
-                            
-                            logger.info("Retrying tag %s after session recovery.", metrc_id)
-                            outcome = self._verify_single_tag(page, metrc_id, current_status)
-                        except Exception as retry_exc:
-                            logger.error("Failed to recover and verify tag %s: %s", metrc_id, retry_exc)
-                            outcome = {
-                                "metrc_id": metrc_id,
-                                "current_status": current_status,
-                                "fetched_status": None,
-                                "changed": False,
-                                "attempts": 0,
-                                "success": False,
-                                "error": str(retry_exc),
-                            }
-                    outcomes.append(outcome)
-                return outcomes
-            finally:
-                browser.close()
+                except Exception as retry_exc:
+                    logger.error("Failed to recover and verify tag %s: %s", metrc_id, retry_exc)
+                    outcome = {
+                        "metrc_id": metrc_id,
+                        "current_status": current_status,
+                        "fetched_status": None,
+                        "changed": False,
+                        "attempts": 0,
+                        "success": False,
+                        "error": str(retry_exc),
+                    }
+            self._record_unit(1, started)
+            self._emit_outcomes([outcome])
+            outcomes.append(outcome)
+        return outcomes
+
+    def _verify_tags_in_batches(
+        self,
+        page: Page,
+        items: List[tuple[str, str]],
+        client: Optional[MetrcDataClient] = None,
+    ) -> List[Dict[str, object]]:
+        outcomes: List[Dict[str, object]] = []
+        for start in range(0, len(items), self.tag_batch_size):
+            batch = items[start : start + self.tag_batch_size]
+            if not self._admit(len(batch)):
+                deferred = self._deferred_outcomes(items[start:])
+                self._emit_outcomes(deferred)
+                return outcomes + deferred
+            started = time.monotonic()
+            batch_outcomes: Optional[List[Dict[str, object]]] = None
+            if client is not None:
+                try:
+                    with span("robot.verify.batch_client"):
+                        batch_outcomes = self._verify_tag_batch_via_client(client, batch)
+                except MetrcDataClientError as exc:
+                    logger.warning("Direct data client failed (%s); using the grid UI for remaining tags.", exc)
+                    client = None
+            if batch_outcomes is None and self.tag_batch_size > 1:
+                try:
+                    with span("robot.verify.batch"):
+                        batch_outcomes = self._verify_tag_batch(page, batch)
+                except Exception as exc:
+                    logger.warning("Batch verification failed (%s); verifying %d tags one by one.", exc, len(batch))
+            if batch_outcomes is None:
+                # The budget already admitted this batch: record what the failed attempt
+                # cost and verify its tags without admitting them a second time.
+                self._record_unit(len(batch), started)
+                batch_outcomes = self._verify_tags_individually(page, batch, admitted=True)
+            else:
+                self._record_unit(len(batch), started)
+                self._emit_outcomes(batch_outcomes)
+            outcomes.extend(batch_outcomes)
+        return outcomes
+
+    def _verify_tag_batch(self, page: Page, batch: List[tuple[str, str]]) -> Optional[List[Dict[str, object]]]:
+        logger.info("Applying Tag OR filter for a batch of %d tags.", len(batch))
+        scope = self._ensure_grid_scope(page)
+        records = scope.evaluate(
+            GRID_QUERY_SCRIPT,
+            {
+                "filter": tag_filter(metrc_id for metrc_id, _ in batch).to_kendo(),
+                "pageSize": len(batch),
+                "fields": [self.COLUMN_MAP["Tag"], self.COLUMN_MAP["LT Status"]],
+            },
+        )
+        if records is None:
+            logger.warning("Kendo grid widget not reachable; batch filter unavailable.")
+            return None
+        logger.info("Batch filter returned %d rows for %d tags.", len(records), len(batch))
+        return self._build_batch_outcomes(batch, records)
+
+    def _verify_tag_batch_via_client(
+        self,
+        client: MetrcDataClient,
+        batch: List[tuple[str, str]],
+    ) -> List[Dict[str, object]]:
+        records = client.fetch_records(
+            filter=tag_filter(metrc_id for metrc_id, _ in batch),
+            page_size=max(len(batch), 50),
+        )
+        requested = {normalize_tag(metrc_id) for metrc_id, _ in batch}
+        returned = {normalize_tag(resolve_field(record, self.COLUMN_MAP["Tag"])) for record in records}
+        if not returned <= requested:
+            # The endpoint ignored the filter; trusting it would report real tags as missing.
+            raise MetrcDataClientError("Grid data endpoint did not apply the Tag filter.")
+        logger.info("Data client returned %d rows for %d tags.", len(records), len(batch))
+        return self._build_batch_outcomes(batch, records)
 
     def _verify_single_tag(self, page: Page, metrc_id: str, current_status: str) -> Dict[str, object]:
         for attempt in range(1, self.max_tag_filter_retries + 1):
-            self._apply_tag_filter(page, metrc_id)
+            with span("robot.filter.tag"):
+                self._apply_tag_filter(page, metrc_id)
             scope = self._ensure_grid_scope(page)
             rows = scope.locator("#active-grid table tbody tr[role='row']")
             count = rows.count()
@@ -467,8 +811,6 @@ class MetrcRobot:
 
     def _apply_tag_filter(self, page: Page, metrc_id: str) -> None:
         logger.info("Applying Tag equals filter for %s", metrc_id)
-        self._dismiss_csv_templates_popup(page)
-        self._dismiss_stonly_widget(page)
         scope = self._ensure_grid_scope(page)
         column_header = scope.locator(
             "#active-grid thead.k-grid-header th[data-field='Label']"
@@ -488,25 +830,27 @@ class MetrcRobot:
             self._select_dropdown_option(operators.nth(0), ["eq", "equals", "equal", "is equal to"])
 
         input_box = filter_menu.locator("input[type='text']").first
-        filled = False
-        try:
+
+        def fill() -> bool:
             input_box.scroll_into_view_if_needed(timeout=2_000)
             try:
                 input_box.fill("", timeout=1_000)
             except Exception:
                 pass
             input_box.fill(metrc_id, timeout=3_000)
-            filled = True
-        except Exception:
-            logger.warning("Standard fill failed for tag filter input; retrying with JS.")
-            handle = input_box.element_handle()
-            if handle is not None:
-                handle.evaluate(
-                    "(el, value) => { el.value = value; el.dispatchEvent(new Event('input', {bubbles:true})); }",
-                    metrc_id,
-                )
-                filled = True
-        if not filled:
+            return True
+
+        def js_value() -> bool:
+            handle = input_box.element_handle(timeout=3_000)
+            if handle is None:
+                return False
+            handle.evaluate(
+                "(el, value) => { el.value = value; el.dispatchEvent(new Event('input', {bubbles:true})); }",
+                metrc_id,
+            )
+            return True
+
+        if self._run_strategies("tag_input", {"fill": fill, "js_value": js_value}) is None:
             raise TimeoutError("Unable to set Tag filter input.")
 
         self._click_filter_button(page, filter_menu)
@@ -526,15 +870,136 @@ class MetrcRobot:
         except Exception:
             logger.exception("Failed to log row count for context '%s'", context)
 
-    def _get_date_range_strings(self) -> tuple[str, str]:
-        today = datetime.now(timezone.utc).date()
-        start_date = today - timedelta(days=self.date_range_days)
-        fmt = "%m/%d/%Y"
-        return start_date.strftime(fmt), today.strftime(fmt)
+    def _start_response_recorder(self, page: Page) -> Optional[GridResponseRecorder]:
+        if self.config.extraction_mode != "network":
+            return None
+        transport = self._get_grid_transport(page)
+        recorder = GridResponseRecorder(self.config.grid_data_url_pattern)
+        recorder.attach(page, endpoint_url=transport["url"] if transport else None)
+        return recorder
+
+    def _get_grid_transport(self, page: Page) -> Optional[Dict[str, str]]:
+        scope = self._ensure_grid_scope(page)
+        try:
+            return scope.evaluate(GRID_TRANSPORT_SCRIPT)
+        except Exception as exc:
+            logger.debug("Unable to read grid transport settings: %s", exc)
+            return None
+
+    def _resolve_page_size(self, page: Page) -> Optional[int]:
+        if self.config.grid_page_size > 0:
+            return self.config.grid_page_size
+        scope = self._ensure_grid_scope(page)
+        try:
+            page_size = scope.evaluate(GRID_PAGE_SIZES_SCRIPT)
+        except Exception as exc:
+            logger.debug("Unable to read the grid page sizes: %s", exc)
+            return None
+        if page_size:
+            logger.info("Reading the grid %d rows per page.", page_size)
+        return page_size
 
-    def _extract_table_rows(self, page: Page) -> List[Dict[str, str]]:
+    def _iter_extracted_pages(
+        self,
+        page: Page,
+        recorder: Optional[GridResponseRecorder],
+        page_size: Optional[int],
+    ) -> Iterator[List[Dict[str, str]]]:
         logger.info("Extracting table rows after filter.")
         scope = self._ensure_grid_scope(page)
+        try:
+            if self.config.extraction_mode in {"widget", "network"}:
+                pages = self._iter_widget_pages(scope, recorder, page_size)
+                first_page = next(pages, None)
+                if first_page is not None:
+                    yield first_page
+                    yield from pages
+                    return
+                logger.warning("Kendo grid widget not reachable; falling back to per-cell extraction.")
+            yield from self._iter_locator_pages(page, scope)
+        finally:
+            if recorder is not None:
+                recorder.detach()
+
+    def _iter_widget_pages(
+        self,
+        scope: Scope,
+        recorder: Optional[GridResponseRecorder],
+        page_size: Optional[int],
+    ) -> Iterator[List[Dict[str, str]]]:
+        # With a response recorder the rows come from the captured JSON, so the page script
+        # only moves the DataSource and reports the total.
+        fields = [] if recorder is not None else list(self.COLUMN_MAP.values())
+        page_number = 1
+        fetched = 0
+        while True:
+            if recorder is not None and page_number > 1:
+                recorder.reset()
+            with span("robot.extract.page"):
+                try:
+                    result = scope.evaluate(
+                        GRID_PAGE_SCRIPT,
+                        {"page": page_number, "pageSize": page_size or 0, "fields": fields},
+                    )
+                except Exception as exc:
+                    if page_number > 1:
+                        raise
+                    logger.debug("Grid DataSource evaluation failed: %s", exc)
+                    return
+                if result is None:
+                    return
+                rows = self._read_page_rows(scope, recorder, result["rows"])
+            fetched += len(rows)
+            total = result["total"]
+            logger.info("Grid page %d: %d rows (%d of %d).", page_number, len(rows), fetched, total)
+            yield rows
+            if not rows or fetched >= total:
+                return
+            page_number += 1
+
+    def _read_page_rows(
+        self,
+        scope: Scope,
+        recorder: Optional[GridResponseRecorder],
+        records: Optional[List[Mapping[str, object]]],
+    ) -> List[Dict[str, str]]:
+        if records is not None:
+            return map_grid_records(records, self.COLUMN_MAP)
+        captured = recorder.latest_records() if recorder is not None else None
+        if captured is not None:
+            return map_grid_records(captured, self.COLUMN_MAP)
+        logger.warning("No grid data response captured; falling back to DataSource extraction.")
+        return self._extract_rows_from_widget(scope) or []
+
+    def _iter_locator_pages(self, page: Page, scope: Scope) -> Iterator[List[Dict[str, str]]]:
+        next_button = scope.locator(
+            "#active-grid .k-pager-wrap a.k-pager-nav[title='Go to the next page'], "
+            "#active-grid .k-pager-wrap a.k-pager-nav[aria-label='Go to the next page']"
+        ).first
+        while True:
+            with span("robot.extract.page"):
+                rows = self._extract_rows_via_locators(scope)
+            yield rows
+            if not rows or next_button.count() == 0:
+                return
+            classes = next_button.get_attribute("class") or ""
+            if "k-state-disabled" in classes or "k-disabled" in classes:
+                return
+            token = self._arm_grid_events(page)
+            next_button.click()
+            self._wait_for_grid_data(page, token)
+
+    def _extract_rows_from_widget(self, scope: Scope) -> Optional[List[Dict[str, str]]]:
+        try:
+            records = scope.evaluate(GRID_ROWS_SCRIPT, list(self.COLUMN_MAP.values()))
+        except Exception as exc:
+            logger.debug("Grid DataSource evaluation failed: %s", exc)
+            return None
+        if records is None:
+            return None
+        return map_grid_records(records, self.COLUMN_MAP)
+
+    def _extract_rows_via_locators(self, scope: Scope) -> List[Dict[str, str]]:
         grid_rows = scope.locator("#active-grid table tbody tr[role='row']")
         row_count = grid_rows.count()
         logger.info("Found %d rows.", row_count)
@@ -592,21 +1057,18 @@ class MetrcRobot:
         try:
             for _ in range(3):
                 page.keyboard.press("ArrowDown")
-                page.wait_for_timeout(100)
             page.keyboard.press("Enter")
-            page.wait_for_timeout(200)
             for _ in range(tab_presses):
                 page.keyboard.press("Tab")
-                page.wait_for_timeout(50)
             page.wait_for_selector(target_selector, timeout=5_000)
             return True
         except TimeoutError:
             logger.warning("Keyboard navigation to Filter failed; falling back to mouse interaction.")
             return False
 
-    def _click_filter_option_via_js(self, page: Page) -> bool:
+    def _click_filter_option_via_js(self, page: Page, *, target_selector: str) -> bool:
         menu_container = page.locator("div.k-animation-container").filter(
-            has=page.locator("span.k-link", has_text=re.compile(r"\bFilter\b", re.I))
+            has=page.locator("span.k-link", has_text=FILTER_TEXT)
         )
         if menu_container.count() == 0:
             return False
@@ -616,7 +1078,7 @@ class MetrcRobot:
             return False
 
         filter_span = menu_container.last.locator(
-            "li.k-item span.k-link", has_text=re.compile(r"\bFilter\b", re.I)
+            "li.k-item span.k-link", has_text=FILTER_TEXT
         ).first
         if filter_span.count() == 0:
             return False
@@ -625,9 +1087,24 @@ class MetrcRobot:
         if handle is None:
             return False
         page.evaluate("el => el.click()", handle)
-        page.wait_for_timeout(200)
+        try:
+            page.wait_for_selector(target_selector, timeout=5_000)
+        except TimeoutError:
+            return False
         return True
 
+    def _clear_overlays(self, page: Page) -> None:
+        if self._overlay_guard is not None:
+            self._overlay_guard.sweep(page)
+        else:
+            self._dismiss_overlays(page)
+
+    def _dismiss_overlays(self, page: Page) -> None:
+        """Probe for each blocking overlay in turn (used when the overlay guard is disabled)."""
+        self._dismiss_csv_templates_popup(page)
+        self._dismiss_stonly_widget(page)
+        self._dismiss_system_alerts(page)
+
     def _dismiss_stonly_widget(self, page: Page) -> None:
         widget = page.locator("iframe[title='interactive guide'], .stn-wdgt")
         if widget.count() == 0:
@@ -673,7 +1150,7 @@ class MetrcRobot:
                     try:
                         btn.click(timeout=2000)
                         logger.info("Clicked system alert dismiss button.")
-                        page.wait_for_timeout(500)  # wait for animation
+                        btn.wait_for(state="hidden", timeout=2_000)
                     except Exception:
                         logger.warning("Failed to dismiss a system alert.")
 
@@ -688,21 +1165,29 @@ class MetrcRobot:
         table_body = scope.locator("#active-grid table tbody")
         table_body.wait_for(state="visible", timeout=20_000)
         try:
-            scope.wait_for_selector("#active-grid table tbody tr", timeout=20_000)
+            scope.wait_for_function(GRID_READY_SCRIPT, timeout=20_000)
         except TimeoutError:
-            logger.warning("Table has no rows after waiting.")
-        self._wait_for_loading_overlay(scope)
-
-    def _wait_for_loading_overlay(self, scope: Scope) -> None:
-        overlays = scope.locator("div.k-loading-mask")
-        end_time = time.time() + 15
-        while time.time() < end_time:
-            if overlays.count() == 0:
-                return
-            visible = any(overlays.nth(i).is_visible() for i in range(overlays.count()))
-            if not visible:
-                return
-            time.sleep(0.25)
+            logger.warning("Grid reported no rows or finished read after waiting.")
+        self._arm_grid_events(page)
+
+    def _arm_grid_events(self, page: Page) -> Optional[int]:
+        """Hook the grid's dataBound/requestEnd events; returns the token for _wait_for_grid_data."""
+        scope = self._ensure_grid_scope(page)
+        try:
+            return scope.evaluate(GRID_EVENTS_SCRIPT)
+        except Exception as exc:
+            logger.debug("Unable to hook grid events: %s", exc)
+            return None
+
+    def _wait_for_grid_data(self, page: Page, token: Optional[int], timeout_ms: int = 30_000) -> None:
+        if token is None:
+            self._wait_for_network_idle(page, timeout_ms)
+            return
+        scope = self._ensure_grid_scope(page)
+        try:
+            scope.wait_for_function(GRID_SETTLED_SCRIPT, arg=token, timeout=timeout_ms)
+        except TimeoutError:
+            logger.warning("Grid did not bind new data within %d ms; continuing.", timeout_ms)
 
     def _ensure_grid_scope(self, page: Page) -> Scope:
         if self._grid_scope is not None:
@@ -729,4 +1214,9 @@ class MetrcRobot:
 
 
 def get_robot() -> MetrcRobot:
-    return MetrcRobot(config=settings.playwright, date_range_days=settings.runtime.date_range_days)
+    return MetrcRobot(
+        config=settings.playwright,
+        date_range_days=settings.runtime.date_range_days,
+        tag_batch_size=settings.runtime.tag_batch_size,
+        verify_workers=settings.runtime.verify_workers,
+    )
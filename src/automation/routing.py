@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Iterable, List, Optional, Pattern, Union
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext, Route as AsyncRoute
+from playwright.sync_api import BrowserContext, Request, Route
+
+from src.config import PlaywrightSettings
+
+logger = logging.getLogger(__name__)
+
+# File extensions that identify the blockable resource types by URL alone.
+_TYPE_EXTENSIONS = {
+    "image": ("png", "jpe?g", "gif", "webp", "svg", "ico", "bmp", "avif"),
+    "font": ("woff2?", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m4a", "mov"),
+}
+
+
+class RequestBlocker:
+    """
+    Aborts requests the robot never needs (images, fonts, the Stonly guide, analytics)
+    before they start, and counts what it blocked.
+
+    Only URLs that can be blocked (the listed domains, the file extensions of the listed
+    resource types) are routed, so every other request skips the round trip to Python.
+    A resource type without known extensions falls back to routing every request.
+    """
+
+    def __init__(self, resource_types: Iterable[str], domains: Iterable[str]) -> None:
+        self.resource_types = frozenset(item.strip().lower() for item in resource_types if item.strip())
+        self.domains = tuple(item.strip().lower().lstrip(".") for item in domains if item.strip())
+        self._blocked: Counter[str] = Counter()
+        self._allowed = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, config: PlaywrightSettings) -> Optional["RequestBlocker"]:
+        blocker = cls(config.block_resource_types, config.block_domains)
+        return blocker if blocker.resource_types or blocker.domains else None
+
+    def reason(self, request: Request) -> Optional[str]:
+        """Why ``request`` should be aborted, or None to let it through."""
+        if request.resource_type in self.resource_types:
+            return f"type:{request.resource_type}"
+        host = (urlsplit(request.url).hostname or "").lower()
+        for domain in self.domains:
+            if host == domain or host.endswith("." + domain):
+                return f"domain:{domain}"
+        return None
+
+    def url_patterns(self) -> Optional[List[Pattern[str]]]:
+        """URL patterns covering every blockable request, or None if that takes all of them."""
+        patterns: List[Pattern[str]] = []
+        if self.domains:
+            hosts = "|".join(re.escape(domain) for domain in self.domains)
+            patterns.append(re.compile(rf"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?(?:{hosts})(?::\d+)?(?:[/?#]|$)", re.I))
+        if self.resource_types:
+            if not self.resource_types <= _TYPE_EXTENSIONS.keys():
+                return None
+            extensions = "|".join(ext for kind in sorted(self.resource_types) for ext in _TYPE_EXTENSIONS[kind])
+            patterns.append(re.compile(rf"\.(?:{extensions})(?:[?#]|$)", re.I))
+        return patterns
+
+    def install(self, context: BrowserContext) -> None:
+        for pattern in self._routes():
+            context.route(pattern, self._handle)
+
+    async def install_async(self, context: AsyncBrowserContext) -> None:
+        for pattern in self._routes():
+            await context.route(pattern, self._handle_async)
+
+    def _routes(self) -> List[Union[str, Pattern[str]]]:
+        patterns = self.url_patterns()
+        if patterns is None:
+            logger.debug("Blocked resource types %s need every request routed.", sorted(self.resource_types))
+            return ["**/*"]
+        return list(patterns)
+
+    def log_summary(self) -> None:
+        with self._lock:
+            blocked = sum(self._blocked.values())
+            details = ", ".join(f"{reason}={count}" for reason, count in self._blocked.most_common())
+            allowed = self._allowed
+        logger.info(
+            "Request blocklist: aborted %d of %d routed requests%s",
+            blocked,
+            blocked + allowed,
+            f" ({details})" if details else "",
+        )
+
+    def _record(self, reason: Optional[str]) -> None:
+        with self._lock:
+            if reason is None:
+                self._allowed += 1
+            else:
+                self._blocked[reason] += 1
+
+    def _handle(self, route: Route) -> None:
+        reason = self.reason(route.request)
+        self._record(reason)
+        if reason is None:
+            route.fallback()
+        else:
+            route.abort("blockedbyclient")
+
+    async def _handle_async(self, route: AsyncRoute) -> None:
+        reason = self.reason(route.request)
+        self._record(reason)
+        if reason is None:
+            await route.fallback()
+        else:
+            await route.abort("blockedbyclient")
+
+
+__all__ = ["RequestBlocker"]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyStats:
+    """
+    Success statistics for the alternative ways the robot can perform one UI step
+    (e.g. keyboard vs. JS activation of the Filter menu).
+
+    Strategies are ordered by smoothed success rate, then by mean latency of their
+    successes; a strategy that failed ``demote_after`` times in a row is tried last.
+    Counts are halved once a strategy has ``max_samples`` attempts so the ordering keeps
+    following METRC UI changes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        demote_after: int = 2,
+        max_samples: int = 200,
+    ) -> None:
+        self.path = path
+        self.demote_after = demote_after
+        self.max_samples = max_samples
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            try:
+                self._stats = json.loads(path.read_text(encoding="utf-8"))
+                logger.info("Loaded UI strategy statistics from %s.", path)
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable strategy statistics %s: %s", path, exc)
+
+    def order(self, step: str, strategies: Sequence[str]) -> List[str]:
+        """Return ``strategies`` in the order they should be tried for ``step``."""
+        with self._lock:
+            step_stats = self._stats.get(step, {})
+            return sorted(strategies, key=lambda name: self._rank(step_stats.get(name)))
+
+    def record(self, step: str, strategy: str, success: bool, elapsed_s: float) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(step, {}).setdefault(
+                strategy,
+                {"successes": 0, "failures": 0, "success_seconds": 0.0, "streak": 0},
+            )
+            if success:
+                entry["successes"] += 1
+                entry["success_seconds"] += elapsed_s
+                entry["streak"] = 0
+            else:
+                entry["failures"] += 1
+                entry["streak"] += 1
+                if entry["streak"] == self.demote_after:
+                    logger.info(
+                        "Demoting UI strategy '%s' for %s after %d failures in a row.",
+                        strategy,
+                        step,
+                        self.demote_after,
+                    )
+            if entry["successes"] + entry["failures"] >= self.max_samples:
+                for key in ("successes", "failures", "success_seconds"):
+                    entry[key] /= 2
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            payload = json.dumps(self._stats, indent=2, sort_keys=True)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("Unable to save strategy statistics to %s: %s", self.path, exc)
+
+    def _rank(self, entry: Optional[Dict[str, float]]) -> tuple[bool, float, float]:
+        if entry is None:
+            # Untried strategies keep their declared position among equally unknown ones.
+            return (False, -0.5, 0.0)
+        successes, failures = entry["successes"], entry["failures"]
+        rate = (successes + 1) / (successes + failures + 2)
+        mean_seconds = entry["success_seconds"] / successes if successes else float("inf")
+        return (entry["streak"] >= self.demote_after, -rate, mean_seconds)
+
+
+__all__ = ["StrategyStats"]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from playwright.sync_api import sync_playwright
+
+from src.automation.browser_server import WarmBrowser
+from src.config import settings
+from src.logging_conf import configure_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Inicia (o verifica) el Chromium persistente que reutilizan las ejecuciones del robot."
+    )
+    parser.add_argument(
+        "--endpoint",
+        default=None,
+        help="Endpoint DevTools del navegador (por defecto PLAYWRIGHT_BROWSER_ENDPOINT, ej. http://127.0.0.1:9222).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Solo verifica que el navegador responda, sin iniciarlo.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    configure_logging(settings.runtime.log_level)
+    warm_browser = WarmBrowser.from_settings(settings.playwright, endpoint=args.endpoint)
+    if warm_browser is None:
+        sys.exit("Defina PLAYWRIGHT_BROWSER_ENDPOINT o use --endpoint.")
+    endpoint = warm_browser.endpoint
+    if args.check:
+        healthy = warm_browser.healthy()
+        print(f"{endpoint}: {'disponible' if healthy else 'sin respuesta'}")
+        sys.exit(0 if healthy else 1)
+    with sync_playwright() as playwright:
+        running = warm_browser.ensure_running(playwright.chromium.executable_path)
+    print(f"{endpoint}: {'disponible' if running else 'no se pudo iniciar'}")
+    sys.exit(0 if running else 1)
+
+
+if __name__ == "__main__":
+    main()
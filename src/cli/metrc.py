@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 
-from src.services.pipeline import run
+from src.services.pipeline import run, run_async
 
 
 def parse_args() -> argparse.Namespace:
@@ -16,12 +17,36 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Cantidad de dias hacia atras para el filtro de fechas (ej. 180).",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Cantidad de contextos de navegador en paralelo para la verificacion por Tag (VERIFY_WORKERS).",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=int,
+        default=None,
+        help="Presupuesto de tiempo de la ejecucion en segundos (RUN_BUDGET_SECONDS); los Tags que no alcancen se difieren a la siguiente ejecucion.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("sync", "async"),
+        default="sync",
+        help="Motor de Playwright a utilizar: sync (MetrcRobot) o async (AsyncMetrcRobot).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    run(date_range_days=args.days)
+    if args.engine == "async":
+        asyncio.run(
+            run_async(date_range_days=args.days, verify_workers=args.workers, deadline_seconds=args.deadline)
+        )
+    else:
+        run(date_range_days=args.days, verify_workers=args.workers, deadline_seconds=args.deadline)
 
 
 if __name__ == "__main__":
@@ -39,6 +39,20 @@ def _get_int(name: str, default: int) -> int:
     return int(value)
 
 
+def _get_list(name: str, default: str) -> tuple[str, ...]:
+    value = os.getenv(name, default)
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _get_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    value = os.getenv(name, default).strip().lower()
+    if value not in choices:
+        raise RuntimeError(
+            f"Invalid value '{value}' for environment variable '{name}' (expected one of {', '.join(choices)})"
+        )
+    return value
+
+
 @dataclass(frozen=True)
 class PlaywrightSettings:
     base_url: str
@@ -46,6 +60,19 @@ class PlaywrightSettings:
     password: str
     headless: bool
     slow_mo_ms: int
+    extraction_mode: str = "widget"
+    grid_data_url_pattern: str = r"/api/packages"
+    data_client: bool = False
+    grid_data_url: str = ""
+    grid_page_size: int = 0
+    storage_state_path: str = ""
+    strategy_stats_path: str = ""
+    overlay_guard: bool = True
+    browser_endpoint: str = ""
+    browser_autolaunch: bool = True
+    browser_profile_dir: str = ".playwright-cache/warm-profile"
+    block_resource_types: tuple[str, ...] = ()
+    block_domains: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -57,6 +84,8 @@ class DatabaseSettings:
     password: str
     schema: str
     table: str
+    bulk_load: bool = False
+    bulk_chunk_size: int = 5000
 
     @property
     def dsn(self) -> str:
@@ -72,6 +101,14 @@ class RuntimeSettings:
     max_retries: int
     retry_backoff_seconds: int
     date_range_days: int
+    tag_batch_size: int = 25
+    verify_workers: int = 1
+    verify_terminal_statuses: tuple[str, ...] = ()
+    verify_ttl_minutes: int = 60
+    verify_checkpoint_path: str = ""
+    run_budget_seconds: int = 0
+    run_reserve_seconds: int = 90
+    run_report_path: str = ""
 
 
 @dataclass(frozen=True)
@@ -88,6 +125,22 @@ class Settings:
             password=_get_env("METRC_PASSWORD"),
             headless=_get_bool("PLAYWRIGHT_HEADLESS", True),
             slow_mo_ms=_get_int("PLAYWRIGHT_SLOWMO_MS", 0),
+            extraction_mode=_get_choice("GRID_EXTRACTION_MODE", "widget", ("widget", "network", "dom")),
+            grid_data_url_pattern=_get_env("GRID_DATA_URL_PATTERN", r"/api/packages"),
+            data_client=_get_bool("METRC_DATA_CLIENT", False),
+            grid_data_url=_get_env("GRID_DATA_URL", ""),
+            grid_page_size=_get_int("GRID_PAGE_SIZE", 0),
+            storage_state_path=_get_env("PLAYWRIGHT_STORAGE_STATE_PATH", ""),
+            strategy_stats_path=_get_env("UI_STRATEGY_STATS_PATH", ""),
+            overlay_guard=_get_bool("PLAYWRIGHT_OVERLAY_GUARD", True),
+            browser_endpoint=_get_env("PLAYWRIGHT_BROWSER_ENDPOINT", ""),
+            browser_autolaunch=_get_bool("PLAYWRIGHT_BROWSER_AUTOLAUNCH", True),
+            browser_profile_dir=_get_env("PLAYWRIGHT_BROWSER_PROFILE_DIR", ".playwright-cache/warm-profile"),
+            block_resource_types=_get_list("PLAYWRIGHT_BLOCK_RESOURCE_TYPES", "image,font,media"),
+            block_domains=_get_list(
+                "PLAYWRIGHT_BLOCK_DOMAINS",
+                "stonly.com,google-analytics.com,googletagmanager.com,doubleclick.net,hotjar.com",
+            ),
         )
         database_settings = DatabaseSettings(
             host=_get_env("POSTGRES_HOST"),
@@ -97,12 +150,22 @@ class Settings:
             password=_get_env("POSTGRES_PASSWORD"),
             schema=_get_env("POSTGRES_SCHEMA", "public"),
             table=_get_env("POSTGRES_TABLE", "metrc_packages"),
+            bulk_load=_get_bool("DB_BULK_LOAD", False),
+            bulk_chunk_size=_get_int("DB_BULK_CHUNK_SIZE", 5000),
         )
         runtime_settings = RuntimeSettings(
             log_level=_get_env("LOG_LEVEL", "INFO"),
             max_retries=_get_int("MAX_RETRIES", 3),
             retry_backoff_seconds=_get_int("RETRY_BACKOFF_SECONDS", 5),
             date_range_days=_get_int("DATE_RANGE_DAYS", 30),
+            tag_batch_size=_get_int("TAG_BATCH_SIZE", 1),
+            verify_workers=_get_int("VERIFY_WORKERS", 1),
+            verify_terminal_statuses=_get_list("VERIFY_TERMINAL_STATUSES", "TestPassed,RetestPassed,RetestFailed"),
+            verify_ttl_minutes=_get_int("VERIFY_TTL_MINUTES", 60),
+            verify_checkpoint_path=_get_env("VERIFY_CHECKPOINT_PATH", ""),
+            run_budget_seconds=_get_int("RUN_BUDGET_SECONDS", 0),
+            run_reserve_seconds=_get_int("RUN_RESERVE_SECONDS", 90),
+            run_report_path=_get_env("RUN_REPORT_PATH", ""),
         )
         return cls(
             playwright=playwright_settings,
@@ -1,7 +1,29 @@
 "\"\"\"Database utilities for RPA-Metrics.\"\"\""
 
-from .repository import fetch_all_rows, insert_rows, update_status
+from .repository import (
+    InsertSummary,
+    VerificationPlan,
+    bulk_insert_rows,
+    fetch_all_rows,
+    insert_rows,
+    plan_verification,
+    update_status,
+    update_statuses,
+)
 from .engine import engine, session_scope
+from .models import ensure_schema
 
-__all__ = ["fetch_all_rows", "insert_rows", "update_status", "engine", "session_scope"]
+__all__ = [
+    "InsertSummary",
+    "VerificationPlan",
+    "bulk_insert_rows",
+    "fetch_all_rows",
+    "insert_rows",
+    "plan_verification",
+    "update_status",
+    "update_statuses",
+    "engine",
+    "ensure_schema",
+    "session_scope",
+]
 
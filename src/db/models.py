@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import Dict
+import logging
+from typing import Dict, List, Set, Tuple
 
-from sqlalchemy import Column, Date, DateTime, Integer, MetaData, String, Table
+from sqlalchemy import Column, Date, DateTime, Index, Integer, MetaData, String, Table, inspect
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateSchema
 
 from src.config.settings import settings
 
+logger = logging.getLogger(__name__)
+
 metadata = MetaData()
 _table_cache: Dict[str, Table] = {}
 
@@ -27,11 +34,76 @@ def get_table(table_name: str, *, schema: str | None = None) -> Table:
             Column("metrc_date", Date, nullable=False),
             Column("status_fetched_at", DateTime(timezone=True)),
             Column("raw_payload", JSONB),
+            # insert_rows and bulk_insert_rows rely on ON CONFLICT (metrc_id).
+            Index(f"ux_{table_name}_metrc_id", "metrc_id", unique=True),
+            # Routine 2 planning filters on the date window (and status).
+            Index(f"ix_{table_name}_metrc_date", "metrc_date"),
+            Index(f"ix_{table_name}_metrc_status_date", "metrc_status", "metrc_date"),
             schema=table_schema,
             extend_existing=True,
         )
     return _table_cache[cache_key]
 
 
-__all__ = ["get_table", "metadata"]
+def ensure_schema(bind: Engine, table_name: str, *, schema: str | None = None) -> None:
+    """
+    Idempotently create the schema, the table and its indexes, then verify them.
+
+    On an existing table, an index counts as present when any index or unique
+    constraint covers the same columns (whatever its name), so indexes a DBA already
+    created are reused. A missing unique index on ``metrc_id`` that cannot be created
+    raises ``RuntimeError``: every insert depends on it. A missing secondary index only
+    logs a warning, since the queries still work without it.
+    """
+    table = get_table(table_name, schema=schema)
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        if table.schema and not inspector.has_schema(table.schema):
+            connection.execute(CreateSchema(table.schema))
+            logger.info("Created schema %s.", table.schema)
+        if not inspector.has_table(table.name, schema=table.schema):
+            table.create(connection)
+            logger.info("Created table %s with its indexes.", table.fullname)
+            return
+        existing = _existing_indexes(inspector, table)
+
+    for index in _missing_indexes(table, existing):
+        # One transaction per index: a failed CREATE INDEX aborts its whole transaction.
+        try:
+            index.create(bind)
+            logger.info("Created index %s on %s.", index.name, table.fullname)
+        except SQLAlchemyError as exc:
+            if index.unique:
+                raise RuntimeError(
+                    f"{table.fullname} has no unique index on {', '.join(index.columns.keys())} "
+                    f"and it could not be created: {exc}"
+                ) from exc
+            logger.warning("Unable to create index %s on %s: %s", index.name, table.fullname, exc)
+
+
+def _existing_indexes(inspector: Inspector, table: Table) -> Set[Tuple[Tuple[str, ...], bool]]:
+    existing = {
+        (tuple(entry["column_names"]), bool(entry.get("unique")))
+        for entry in inspector.get_indexes(table.name, schema=table.schema)
+    }
+    existing.update(
+        (tuple(entry["column_names"]), True)
+        for entry in inspector.get_unique_constraints(table.name, schema=table.schema)
+    )
+    return existing
+
+
+def _missing_indexes(table: Table, existing: Set[Tuple[Tuple[str, ...], bool]]) -> List[Index]:
+    missing = []
+    # The unique index first: it is the one the run cannot do without.
+    for index in sorted(table.indexes, key=lambda index: (not index.unique, index.name or "")):
+        columns = tuple(index.columns.keys())
+        # A unique index also serves the lookups of a plain one on the same columns.
+        if (columns, True) in existing or (not index.unique and (columns, False) in existing):
+            continue
+        missing.append(index)
+    return missing
+
+
+__all__ = ["ensure_schema", "get_table", "metadata"]
 
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
+import csv
+import io
+import json
 import logging
-from datetime import date, datetime
-from typing import Dict, Iterable, List, Mapping, Optional
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set
 
-from sqlalchemy import func, select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    MetaData,
+    String,
+    Table,
+    case,
+    column,
+    func,
+    literal,
+    null,
+    select,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
 
 from src.config.settings import settings
 from src.db.engine import session_scope
@@ -16,47 +34,171 @@ logger = logging.getLogger(__name__)
 DATE_FORMAT = "%m/%d/%Y"
 
 
-def insert_rows(table_name: str, rows: Iterable[Mapping[str, object]]) -> int:
+@dataclass(frozen=True)
+class InsertSummary:
+    """Outcome of :func:`insert_rows`: rows inserted, already stored, and unusable."""
+
+    inserted: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: "InsertSummary") -> "InsertSummary":
+        return InsertSummary(
+            inserted=self.inserted + other.inserted,
+            duplicates=self.duplicates + other.duplicates,
+            skipped=self.skipped + other.skipped,
+        )
+
+
+def insert_rows(table_name: str, rows: Iterable[Mapping[str, object]]) -> InsertSummary:
     """
     Insert only new metrc_id values; existing metrc_id rows are skipped.
+
+    Existence is left to ``ON CONFLICT (metrc_id) DO NOTHING``: the statement returns the
+    ids it inserted, and every other candidate counts as a duplicate. Cost scales with
+    the number of rows passed in, not with the size of the table.
     """
     table = get_table(table_name, schema=settings.database.schema)
-    payloads: List[Dict[str, object]] = []
+    payloads: Dict[str, Dict[str, object]] = {}
+    mapped_rows = 0
+    skipped = 0
+
+    for row in rows:
+        mapped = _map_row(row)
+        if mapped is None:
+            skipped += 1
+            continue
+        mapped_rows += 1
+        # The status was read from METRC just now; routine 2 can rely on it until the TTL expires.
+        mapped["status_fetched_at"] = func.now()
+        # A tag repeated within the batch is a duplicate too; the first occurrence wins.
+        payloads.setdefault(str(mapped["metrc_id"]), mapped)
+
+    if skipped:
+        logger.warning("Skipped %d rows due to missing mandatory fields.", skipped)
+
+    inserted = 0
+    if payloads:
+        stmt = (
+            insert(table)
+            .values(list(payloads.values()))
+            .on_conflict_do_nothing(index_elements=["metrc_id"])
+            .returning(table.c.metrc_id)
+        )
+        with session_scope() as session:
+            inserted = len(session.execute(stmt).fetchall())
+
+    summary = InsertSummary(inserted=inserted, duplicates=mapped_rows - inserted, skipped=skipped)
+    if summary.duplicates:
+        logger.info("Skipped %d rows because metrc_id already existed.", summary.duplicates)
+    if summary.inserted:
+        logger.info("Inserted %d new rows into %s.", summary.inserted, table_name)
+    else:
+        logger.info("No new rows to insert into %s.", table_name)
+    return summary
+
+
+def bulk_insert_rows(
+    table_name: str,
+    rows: Iterable[Mapping[str, object]],
+    *,
+    chunk_size: Optional[int] = None,
+) -> InsertSummary:
+    """
+    Bulk-load variant of :func:`insert_rows` for large backfills (``DB_BULK_LOAD``).
+
+    Rows are streamed with ``COPY ... FROM STDIN`` into a temporary staging table,
+    ``chunk_size`` rows at a time, so memory stays flat regardless of how many rows
+    ``rows`` yields. One ``INSERT ... SELECT ... ON CONFLICT (metrc_id) DO NOTHING`` then
+    merges the staging table into the target in a single transaction.
+    """
+    table = get_table(table_name, schema=settings.database.schema)
+    chunk_size = max(1, chunk_size or settings.database.bulk_chunk_size)
+    staging = _staging_table()
+    columns = [column.name for column in staging.columns]
+    copy_sql = f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    mapped_rows = 0
     skipped = 0
-    duplicates = 0
 
     with session_scope() as session:
-        existing_ids = {
-            row[0]
-            for row in session.execute(select(table.c.metrc_id))
-        }
-
-        for row in rows:
-            mapped = _map_row(row)
-            if mapped is None:
-                skipped += 1
-                continue
-            if mapped["metrc_id"] in existing_ids:
-                duplicates += 1
-                continue
-            payloads.append(mapped)
+        connection = session.connection()
+        staging.create(connection)
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            pending = 0
+            for row in rows:
+                mapped = _map_row(row)
+                if mapped is None:
+                    skipped += 1
+                    continue
+                writer.writerow(
+                    (
+                        mapped_rows,
+                        mapped["metrc_id"],
+                        mapped["metrc_status"],
+                        mapped["metrc_date"],
+                        json.dumps(mapped["raw_payload"], default=str),
+                    )
+                )
+                mapped_rows += 1
+                pending += 1
+                if pending >= chunk_size:
+                    _copy_chunk(cursor, copy_sql, buffer)
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer, lineterminator="\n")
+                    pending = 0
+            if pending:
+                _copy_chunk(cursor, copy_sql, buffer)
+        finally:
+            cursor.close()
 
         if skipped:
             logger.warning("Skipped %d rows due to missing mandatory fields.", skipped)
-        if duplicates:
-            logger.info("Skipped %d rows because metrc_id already existed.", duplicates)
 
-        if not payloads:
-            logger.info("No new rows to insert into %s.", table_name)
-            return 0
+        # DO NOTHING also skips a tag repeated within ``rows``; ordering by seq keeps its
+        # first occurrence, as in insert_rows.
+        staged = select(
+            staging.c.metrc_id,
+            staging.c.metrc_status,
+            staging.c.metrc_date,
+            func.now(),
+            staging.c.raw_payload,
+        ).order_by(staging.c.seq)
+        stmt = (
+            insert(table)
+            .from_select(["metrc_id", "metrc_status", "metrc_date", "status_fetched_at", "raw_payload"], staged)
+            .on_conflict_do_nothing(index_elements=["metrc_id"])
+        )
+        result = session.execute(stmt) if mapped_rows else None
+        inserted = result.rowcount if result is not None else 0
+
+    summary = InsertSummary(inserted=inserted, duplicates=mapped_rows - inserted, skipped=skipped)
+    if summary.duplicates:
+        logger.info("Skipped %d rows because metrc_id already existed.", summary.duplicates)
+    logger.info("Bulk-loaded %d rows; inserted %d new rows into %s.", mapped_rows, summary.inserted, table_name)
+    return summary
 
-        insert_stmt = insert(table).values(payloads)
-        stmt = insert_stmt.on_conflict_do_nothing(index_elements=["metrc_id"])
 
-        result = session.execute(stmt)
-        rowcount = result.rowcount if result is not None else 0
-        logger.info("Inserted %d new rows into %s.", rowcount, table_name)
-        return rowcount
+def _staging_table() -> Table:
+    # A fresh MetaData per call: the temporary table lives only until the transaction commits.
+    return Table(
+        "metrc_staging_rows",
+        MetaData(),
+        Column("seq", BigInteger, nullable=False),
+        Column("metrc_id", String(255), nullable=False),
+        Column("metrc_status", String(64), nullable=False),
+        Column("metrc_date", Date, nullable=False),
+        Column("raw_payload", JSONB),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+def _copy_chunk(cursor: Any, copy_sql: str, buffer: io.StringIO) -> None:
+    buffer.seek(0)
+    cursor.copy_expert(copy_sql, buffer)
 
 
 def update_status(table_name: str, metrc_id: str, new_status: str) -> int:
@@ -79,6 +221,106 @@ def update_status(table_name: str, metrc_id: str, new_status: str) -> int:
         return updated
 
 
+def update_statuses(table_name: str, outcomes: Mapping[str, str]) -> Set[str]:
+    """
+    Apply a batch of routine 2 outcomes (metrc_id -> status just read from METRC) in one
+    ``UPDATE ... FROM (VALUES ...)`` statement.
+
+    Every matched row gets the verified status and a fresh ``status_fetched_at``, so
+    verified-but-unchanged rows are bumped in the same round trip. Returns the ids whose
+    stored status actually changed.
+    """
+    if not outcomes:
+        return set()
+    table = get_table(table_name, schema=settings.database.schema)
+    verified = values(
+        column("metrc_id", String),
+        column("metrc_status", String),
+        name="verified",
+    ).data(list(outcomes.items()))
+    # Self-join: ``stored`` still holds the pre-update status when RETURNING is evaluated.
+    stored = table.alias("stored")
+    stmt = (
+        table.update()
+        .where(stored.c.id == table.c.id)
+        .where(stored.c.metrc_id == verified.c.metrc_id)
+        .values(metrc_status=verified.c.metrc_status, status_fetched_at=func.now())
+        .returning(
+            table.c.metrc_id,
+            stored.c.metrc_status.is_distinct_from(verified.c.metrc_status).label("changed"),
+        )
+    )
+    with session_scope() as session:
+        result = session.execute(stmt).fetchall()
+    changed = {row.metrc_id for row in result if row.changed}
+    missing = len(outcomes) - len({row.metrc_id for row in result})
+    if missing:
+        logger.warning("No rows matched %d verified metrc_id values.", missing)
+    logger.info("Verified %d rows in %s; %d changed status.", len(result), table_name, len(changed))
+    return changed
+
+
+@dataclass(frozen=True)
+class VerificationPlan:
+    """Rows routine 2 should re-check, plus how many rows were skipped per reason."""
+
+    candidates: List[Dict[str, object]]
+    skipped: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return len(self.candidates) + sum(self.skipped.values())
+
+
+def plan_verification(
+    table_name: str,
+    start_date: date,
+    end_date: date,
+    *,
+    terminal_statuses: Sequence[str] = (),
+    ttl: Optional[timedelta] = None,
+) -> VerificationPlan:
+    """
+    Select, in one query, the rows dated within [start_date, end_date] whose status can
+    still change: status not terminal and last fetched more than ``ttl`` ago.
+
+    Skipped rows are not returned individually, only counted per reason
+    (``terminal`` or ``fresh``).
+    """
+    table = get_table(table_name, schema=settings.database.schema)
+    reasons = []
+    if terminal_statuses:
+        reasons.append((table.c.metrc_status.in_(list(terminal_statuses)), literal("terminal")))
+    if ttl:
+        reasons.append((table.c.status_fetched_at > func.now() - ttl, literal("fresh")))
+    skip_reason = case(*reasons, else_=null()) if reasons else null()
+
+    in_range = (
+        select(table.c.metrc_id, table.c.metrc_status, skip_reason.label("skip_reason"))
+        .where(table.c.metrc_date.between(start_date, end_date))
+        .subquery()
+    )
+    is_candidate = in_range.c.skip_reason.is_(None)
+    metrc_id = case((is_candidate, in_range.c.metrc_id), else_=null())
+    metrc_status = case((is_candidate, in_range.c.metrc_status), else_=null())
+    stmt = select(
+        metrc_id.label("metrc_id"),
+        metrc_status.label("metrc_status"),
+        in_range.c.skip_reason,
+        func.count().label("row_count"),
+    ).group_by(metrc_id, metrc_status, in_range.c.skip_reason)
+
+    candidates: List[Dict[str, object]] = []
+    skipped: Dict[str, int] = {}
+    with session_scope() as session:
+        for row in session.execute(stmt):
+            if row.skip_reason is None:
+                candidates.append({"metrc_id": row.metrc_id, "metrc_status": row.metrc_status})
+            else:
+                skipped[row.skip_reason] = row.row_count
+    return VerificationPlan(candidates=candidates, skipped=skipped)
+
+
 def fetch_all_rows(table_name: str) -> List[Dict[str, object]]:
     """
     Fetch all rows (metrc_id, metrc_status, metrc_date) from the table.
@@ -141,5 +383,14 @@ def _parse_date(value: object) -> Optional[date]:
         return None
 
 
-__all__ = ["insert_rows", "update_status", "fetch_all_rows"]
+__all__ = [
+    "InsertSummary",
+    "VerificationPlan",
+    "bulk_insert_rows",
+    "fetch_all_rows",
+    "insert_rows",
+    "plan_verification",
+    "update_status",
+    "update_statuses",
+]
 
@@ -1,6 +1,6 @@
 "\"\"\"Service layer entrypoints.\"\"\""
 
-from .pipeline import run
+from .pipeline import run, run_async
 
-__all__ = ["run"]
+__all__ = ["run", "run_async"]
 
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class RunCheckpoint:
+    """
+    Append-only record of the tags routine 2 has already settled in the current run.
+
+    The file is JSON Lines: a header with the verification window, then one line per
+    settled tag (``{"tag": ...}``) or per tag deferred by the run budget
+    (``{"deferred": ...}``), written as soon as the outcome is persisted. A run that
+    crashes leaves the file behind; the next run over the same window resumes from it
+    and skips the settled tags. Deferred tags are carried to the next run whatever its
+    window and verified first. :meth:`complete` keeps only this run's deferred tags, or
+    removes the file when there are none.
+    """
+
+    def __init__(self, path: Path, window: tuple[date, date]) -> None:
+        self.path = path
+        self.window = window
+        self._done: Set[str] = set()
+        self._carried: List[str] = []
+        self._deferred: List[str] = []
+        self._lock = threading.Lock()
+        self._load()
+        if not self.path.exists():
+            self._write_header()
+            for metrc_id in self._carried:
+                self._append({"deferred": metrc_id})
+
+    @classmethod
+    def open(cls, path: str, window: tuple[date, date]) -> Optional["RunCheckpoint"]:
+        return cls(Path(path), window) if path else None
+
+    @property
+    def resumed(self) -> int:
+        return len(self._done)
+
+    @property
+    def carried(self) -> int:
+        return len(self._carried)
+
+    def pending(self, records: Iterable[Mapping[str, object]]) -> List[Mapping[str, object]]:
+        """
+        Drop the records whose Tag was already settled by the interrupted run and move
+        the tags deferred by the previous run to the front.
+        """
+        with self._lock:
+            remaining = [record for record in records if record.get("Tag") not in self._done]
+            order = {metrc_id: position for position, metrc_id in enumerate(self._carried)}
+        # sorted() is stable: carried tags keep their deferral order, the rest the plan's.
+        return sorted(remaining, key=lambda record: order.get(record.get("Tag"), len(order)))
+
+    def mark_done(self, metrc_id: str) -> None:
+        with self._lock:
+            if metrc_id in self._done:
+                return
+            self._done.add(metrc_id)
+            self._append({"tag": metrc_id})
+
+    def mark_deferred(self, metrc_id: str) -> None:
+        with self._lock:
+            self._deferred.append(metrc_id)
+            self._append({"deferred": metrc_id})
+
+    def complete(self) -> None:
+        with self._lock:
+            self._done.clear()
+            self._carried = []
+            if not self._deferred:
+                self.path.unlink(missing_ok=True)
+                return
+            self._write_header()
+            for metrc_id in self._deferred:
+                self._append({"deferred": metrc_id})
+            logger.info("Checkpoint %s: %d deferred tags queued for the next run.", self.path, len(self._deferred))
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+            header = json.loads(lines[0]) if lines else {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.path, exc)
+            self.path.unlink(missing_ok=True)
+            return
+        done: Set[str] = set()
+        for line in lines[1:]:
+            try:
+                entry: Dict[str, object] = json.loads(line)
+            except ValueError:
+                # A crash can truncate the last line; everything before it is intact.
+                continue
+            if isinstance(entry.get("tag"), str):
+                done.add(entry["tag"])
+            elif isinstance(entry.get("deferred"), str) and entry["deferred"] not in self._carried:
+                self._carried.append(entry["deferred"])
+        self._carried = [metrc_id for metrc_id in self._carried if metrc_id not in done]
+
+        if header.get("window") != [day.isoformat() for day in self.window]:
+            logger.info("Checkpoint %s belongs to another date window; starting a new run.", self.path)
+            self.path.unlink(missing_ok=True)
+        else:
+            self._done = done
+            if not self.path.read_bytes().endswith(b"\n"):
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.write("\n")
+            logger.info("Resuming from checkpoint %s: %d tags already done.", self.path, len(self._done))
+        if self._carried:
+            logger.info("Checkpoint %s: %d tags deferred by the previous run go first.", self.path, len(self._carried))
+
+    def _write_header(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "window": [day.isoformat() for day in self.window],
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+
+    def _append(self, entry: Dict[str, object]) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+__all__ = ["RunCheckpoint"]
@@ -1,79 +1,355 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import List, Mapping, Optional
+import queue
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Type, TypeVar
 
+from src.automation.async_robot import AsyncMetrcRobot
+from src.automation.base import BaseMetrcRobot
 from src.automation.robot import MetrcRobot
 from src.config import settings
-from src.db import fetch_all_rows, insert_rows, update_status
+from src.db import (
+    InsertSummary,
+    bulk_insert_rows,
+    engine,
+    ensure_schema,
+    insert_rows,
+    plan_verification,
+    update_statuses,
+)
 from src.logging_conf import configure_logging
+from src.services.checkpoint import RunCheckpoint
+from src.services.scheduler import RunScheduler
+from src.tracing import configure_tracing, span, write_report
 
+RobotT = TypeVar("RobotT", bound=BaseMetrcRobot)
 
-def run(date_range_days: Optional[int] = None) -> None:
+
+def run(
+    date_range_days: Optional[int] = None,
+    verify_workers: Optional[int] = None,
+    deadline_seconds: Optional[int] = None,
+) -> None:
     configure_logging(settings.runtime.log_level)
+    configure_tracing(settings.runtime.run_report_path)
     logger = logging.getLogger(__name__)
-    robot = MetrcRobot(
+    scheduler = _build_scheduler(deadline_seconds)
+    robot = _build_robot(MetrcRobot, date_range_days, verify_workers)
+    try:
+        _prepare_database()
+        with robot.session():
+            extracted, persisted = _persist_pages(robot.iter_table_pages())
+            _log_persisted(extracted, persisted, logger)
+
+            prepared = _prepare_verification(robot.date_range_days, logger)
+            if prepared is not None:
+                records_for_verification, sink = prepared
+                robot.verify_status_by_tag(records_for_verification, on_outcome=sink, budget=scheduler)
+                sink.finish()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("Unhandled error during robot execution: %s", exc)
+        raise
+    finally:
+        write_report()
+
+
+async def run_async(
+    date_range_days: Optional[int] = None,
+    verify_workers: Optional[int] = None,
+    deadline_seconds: Optional[int] = None,
+) -> None:
+    """Same flow as :func:`run`, driven by :class:`AsyncMetrcRobot` on one event loop."""
+    configure_logging(settings.runtime.log_level)
+    configure_tracing(settings.runtime.run_report_path)
+    logger = logging.getLogger(__name__)
+    scheduler = _build_scheduler(deadline_seconds)
+    robot = _build_robot(AsyncMetrcRobot, date_range_days, verify_workers)
+    try:
+        await asyncio.to_thread(_prepare_database)
+        async with robot.session():
+            extracted, persisted = await _persist_pages_async(robot.iter_table_pages())
+            _log_persisted(extracted, persisted, logger)
+
+            prepared = await asyncio.to_thread(_prepare_verification, robot.date_range_days, logger)
+            if prepared is not None:
+                records_for_verification, sink = prepared
+                await robot.verify_status_by_tag(
+                    records_for_verification,
+                    on_outcome=lambda outcomes: asyncio.to_thread(sink, outcomes),
+                    budget=scheduler,
+                )
+                await asyncio.to_thread(sink.finish)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception("Unhandled error during robot execution: %s", exc)
+        raise
+    finally:
+        write_report()
+
+
+def _build_robot(
+    robot_cls: Type[RobotT],
+    date_range_days: Optional[int],
+    verify_workers: Optional[int],
+) -> RobotT:
+    return robot_cls(
         settings.playwright,
         date_range_days=date_range_days or settings.runtime.date_range_days,
+        tag_batch_size=settings.runtime.tag_batch_size,
+        verify_workers=verify_workers or settings.runtime.verify_workers,
+    )
+
+
+def _build_scheduler(deadline_seconds: Optional[int]) -> Optional[RunScheduler]:
+    return RunScheduler.from_budget(
+        deadline_seconds or settings.runtime.run_budget_seconds,
+        settings.runtime.run_reserve_seconds,
     )
+
+
+def _prepare_database() -> None:
+    with span("db.ensure_schema"):
+        ensure_schema(engine, settings.database.table, schema=settings.database.schema)
+
+
+def _persist_pages(pages: Iterable[List[Mapping[str, object]]]) -> Tuple[int, InsertSummary]:
+    """
+    Persist the pages of extracted rows as the robot yields them; returns the number of
+    rows extracted and the combined insert summary.
+
+    With ``DB_BULK_LOAD`` the whole page stream feeds one ``bulk_insert_rows`` call, which
+    COPYs it in ``DB_BULK_CHUNK_SIZE`` chunks and merges once; otherwise each page is
+    inserted on its own. If the robot fails mid-extraction, the pages it already yielded
+    are still merged before the error is raised.
+    """
+    extracted = 0
+    if settings.database.bulk_load:
+        failure: Optional[Exception] = None
+
+        def stream() -> Iterator[Mapping[str, object]]:
+            # A robot error must not reach bulk_insert_rows, which would roll back every
+            # staged row; end the stream instead and raise it once the load committed.
+            nonlocal extracted, failure
+            page_iter = iter(pages)
+            while True:
+                try:
+                    rows = next(page_iter)
+                except StopIteration:
+                    return
+                except Exception as exc:  # pylint: disable=broad-except
+                    failure = exc
+                    return
+                extracted += len(rows)
+                yield from rows
+
+        # No span here: the load stays open while the robot pages through the grid.
+        persisted = bulk_insert_rows(settings.database.table, stream())
+        if failure is not None:
+            logging.getLogger(__name__).warning(
+                "Extraction failed after %d rows; the bulk load inserted %d of them before raising.",
+                extracted,
+                persisted.inserted,
+            )
+            raise failure
+        return extracted, persisted
+
+    persisted = InsertSummary()
+    for rows in pages:
+        extracted += len(rows)
+        persisted += _persist_page(rows)
+    return extracted, persisted
+
+
+async def _persist_pages_async(pages: AsyncIterator[List[Mapping[str, object]]]) -> Tuple[int, InsertSummary]:
+    """Async counterpart of :func:`_persist_pages`; the database work runs in a thread."""
+    if not settings.database.bulk_load:
+        extracted, persisted = 0, InsertSummary()
+        async for rows in pages:
+            extracted += len(rows)
+            persisted += await asyncio.to_thread(_persist_page, rows)
+        return extracted, persisted
+
+    # The bulk load consumes a blocking iterator in its own thread; hand it the pages
+    # through a small bounded queue, ended by None.
+    handoff: "queue.Queue[Optional[List[Mapping[str, object]]]]" = queue.Queue(maxsize=2)
+    loader = asyncio.ensure_future(asyncio.to_thread(_persist_pages, iter(handoff.get, None)))
+
+    async def offer(rows: Optional[List[Mapping[str, object]]]) -> bool:
+        while not loader.done():
+            try:
+                handoff.put_nowait(rows)
+                return True
+            except queue.Full:
+                await asyncio.sleep(0.05)
+        return False
+
     try:
-        rows: List[Mapping[str, object]] = robot.fetch_table_rows()
-        logger.info("Robot extracted %d rows (post date + TestingInProgress filters)", len(rows))
+        async for rows in pages:
+            if not await offer(rows):
+                break  # The loader failed; its error is raised below.
+    finally:
+        await offer(None)
+        await asyncio.wait({loader})
+    return loader.result()
 
-        inserted = insert_rows(settings.database.table, rows) if rows else 0
-        if inserted:
-            logger.info("Routine 1: upserted %d rows into DB.", inserted)
-        else:
-            logger.warning("Routine 1: no new rows persisted.")
-
-        db_records = fetch_all_rows(settings.database.table)
-        if db_records:
-            today = datetime.now(timezone.utc).date()
-            start_date = today - timedelta(days=robot.date_range_days)
-            in_range = [
-                r
-                for r in db_records
-                if r.get("metrc_date") is not None and start_date <= r["metrc_date"] <= today
-            ]
-            records_for_verification = [
-                {"Tag": r["metrc_id"], "LT Status": r["metrc_status"]}
-                for r in in_range
-            ]
+
+def _persist_page(rows: List[Mapping[str, object]]) -> InsertSummary:
+    """Persist one page of extracted rows as soon as the robot yields it."""
+    if not rows:
+        return InsertSummary()
+    with span("db.insert_rows"):
+        return insert_rows(settings.database.table, rows)
+
+
+def _log_persisted(extracted: int, persisted: InsertSummary, logger: logging.Logger) -> None:
+    logger.info("Robot extracted %d rows (post date + TestingInProgress filters)", extracted)
+    if persisted.inserted:
+        logger.info(
+            "Routine 1: inserted %d new rows into DB (%d already stored, %d skipped for missing fields).",
+            persisted.inserted,
+            persisted.duplicates,
+            persisted.skipped,
+        )
+    else:
+        logger.warning("Routine 1: no new rows persisted.")
+
+
+def _verification_window(date_range_days: int) -> Tuple[date, date]:
+    today = datetime.now(timezone.utc).date()
+    return today - timedelta(days=date_range_days), today
+
+
+def _prepare_verification(
+    date_range_days: int,
+    logger: logging.Logger,
+) -> Optional[Tuple[List[Dict[str, object]], "_OutcomeSink"]]:
+    records_for_verification = _plan_verification(date_range_days, logger)
+    if records_for_verification is None:
+        return None
+    checkpoint = RunCheckpoint.open(settings.runtime.verify_checkpoint_path, _verification_window(date_range_days))
+    if checkpoint is not None:
+        pending = checkpoint.pending(records_for_verification)
+        if checkpoint.resumed:
             logger.info(
-                "Routine 2: checking %d records in date range %s - %s (of %d in DB).",
+                "Routine 2: resuming an interrupted run; %d of %d tags already done.",
+                len(records_for_verification) - len(pending),
                 len(records_for_verification),
-                start_date,
-                today,
-                len(db_records),
             )
-            updates = robot.verify_status_by_tag(records_for_verification)
-            changed = 0
-            for outcome in updates:
-                if outcome.get("success") and outcome.get("fetched_status") is not None:
-                    if outcome["changed"]:
-                        update_status(
-                            settings.database.table,
-                            outcome["metrc_id"],
-                            outcome["fetched_status"],
-                        )
-                        changed += 1
-                else:
-                    logger.error(
-                        "Routine 2: Tag %s failed after %d attempts.",
-                        outcome.get("metrc_id"),
-                        outcome.get("attempts"),
-                    )
-            if changed:
-                logger.info("Routine 2: updated %d rows in DB.", changed)
+        records_for_verification = pending
+    return records_for_verification, _OutcomeSink(logger, checkpoint)
+
+
+def _plan_verification(date_range_days: int, logger: logging.Logger) -> Optional[List[Dict[str, object]]]:
+    start_date, today = _verification_window(date_range_days)
+    ttl_minutes = settings.runtime.verify_ttl_minutes
+    with span("db.plan_verification"):
+        plan = plan_verification(
+            settings.database.table,
+            start_date,
+            today,
+            terminal_statuses=settings.runtime.verify_terminal_statuses,
+            ttl=timedelta(minutes=ttl_minutes) if ttl_minutes > 0 else None,
+        )
+    if not plan.total:
+        logger.info("Routine 2: skipped (no rows in date range %s - %s).", start_date, today)
+        return None
+
+    if plan.skipped:
+        logger.info(
+            "Routine 2: skipping %d of %d rows (%s).",
+            sum(plan.skipped.values()),
+            plan.total,
+            ", ".join(f"{reason}={count}" for reason, count in sorted(plan.skipped.items())),
+        )
+    if not plan.candidates:
+        logger.info("Routine 2: nothing to verify; every row is terminal or fetched within %d minutes.", ttl_minutes)
+        return None
+
+    records_for_verification = [
+        {"Tag": r["metrc_id"], "LT Status": r["metrc_status"]}
+        for r in plan.candidates
+    ]
+    logger.info(
+        "Routine 2: checking %d records in date range %s - %s (of %d in range).",
+        len(records_for_verification),
+        start_date,
+        today,
+        plan.total,
+    )
+    return records_for_verification
+
+
+class _OutcomeSink:
+    """
+    Persists the outcomes of each routine 2 unit (one tag or one batch) as soon as the
+    robot reports it: the verified statuses go out in one ``update_statuses`` statement
+    and the unit's tags are then recorded in the run checkpoint. Units may arrive from
+    several worker threads.
+    """
+
+    def __init__(self, logger: logging.Logger, checkpoint: Optional[RunCheckpoint]) -> None:
+        self.logger = logger
+        self.checkpoint = checkpoint
+        self.changed = 0
+        self.deferred = 0
+        self.missing: List[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, outcomes: List[Dict[str, object]]) -> None:
+        verified: Dict[str, str] = {}
+        settled: List[str] = []
+        for outcome in outcomes:
+            metrc_id = outcome["metrc_id"]
+            if outcome.get("success") and outcome.get("fetched_status") is not None:
+                verified[metrc_id] = outcome["fetched_status"]
+            elif outcome.get("missing"):
+                with self._lock:
+                    self.missing.append(metrc_id)
+                settled.append(metrc_id)
+            elif outcome.get("deferred"):
+                with self._lock:
+                    self.deferred += 1
+                if self.checkpoint is not None:
+                    self.checkpoint.mark_deferred(metrc_id)
             else:
-                logger.info("Routine 2: no status changes detected.")
-        else:
-            logger.info("Routine 2: skipped (no rows from routine 1).")
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.exception("Unhandled error during robot execution: %s", exc)
-        raise
+                # Not settled: a resumed run verifies this tag again.
+                self.logger.error(
+                    "Routine 2: Tag %s failed after %d attempts.",
+                    metrc_id,
+                    outcome.get("attempts"),
+                )
+
+        if verified:
+            with span("db.update_statuses"):
+                changed = update_statuses(settings.database.table, verified)
+            with self._lock:
+                self.changed += len(changed)
+            settled.extend(verified)
+        # Only once stored: a tag still in flight when the run dies is verified again.
+        if self.checkpoint is not None:
+            for metrc_id in settled:
+                self.checkpoint.mark_done(metrc_id)
 
+    def finish(self) -> None:
+        if self.missing:
+            self.logger.warning(
+                "Routine 2: %d tags not found in METRC grid: %s",
+                len(self.missing),
+                ", ".join(self.missing),
+            )
+        if self.changed:
+            self.logger.info("Routine 2: updated %d rows in DB.", self.changed)
+        else:
+            self.logger.info("Routine 2: no status changes detected.")
+        if self.deferred:
+            self.logger.warning(
+                "Routine 2: %d tags deferred to the next run to stay within the run budget.",
+                self.deferred,
+            )
+        if self.checkpoint is not None:
+            self.checkpoint.complete()
 
-__all__ = ["run"]
 
+__all__ = ["run", "run_async"]
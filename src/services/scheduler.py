@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RunScheduler:
+    """
+    Keeps a run inside its time budget (e.g. the Container Apps ``--replica-timeout``).
+
+    Verification work is admitted only while the remaining time covers the expected cost
+    of the next unit, estimated from the rolling per-tag latency, plus ``reserve_seconds``
+    for flushing results and closing the browser. Work that is not admitted is deferred
+    to the next run instead of being cut off by a hard kill.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float,
+        *,
+        reserve_seconds: float = 90.0,
+        initial_tag_seconds: float = 5.0,
+        window: int = 50,
+    ) -> None:
+        self.budget_seconds = budget_seconds
+        self.reserve_seconds = reserve_seconds
+        self.initial_tag_seconds = initial_tag_seconds
+        self._started = time.monotonic()
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._exhausted = False
+
+    @classmethod
+    def from_budget(cls, budget_seconds: Optional[int], reserve_seconds: int) -> Optional["RunScheduler"]:
+        if not budget_seconds or budget_seconds <= 0:
+            return None
+        logger.info("Run budget: %ds (%ds reserved to flush results).", budget_seconds, reserve_seconds)
+        return cls(budget_seconds, reserve_seconds=reserve_seconds)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def remaining(self) -> float:
+        return self.budget_seconds - self.elapsed()
+
+    def tag_latency(self) -> float:
+        """Rolling 90th percentile of the seconds spent per tag."""
+        with self._lock:
+            if not self._samples:
+                return self.initial_tag_seconds
+            ordered = sorted(self._samples)
+        return ordered[int(0.9 * (len(ordered) - 1))]
+
+    def admit(self, tag_count: int) -> bool:
+        """Whether a unit of ``tag_count`` tags can still be verified before the deadline."""
+        needed = self.tag_latency() * tag_count + self.reserve_seconds
+        remaining = self.remaining()
+        if remaining >= needed:
+            return True
+        with self._lock:
+            first_refusal = not self._exhausted
+            self._exhausted = True
+        if first_refusal:
+            logger.warning(
+                "Run budget nearly spent (%.0fs left, next unit needs ~%.0fs); deferring the remaining tags.",
+                remaining,
+                needed,
+            )
+        return False
+
+    def record(self, tag_count: int, seconds: float) -> None:
+        if tag_count <= 0:
+            return
+        with self._lock:
+            self._samples.append(seconds / tag_count)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+
+__all__ = ["RunScheduler"]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared by every span taken while tracing is disabled, so a disabled span costs one call.
+_NULL_SPAN = nullcontext()
+
+
+class RunTracer:
+    """
+    Collects the wall time of each robot and pipeline step (``robot.login``,
+    ``robot.verify.tag``, ``db.insert_rows`` ...) and writes a JSON run report with the
+    count, p50, p95 and max per step plus the total wall time of the run.
+    """
+
+    def __init__(self, report_path: Path) -> None:
+        self.report_path = report_path
+        self._started = time.monotonic()
+        self._started_at = datetime.now(timezone.utc)
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, step: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                self._errors[step] += 1
+            raise
+        finally:
+            self.record(step, time.perf_counter() - started)
+
+    def record(self, step: str, seconds: float) -> None:
+        with self._lock:
+            self._durations[step].append(seconds)
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            durations = {step: sorted(values) for step, values in self._durations.items()}
+            errors = dict(self._errors)
+        steps: Dict[str, Dict[str, object]] = {}
+        for step, ordered in sorted(durations.items()):
+            steps[step] = {
+                "count": len(ordered),
+                "total_s": round(sum(ordered), 4),
+                "p50_s": round(_percentile(ordered, 0.5), 4),
+                "p95_s": round(_percentile(ordered, 0.95), 4),
+                "max_s": round(ordered[-1], 4),
+                "errors": errors.get(step, 0),
+            }
+        return {
+            "started_at": self._started_at.isoformat(),
+            "wall_s": round(time.monotonic() - self._started, 3),
+            "steps": steps,
+        }
+
+    def write(self) -> None:
+        report = self.report()
+        # Also logged on one line: container job logs outlive the replica's filesystem.
+        logger.info("Run report: %s", json.dumps(report, separators=(",", ":")))
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.report_path.with_name(self.report_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.report_path)
+        except OSError as exc:
+            logger.warning("Unable to write run report to %s: %s", self.report_path, exc)
+            return
+        logger.info("Run report written to %s.", self.report_path)
+
+
+_tracer: Optional[RunTracer] = None
+
+
+def configure_tracing(report_path: str) -> Optional[RunTracer]:
+    """Start tracing a run when ``report_path`` is set (``RUN_REPORT_PATH``); disable it otherwise."""
+    global _tracer
+    _tracer = RunTracer(Path(report_path)) if report_path else None
+    return _tracer
+
+
+def span(step: str) -> AbstractContextManager[None]:
+    """Time the enclosed block as one occurrence of ``step`` (a no-op when tracing is off)."""
+    tracer = _tracer
+    return tracer.span(step) if tracer is not None else _NULL_SPAN
+
+
+def write_report() -> None:
+    if _tracer is not None:
+        _tracer.write()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+__all__ = ["RunTracer", "configure_tracing", "span", "write_report"]
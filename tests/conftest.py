@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator
+
+import pytest
+
+from tests.standin import StandInConfig, StandInServer
+from tests.standin.benchmark import RESULTS, format_results, write_report
+
+if TYPE_CHECKING:
+    from src.config import Settings
+
+# Placeholders for what src.config requires at import time. Only the offline_env fixture
+# applies them, so the live smoke test keeps running against the real environment.
+OFFLINE_ENV = {
+    "METRC_BASE_URL": "http://127.0.0.1/",
+    "METRC_USERNAME": "standin",
+    "METRC_PASSWORD": "standin",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_DB": "metrc",
+    "POSTGRES_USER": "metrc",
+    "POSTGRES_PASSWORD": "metrc",
+}
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "benchmark: robot benchmark against the local METRC stand-in")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    if not RESULTS:
+        return
+    terminalreporter.write_sep("-", "robot benchmarks")
+    for line in format_results(RESULTS):
+        terminalreporter.write_line(line)
+    report_path = os.getenv("STANDIN_BENCHMARK_REPORT")
+    write_report(RESULTS, Path(report_path) if report_path else None)
+
+
+@pytest.fixture(scope="session")
+def offline_env() -> "Settings":
+    """
+    Import ``src.config`` with placeholders for the variables the environment lacks and
+    return its settings; the environment is restored right after the import.
+    """
+    with pytest.MonkeyPatch.context() as patch:
+        for name, value in OFFLINE_ENV.items():
+            if not os.getenv(name):
+                patch.setenv(name, value)
+        from src.config import settings
+    return settings
+
+
+@pytest.fixture(scope="session")
+def chromium(offline_env) -> None:
+    """Skip the browser tests when Playwright cannot start (or reach) Chromium here."""
+    from playwright.sync_api import sync_playwright
+
+    from src.automation.browser_server import WarmBrowser
+
+    try:
+        with sync_playwright() as playwright:
+            warm_browser = WarmBrowser.from_settings(offline_env.playwright)
+            browser = warm_browser.connect(playwright) if warm_browser is not None else None
+            if browser is None:
+                browser = playwright.chromium.launch(headless=True)
+            browser.close()
+    except Exception as exc:
+        pytest.skip(f"Chromium unavailable: {str(exc).strip().splitlines()[0]}")
+
+
+@pytest.fixture(scope="session")
+def standin() -> Iterator[Callable[[int], StandInServer]]:
+    """Start (once per row count) a stand-in portal serving that many packages."""
+    servers: Dict[int, StandInServer] = {}
+    # The robot computes its date window in UTC; date the packages the same way.
+    today = datetime.now(timezone.utc).date()
+
+    def get(rows: int) -> StandInServer:
+        if rows not in servers:
+            latency_ms = int(os.getenv("STANDIN_LATENCY_MS", "0"))
+            servers[rows] = StandInServer(StandInConfig(rows=rows, latency_ms=latency_ms), today=today).start()
+        return servers[rows]
+
+    yield get
+    for server in servers.values():
+        server.stop()
@@ -0,0 +1,5 @@
+"""Local stand-in for the METRC packages portal, used by the robot benchmarks."""
+
+from tests.standin.server import DATA_PATH, PACKAGES_PATH, StandInConfig, StandInServer
+
+__all__ = ["DATA_PATH", "PACKAGES_PATH", "StandInConfig", "StandInServer"]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from tests.standin.server import StandInConfig, StandInServer
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sirve el portal METRC de prueba para ejecutar el robot sin conexión.")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto local (por defecto 8765).")
+    parser.add_argument("--rows", type=int, default=100, help="Cantidad de paquetes en la grilla.")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Demora agregada a cada respuesta de datos.")
+    parser.add_argument("--no-modal", action="store_true", help="No mostrar el modal CSV Templates.")
+    parser.add_argument("--no-alerts", action="store_true", help="No mostrar las alertas del sistema.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    config = StandInConfig(
+        rows=args.rows,
+        latency_ms=args.latency_ms,
+        csv_modal=not args.no_modal,
+        system_alerts=not args.no_alerts,
+    )
+    with StandInServer(config).start(args.port) as server:
+        print(f"METRC de prueba en {server.url} (Ctrl+C para terminar)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+from tests.standin.server import StandInServer
+
+try:
+    from playwright._impl._connection import Connection
+except ImportError:  # pragma: no cover - private module moved in a newer Playwright
+    Connection = None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rows: int
+    wall_seconds: float = 0.0
+    playwright_calls: Counter = field(default_factory=Counter)
+    server_requests: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "playwright_calls": sum(self.playwright_calls.values()),
+            "playwright_methods": dict(self.playwright_calls.most_common()),
+            "server_requests": dict(self.server_requests),
+        }
+
+
+# Filled by the benchmark tests and printed/saved by tests/conftest.py at the end of the session.
+RESULTS: List[BenchmarkResult] = []
+
+
+class PlaywrightCallCounter:
+    """
+    Counts the messages the Playwright client sends to its driver, i.e. one per API
+    round trip (``evaluateExpression``, ``click``, ``fill``, ``waitForFunction`` ...).
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+
+    def install(self, monkeypatch: pytest.MonkeyPatch) -> bool:
+        send = getattr(Connection, "_send_message_to_server", None)
+        if send is None:
+            return False
+        calls = self.calls
+
+        def counting_send(connection: object, channel_owner: object, method: str, *args: object, **kwargs: object):
+            calls[method] += 1
+            return send(connection, channel_owner, method, *args, **kwargs)
+
+        monkeypatch.setattr(Connection, "_send_message_to_server", counting_send)
+        return True
+
+
+@contextmanager
+def measure(
+    name: str,
+    rows: int,
+    server: StandInServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[BenchmarkResult]:
+    """Time the block and count its Playwright calls and stand-in requests."""
+    result = BenchmarkResult(name, rows)
+    counter = PlaywrightCallCounter()
+    counter.install(monkeypatch)
+    requests_before = Counter(server.requests)
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.wall_seconds = time.perf_counter() - started
+        result.playwright_calls = counter.calls
+        result.server_requests = Counter(server.requests) - requests_before
+        RESULTS.append(result)
+
+
+def format_results(results: List[BenchmarkResult]) -> List[str]:
+    lines = [f"{'benchmark':<36} {'rows':>6} {'wall s':>8} {'pw calls':>9} {'data req':>9}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<36} {result.rows:>6} {result.wall_seconds:>8.2f} "
+            f"{sum(result.playwright_calls.values()):>9} {result.server_requests['data']:>9}"
+        )
+    return lines
+
+
+def write_report(results: List[BenchmarkResult], path: Optional[Path]) -> None:
+    if path is None or not results:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([result.as_dict() for result in results], indent=2), encoding="utf-8")
+
+
+__all__ = ["RESULTS", "BenchmarkResult", "PlaywrightCallCounter", "format_results", "measure", "write_report"]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional
+
+# Lab Test Status cycle; half of the packages are still TestingInProgress.
+STATUS_CYCLE = (
+    "TestingInProgress",
+    "TestPassed",
+    "TestingInProgress",
+    "NotSubmitted",
+    "TestingInProgress",
+    "TestFailed",
+)
+
+LOCATIONS = ("Vault A", "Vault B", "Processing Room")
+ITEMS = (
+    ("Flower - Blue Dream", "Buds", "Blue Dream"),
+    ("Pre-Roll 1g - OG Kush", "Pre-Roll Flower", "OG Kush"),
+    ("Shake - Mixed", "Shake/Trim", None),
+)
+
+# Packages are spread over this many days before "today", so a 30-day window keeps about
+# two thirds of them.
+DATE_SPREAD_DAYS = 45
+
+
+def package_tag(index: int) -> str:
+    return f"1A40E010000{index:013d}"
+
+
+def build_packages(count: int, today: Optional[date] = None) -> List[Dict[str, object]]:
+    """Deterministic grid records shaped like the METRC packages DataSource."""
+    today = today or date.today()
+    packages: List[Dict[str, object]] = []
+    for index in range(count):
+        packaged = today - timedelta(days=index % DATE_SPREAD_DAYS)
+        item_name, category, strain = ITEMS[index % len(ITEMS)]
+        status = STATUS_CYCLE[index % len(STATUS_CYCLE)]
+        packages.append(
+            {
+                "Id": index + 1,
+                "Label": package_tag(index),
+                "SourceHarvestNames": f"Harvest {index % 7 + 1}",
+                "SourcePackageLabels": [package_tag(index + count)] if index % 4 == 0 else [],
+                "SourceProcessingJobNames": None,
+                "LocationName": LOCATIONS[index % len(LOCATIONS)],
+                "SublocationName": None,
+                "Item": {"Name": item_name, "ProductCategoryName": category, "StrainName": strain},
+                "Quantity": float(index % 50 + 1),
+                "UnitOfMeasureAbbreviation": "g",
+                "ProductionBatchNumber": f"PB-{index // 10:04d}",
+                "LabTestingStateName": status,
+                "IsOnHold": index % 17 == 0,
+                "PackagedDate": f"{packaged.isoformat()}T00:00:00",
+                "ReceivedDateTime": f"{packaged.isoformat()}T14:30:00" if index % 3 == 0 else None,
+                "LabTestResultExpirationDateTime": (
+                    f"{(packaged + timedelta(days=365)).isoformat()}T00:00:00" if status == "TestPassed" else None
+                ),
+            }
+        )
+    return packages
+
+
+@dataclass(frozen=True)
+class GridQuery:
+    """The server-side operations the grid (or the data client) asks for."""
+
+    filter: Optional[Mapping[str, object]] = None
+    page: int = 1
+    page_size: int = 0
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, object], max_page_size: int = 0) -> "GridQuery":
+        page_size = _as_int(params.get("pageSize")) or _as_int(params.get("take")) or 0
+        if max_page_size:
+            # Like servers that silently clamp oversized requests.
+            page_size = min(page_size, max_page_size) if page_size else max_page_size
+        page = _as_int(params.get("page"))
+        if page is None:
+            skip = _as_int(params.get("skip")) or 0
+            page = skip // page_size + 1 if page_size else 1
+        grid_filter = params.get("filter")
+        return cls(grid_filter if isinstance(grid_filter, Mapping) else None, max(page, 1), page_size)
+
+    def apply(self, packages: Iterable[Mapping[str, object]]) -> tuple[List[Mapping[str, object]], int]:
+        matched = [package for package in packages if self.filter is None or matches(package, self.filter)]
+        if not self.page_size:
+            return matched, len(matched)
+        start = (self.page - 1) * self.page_size
+        return matched[start : start + self.page_size], len(matched)
+
+
+def matches(package: Mapping[str, object], expression: Mapping[str, object]) -> bool:
+    """Evaluate a Kendo filter descriptor (nested ``logic``/``filters`` or one condition)."""
+    if "filters" in expression:
+        results = (matches(package, child) for child in expression.get("filters") or [] if isinstance(child, Mapping))
+        return any(results) if str(expression.get("logic", "and")).lower() == "or" else all(results)
+    value = _field(package, str(expression.get("field", "")))
+    return _compare(value, str(expression.get("operator", "eq")), expression.get("value"))
+
+
+def _compare(value: object, operator: str, target: object) -> bool:
+    if isinstance(value, str) and _parse_datetime(value) is not None and _parse_datetime(target) is not None:
+        value, target = _parse_datetime(value), _parse_datetime(target)
+    elif isinstance(value, str) or isinstance(target, str):
+        value, target = str(value or "").lower(), str(target or "").lower()
+    if operator == "eq":
+        return value == target
+    if operator == "neq":
+        return value != target
+    if operator == "contains":
+        return str(target) in str(value)
+    if operator == "doesnotcontain":
+        return str(target) not in str(value)
+    if operator == "startswith":
+        return str(value).startswith(str(target))
+    if operator == "endswith":
+        return str(value).endswith(str(target))
+    if value is None or target is None:
+        return False
+    try:
+        return {
+            "gt": value > target,
+            "gte": value >= target,
+            "lt": value < target,
+            "lte": value <= target,
+        }[operator]
+    except (KeyError, TypeError):
+        return False
+
+
+def _field(package: Mapping[str, object], path: str) -> object:
+    current: object = package
+    for key in path.split("."):
+        if not isinstance(current, Mapping):
+            return None
+        current = current.get(key)
+    return current
+
+
+def _parse_datetime(value: object) -> Optional[datetime]:
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")[:19])
+    except ValueError:
+        return None
+
+
+def _as_int(value: object) -> Optional[int]:
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+__all__ = ["GridQuery", "build_packages", "matches", "package_tag"]
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from tests.standin.data import GridQuery, build_packages
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+SESSION_COOKIE = "MetrcAuth"
+PACKAGES_PATH = "/industry/packages"
+DATA_PATH = "/api/packages/active"
+
+_CONTENT_TYPES = {".html": "text/html; charset=utf-8", ".js": "application/javascript; charset=utf-8"}
+_PARAM_KEY = re.compile(r"[^\[\]]+")
+
+
+@dataclass(frozen=True)
+class StandInConfig:
+    """
+    Knobs of the stand-in portal; ``latency_ms`` delays every grid data response and
+    ``max_page_size`` (when set) caps the page size the data endpoint serves.
+    """
+
+    rows: int = 100
+    latency_ms: int = 0
+    max_page_size: int = 0
+    page_size: int = 20
+    page_sizes: Tuple[int, ...] = (20, 50, 100, 500)
+    csv_modal: bool = True
+    system_alerts: bool = True
+    modal_delay_ms: int = 300
+
+
+class StandInServer:
+    """
+    Local HTTP stand-in for the METRC packages portal: a login form, the packages page
+    with its Kendo-like ``#active-grid`` (column filter menus, pager, loading mask), the
+    CSV Templates modal, the dismissible system alerts and the JSON data endpoint.
+
+    Use it as a context manager; ``url`` is the base URL to give the robot and
+    ``requests`` counts the hits per route.
+    """
+
+    def __init__(self, config: Optional[StandInConfig] = None, today: Optional[date] = None) -> None:
+        self.config = config or StandInConfig()
+        self.today = today or date.today()
+        self.packages = build_packages(self.config.rows, self.today)
+        self.requests: Counter[str] = Counter()
+        self._sessions: set[str] = set()
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("Stand-in server is not running.")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self, port: int = 0) -> "StandInServer":
+        handler = type("StandInHandler", (_Handler,), {"server_state": self})
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrc-standin", daemon=True)
+        self._thread.start()
+        logger.info("METRC stand-in serving %d packages at %s", len(self.packages), self.url)
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+
+    def __enter__(self) -> "StandInServer":
+        return self if self._httpd is not None else self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def target_packages(self, date_range_days: int, status: str = "TestingInProgress") -> List[Dict[str, object]]:
+        """The packages routine 1 should extract for a ``date_range_days`` window."""
+        start = self.today - timedelta(days=date_range_days)
+        return [
+            package
+            for package in self.packages
+            if package["LabTestingStateName"] == status
+            and start <= datetime.fromisoformat(str(package["PackagedDate"])).date() <= self.today
+        ]
+
+    def query(self, params: Mapping[str, object]) -> Dict[str, object]:
+        query = GridQuery.from_params(params, max_page_size=self.config.max_page_size)
+        rows, total = query.apply(self.packages)
+        return {"Data": rows, "Total": total}
+
+    def open_session(self) -> str:
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions.add(token)
+        return token
+
+    def has_session(self, token: Optional[str]) -> bool:
+        with self._lock:
+            return token in self._sessions
+
+    def count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] += 1
+
+    def render(self, name: str) -> bytes:
+        body = (STATIC_DIR / name).read_text(encoding="utf-8")
+        if name == "packages.html":
+            page_config = asdict(self.config)
+            page_config["page_sizes"] = list(self.config.page_sizes)
+            page_config["data_url"] = DATA_PATH
+            body = body.replace("/*STANDIN_CONFIG*/", f"window.STANDIN = {json.dumps(page_config)};")
+        return body.encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_state: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path in {"/", "/log-in"}:
+            if self._authenticated():
+                self._redirect(PACKAGES_PATH)
+            else:
+                self._page("login", "login.html")
+        elif path == PACKAGES_PATH:
+            if self._authenticated():
+                self._page("packages", "packages.html")
+            else:
+                self._redirect("/")
+        elif path.startswith("/static/") and (STATIC_DIR / Path(path).name).is_file():
+            self._page("static", Path(path).name)
+        elif path == DATA_PATH:
+            self._data(_unflatten(parse_qsl(urlsplit(self.path).query)))
+        else:
+            self._send(HTTPStatus.NOT_FOUND, b"Not found", "text/plain")
+
+    def do_POST(self) -> None:
+        path = urlsplit(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        if path == "/log-in":
+            form = dict(parse_qsl(raw))
+            if form.get("username") and form.get("password"):
+                self.server_state.count("login")
+                token = self.server_state.open_session()
+                self._redirect(PACKAGES_PATH, cookie=f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")
+            else:
+                self._page("login", "login.html")
+        elif path == DATA_PATH:
+            if "json" in (self.headers.get("Content-Type") or ""):
+                try:
+                    params = json.loads(raw or "{}")
+                except ValueError:
+                    self._send(HTTPStatus.BAD_REQUEST, b"Invalid JSON", "text/plain")
+                    return
+            else:
+                params = _unflatten(parse_qsl(raw))
+            self._data(params)
+        else:
+            self._send(HTTPStatus.NOT_FOUND, b"Not found", "text/plain")
+
+    def _data(self, params: Mapping[str, object]) -> None:
+        if not self._authenticated():
+            # METRC answers an expired session with the login page, not with JSON.
+            self._redirect("/")
+            return
+        self.server_state.count("data")
+        if self.server_state.config.latency_ms:
+            time.sleep(self.server_state.config.latency_ms / 1000)
+        body = json.dumps(self.server_state.query(params)).encode("utf-8")
+        self._send(HTTPStatus.OK, body, "application/json; charset=utf-8")
+
+    def _page(self, route: str, name: str) -> None:
+        self.server_state.count(route)
+        self._send(HTTPStatus.OK, self.server_state.render(name), _CONTENT_TYPES[Path(name).suffix])
+
+    def _authenticated(self) -> bool:
+        cookie = SimpleCookie(self.headers.get("Cookie") or "")
+        morsel = cookie.get(SESSION_COOKIE)
+        return self.server_state.has_session(morsel.value if morsel else None)
+
+    def _redirect(self, location: str, cookie: Optional[str] = None) -> None:
+        self.send_response(HTTPStatus.FOUND)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug("stand-in: " + format, *args)
+
+
+def _unflatten(pairs: List[Tuple[str, str]]) -> Dict[str, object]:
+    """Decode jQuery.param style keys (``filter[filters][0][field]``) into nested values."""
+    root: Dict[str, object] = {}
+    for key, value in pairs:
+        parts = _PARAM_KEY.findall(key)
+        node = root
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})  # type: ignore[assignment]
+        if parts:
+            node[parts[-1]] = value
+    return _listify(root)  # type: ignore[return-value]
+
+
+def _listify(node: object) -> object:
+    if not isinstance(node, dict):
+        return node
+    items = {key: _listify(value) for key, value in node.items()}
+    if items and all(key.isdigit() for key in items):
+        return [items[key] for key in sorted(items, key=int)]
+    return items
+
+
+__all__ = ["DATA_PATH", "PACKAGES_PATH", "StandInConfig", "StandInServer"]
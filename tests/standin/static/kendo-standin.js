@@ -0,0 +1,432 @@
+/*
+ * Minimal stand-in for the parts of jQuery and Kendo UI the METRC robot relies on:
+ * `jQuery(element).data('kendoGrid')`, the grid DataSource API and events
+ * (query/filter/page/pageSize/total/view, requestStart/requestEnd/error/dataBound),
+ * the column menu with its filter popups, the pager and the loading mask.
+ */
+(function (window, document) {
+    'use strict';
+
+    const widgets = new WeakMap();
+    const jQuery = target => {
+        const element = typeof target === 'string' ? document.querySelector(target) : target;
+        return {
+            data(key, value) {
+                let bag = widgets.get(element);
+                if (!bag) {
+                    bag = {};
+                    widgets.set(element, bag);
+                }
+                if (value === undefined) { return bag[key]; }
+                bag[key] = value;
+                return this;
+            },
+        };
+    };
+
+    class Observable {
+        constructor() { this._handlers = {}; }
+
+        bind(name, handler) {
+            (this._handlers[name] = this._handlers[name] || []).push(handler);
+            return this;
+        }
+
+        trigger(name, event) {
+            for (const handler of this._handlers[name] || []) { handler.call(this, event || {}); }
+        }
+    }
+
+    const pad = n => String(n).padStart(2, '0');
+    const localIso = d => `${d.getFullYear()}-${pad(d.getMonth() + 1)}-${pad(d.getDate())}` +
+        `T${pad(d.getHours())}:${pad(d.getMinutes())}:${pad(d.getSeconds())}`;
+    // Dates travel as local ISO strings, like the MVC parameterMap METRC uses.
+    const toWire = value => {
+        if (value instanceof Date) { return localIso(value); }
+        if (Array.isArray(value)) { return value.map(toWire); }
+        if (value && typeof value === 'object') {
+            const copy = {};
+            for (const [key, item] of Object.entries(value)) { copy[key] = toWire(item); }
+            return copy;
+        }
+        return value;
+    };
+    const parseDate = text => {
+        const match = /^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})/.exec(text || '');
+        return match ? new Date(+match[1], match[2] - 1, +match[3], +match[4], +match[5], +match[6]) : null;
+    };
+    const normalizeFilter = filter => {
+        if (!filter) { return null; }
+        if (Array.isArray(filter)) {
+            filter = { logic: 'and', filters: filter };
+        } else if (!filter.filters) {
+            filter = { logic: 'and', filters: [filter] };
+        }
+        return filter.filters.length ? filter : null;
+    };
+    const resolve = (item, path) => path.split('.').reduce(
+        (current, key) => (current === null || current === undefined ? undefined : current[key]),
+        item,
+    );
+    const formatValue = value => {
+        if (value === null || value === undefined) { return ''; }
+        if (typeof value === 'boolean') { return value ? 'Yes' : 'No'; }
+        if (Array.isArray(value)) { return value.map(formatValue).filter(Boolean).join(', '); }
+        if (value instanceof Date) {
+            const day = `${pad(value.getMonth() + 1)}/${pad(value.getDate())}/${value.getFullYear()}`;
+            const midnight = !value.getHours() && !value.getMinutes() && !value.getSeconds();
+            return midnight ? day : `${day} ${pad(value.getHours())}:${pad(value.getMinutes())}`;
+        }
+        return String(value);
+    };
+    const escapeHtml = text => text.replace(/[&<>"']/g, ch => `&#${ch.charCodeAt(0)};`);
+
+    class DataSource extends Observable {
+        constructor(options) {
+            super();
+            this.options = options;
+            this.transport = { options: { read: options.transport.read } };
+            this._dateFields = (options.schema && options.schema.dateFields) || [];
+            this._page = 1;
+            this._pageSize = options.pageSize;
+            this._filter = null;
+            this._sort = [];
+            this._group = [];
+            this._data = [];
+            this._total = 0;
+        }
+
+        page(value) {
+            if (value === undefined) { return this._page; }
+            return this.query({ ...this._state(), page: value });
+        }
+
+        pageSize(value) {
+            if (value === undefined) { return this._pageSize; }
+            return this.query({ ...this._state(), page: 1, pageSize: value });
+        }
+
+        filter(value) {
+            if (value === undefined) { return this._filter; }
+            return this.query({ ...this._state(), page: 1, filter: value });
+        }
+
+        sort(value) {
+            if (value === undefined) { return this._sort; }
+            return this.query({ ...this._state(), sort: value });
+        }
+
+        group() { return this._group; }
+
+        total() { return this._total; }
+
+        view() { return this._data; }
+
+        read() { return this.query(this._state()); }
+
+        query(options) {
+            options = options || {};
+            this._filter = normalizeFilter(options.filter);
+            this._page = options.page || 1;
+            this._pageSize = options.pageSize || this._pageSize;
+            this._sort = options.sort || [];
+            this._group = options.group || [];
+            const read = this.transport.options.read;
+            const body = toWire({
+                take: this._pageSize,
+                skip: (this._page - 1) * this._pageSize,
+                page: this._page,
+                pageSize: this._pageSize,
+                sort: this._sort,
+                filter: this._filter,
+            });
+            this.trigger('requestStart', { type: 'read' });
+            return window.fetch(read.url, {
+                method: read.type,
+                credentials: 'same-origin',
+                headers: {
+                    'Content-Type': read.contentType,
+                    'X-Requested-With': 'XMLHttpRequest',
+                    Accept: 'application/json',
+                },
+                body: JSON.stringify(body),
+            })
+                .then(response => {
+                    if (!response.ok) { throw new Error(`HTTP ${response.status}`); }
+                    return response.json();
+                })
+                .then(
+                    payload => {
+                        this._data = payload.Data.map(record => this._model(record));
+                        this._total = payload.Total;
+                        this.trigger('requestEnd', { type: 'read', response: payload });
+                        this.trigger('change', {});
+                    },
+                    error => {
+                        this.trigger('requestEnd', { type: 'read' });
+                        this.trigger('error', { errorThrown: error });
+                        throw error;
+                    },
+                );
+        }
+
+        _state() {
+            return {
+                filter: this._filter,
+                page: this._page,
+                pageSize: this._pageSize,
+                sort: this._sort,
+                group: this._group,
+            };
+        }
+
+        _model(record) {
+            const item = { ...record };
+            for (const field of this._dateFields) {
+                if (typeof item[field] === 'string') { item[field] = parseDate(item[field]); }
+            }
+            return item;
+        }
+    }
+
+    const MENU_ITEMS = [
+        ['sortAsc', 'Sort Ascending'],
+        ['sortDesc', 'Sort Descending'],
+        ['columns', 'Columns'],
+        ['filter', 'Filter'],
+    ];
+    const OPERATORS = [
+        ['eq', 'Is equal to'],
+        ['neq', 'Is not equal to'],
+        ['startswith', 'Starts with'],
+        ['contains', 'Contains'],
+        ['endswith', 'Ends with'],
+    ];
+
+    const closePopups = () => {
+        for (const container of document.querySelectorAll('div.k-animation-container')) { container.remove(); }
+    };
+    const openPopup = (top, left, html) => {
+        const container = document.createElement('div');
+        container.className = 'k-animation-container';
+        container.style.cssText = `position: absolute; z-index: 10002; top: ${top}px; left: ${left}px;`;
+        container.innerHTML = `<div class="k-popup k-group k-reset">${html}</div>`;
+        document.body.appendChild(container);
+        return container;
+    };
+    document.addEventListener('mousedown', event => {
+        if (!event.target.closest('div.k-animation-container, a.k-header-column-menu')) { closePopups(); }
+    });
+
+    class Grid extends Observable {
+        constructor(element, options) {
+            super();
+            this.element = element;
+            this.options = options;
+            this.columns = options.columns;
+            this.dataSource = options.dataSource instanceof DataSource
+                ? options.dataSource
+                : new DataSource(options.dataSource);
+            this._render();
+            this.dataSource.bind('requestStart', () => this._loading(true));
+            this.dataSource.bind('requestEnd', () => this._loading(false));
+            this.dataSource.bind('change', () => {
+                this.refresh();
+                this.trigger('dataBound', {});
+            });
+            jQuery(element).data('kendoGrid', this);
+            if (options.autoBind !== false) { this.dataSource.read(); }
+        }
+
+        refresh() {
+            const tbody = this.element.querySelector('.k-grid-content tbody');
+            const items = this.dataSource.view();
+            tbody.innerHTML = items.length
+                ? items.map((item, index) => `<tr role="row" class="${index % 2 ? 'k-alt' : ''}">${this.columns.map(
+                    column => `<td role="gridcell" data-field="${column.field}">` +
+                        `${escapeHtml(formatValue(resolve(item, column.field)))}</td>`,
+                ).join('')}</tr>`).join('')
+                : `<tr class="k-grid-norecords"><td colspan="${this.columns.length}">No items to display</td></tr>`;
+            this._renderPager();
+        }
+
+        _render() {
+            this.element.classList.add('k-grid', 'k-widget');
+            this.element.setAttribute('data-role', 'grid');
+            const headers = this.columns.map(column => (
+                `<th class="k-header" role="columnheader" data-field="${column.field}" data-title="${column.title}">` +
+                '<a class="k-header-column-menu" href="#" title="Column Settings" tabindex="-1">' +
+                '<span class="k-icon k-i-more-vertical"></span></a>' +
+                `<span class="k-link">${escapeHtml(column.title)}</span></th>`
+            )).join('');
+            const nav = (kind, title, glyph) => (
+                `<a href="#" class="k-link k-pager-nav k-pager-${kind}" data-page="${kind}" ` +
+                `title="${title}" aria-label="${title}">${glyph}</a>`
+            );
+            this.element.innerHTML = (
+                '<div class="k-grid-header"><div class="k-grid-header-wrap"><table role="presentation">' +
+                `<thead class="k-grid-header"><tr>${headers}</tr></thead></table></div></div>` +
+                '<div class="k-grid-content"><table role="grid"><tbody></tbody></table></div>' +
+                '<div class="k-pager-wrap k-grid-pager">' +
+                nav('first', 'Go to the first page', '&laquo;') +
+                nav('prev', 'Go to the previous page', '&lsaquo;') +
+                '<span class="k-pager-input">Page <b class="k-pager-page">1</b> of <b class="k-pager-pages">1</b></span>' +
+                nav('next', 'Go to the next page', '&rsaquo;') +
+                nav('last', 'Go to the last page', '&raquo;') +
+                '<span class="k-pager-info k-label"></span></div>' +
+                '<div class="k-loading-mask" style="display: none;"><span class="k-loading-text">Loading...</span></div>'
+            );
+            this.element.addEventListener('click', event => {
+                const menuButton = event.target.closest('a.k-header-column-menu');
+                if (menuButton) {
+                    event.preventDefault();
+                    this._openColumnMenu(menuButton.closest('th'));
+                    return;
+                }
+                const navButton = event.target.closest('a.k-pager-nav');
+                if (navButton) {
+                    event.preventDefault();
+                    this._navigate(navButton);
+                }
+            });
+        }
+
+        _renderPager() {
+            const page = this.dataSource.page();
+            const pages = this._pageCount();
+            const size = this.dataSource.pageSize();
+            const total = this.dataSource.total();
+            for (const link of this.element.querySelectorAll('a.k-pager-nav')) {
+                const kind = link.dataset.page;
+                const disabled = (kind === 'first' || kind === 'prev') ? page <= 1 : page >= pages;
+                link.classList.toggle('k-state-disabled', disabled);
+            }
+            this.element.querySelector('.k-pager-page').textContent = String(page);
+            this.element.querySelector('.k-pager-pages').textContent = String(pages);
+            this.element.querySelector('.k-pager-info').textContent = total
+                ? `${(page - 1) * size + 1} - ${Math.min(page * size, total)} of ${total} items`
+                : 'No items to display';
+        }
+
+        _pageCount() {
+            return Math.max(1, Math.ceil(this.dataSource.total() / this.dataSource.pageSize()));
+        }
+
+        _navigate(link) {
+            if (link.classList.contains('k-state-disabled')) { return; }
+            const page = this.dataSource.page();
+            const target = {
+                first: 1,
+                prev: page - 1,
+                next: page + 1,
+                last: this._pageCount(),
+            }[link.dataset.page];
+            this.dataSource.page(target);
+        }
+
+        _loading(visible) {
+            this.element.querySelector('.k-loading-mask').style.display = visible ? 'block' : 'none';
+        }
+
+        _openColumnMenu(header) {
+            closePopups();
+            const rect = header.getBoundingClientRect();
+            const top = rect.bottom + window.scrollY;
+            const left = rect.left + window.scrollX;
+            const container = openPopup(top, left, (
+                '<ul class="k-menu k-menu-vertical k-column-menu" role="menu" tabindex="0">' +
+                MENU_ITEMS.map(([action, text]) => (
+                    `<li class="k-item" role="menuitem" data-action="${action}"><span class="k-link">${text}</span></li>`
+                )).join('') +
+                '</ul>'
+            ));
+            const list = container.querySelector('ul');
+            const items = Array.from(list.querySelectorAll('li.k-item'));
+            let active = 0;
+            const highlight = () => items.forEach((item, index) => item.classList.toggle('k-state-focused', index === active));
+            const activate = item => this._menuAction(item.dataset.action, header, top, left + container.offsetWidth);
+            list.addEventListener('keydown', event => {
+                if (event.key === 'ArrowDown') {
+                    active = Math.min(active + 1, items.length - 1);
+                } else if (event.key === 'ArrowUp') {
+                    active = Math.max(active - 1, 0);
+                } else if (event.key === 'Enter') {
+                    activate(items[active]);
+                } else if (event.key === 'Escape') {
+                    closePopups();
+                } else {
+                    return;
+                }
+                event.preventDefault();
+                highlight();
+            });
+            list.addEventListener('click', event => {
+                const item = event.target.closest('li.k-item');
+                if (item) { activate(item); }
+            });
+            highlight();
+            list.focus();
+        }
+
+        _menuAction(action, header, top, left) {
+            const field = header.dataset.field;
+            if (action === 'filter') {
+                this._openFilterMenu(field, top, left);
+                return;
+            }
+            closePopups();
+            if (action === 'sortAsc' || action === 'sortDesc') {
+                this.dataSource.sort([{ field, dir: action === 'sortAsc' ? 'asc' : 'desc' }]);
+            }
+        }
+
+        _openFilterMenu(field, top, left) {
+            for (const popup of document.querySelectorAll('div.k-animation-container')) {
+                if (popup.querySelector('form.k-filter-menu')) { popup.remove(); }
+            }
+            const column = this.columns.find(candidate => candidate.field === field);
+            const criteria = column.filterable === 'criteria';
+            const inputs = criteria
+                ? '<input type="text" class="k-textbox" title="Filter Criteria" placeholder="Search" autocomplete="off">'
+                : '<select data-role="dropdownlist" title="Operator">' +
+                    OPERATORS.map(([value, text]) => (
+                        `<option value="${value}"${value === 'contains' ? ' selected' : ''}>${text}</option>`
+                    )).join('') +
+                    '</select><input type="text" class="k-textbox" title="Value" autocomplete="off">';
+            const container = openPopup(top, left, (
+                '<form class="k-filter-menu"><div class="k-filter-menu-container">' +
+                '<div class="k-filter-help-text">Show items with value that:</div>' +
+                inputs +
+                '<div class="k-action-buttons">' +
+                '<button type="submit" class="k-button k-primary">Filter</button>' +
+                '<button type="reset" class="k-button">Clear</button>' +
+                '</div></div></form>'
+            ));
+            const form = container.querySelector('form');
+            form.addEventListener('submit', event => {
+                event.preventDefault();
+                const operator = criteria ? 'contains' : form.querySelector('select').value;
+                const value = form.querySelector('input[type="text"]').value.trim();
+                closePopups();
+                this._filterColumn(field, value ? { field, operator, value } : null);
+            });
+            form.addEventListener('reset', event => {
+                event.preventDefault();
+                closePopups();
+                this._filterColumn(field, null);
+            });
+        }
+
+        _filterColumn(field, condition) {
+            // Like the Kendo filter menu: replace this column's conditions, keep the others.
+            const touches = filter => (filter.filters ? filter.filters.every(touches) : filter.field === field);
+            const current = this.dataSource.filter();
+            const filters = (current ? current.filters : []).filter(filter => !touches(filter));
+            if (condition) { filters.push(condition); }
+            this.dataSource.filter(filters.length ? { logic: 'and', filters } : null);
+        }
+    }
+
+    window.jQuery = window.$ = jQuery;
+    window.kendo = { data: { DataSource }, ui: { Grid } };
+})(window, document);
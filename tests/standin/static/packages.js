@@ -0,0 +1,94 @@
+/* Packages page of the METRC stand-in: tab strip, system alerts, CSV Templates modal and the active grid. */
+(function (window, document) {
+    'use strict';
+
+    const config = window.STANDIN;
+    const COLUMNS = [
+        { field: 'Label', title: 'Tag' },
+        { field: 'SourceHarvestNames', title: "Src H's" },
+        { field: 'SourcePackageLabels', title: "Src Pkg's" },
+        { field: 'SourceProcessingJobNames', title: "Src Pj's" },
+        { field: 'LocationName', title: 'Location' },
+        { field: 'SublocationName', title: 'Sublocation' },
+        { field: 'Item.Name', title: 'Item' },
+        { field: 'Item.ProductCategoryName', title: 'Category' },
+        { field: 'Item.StrainName', title: 'Item Strain' },
+        { field: 'Quantity', title: 'Quantity' },
+        { field: 'UnitOfMeasureAbbreviation', title: 'UoM' },
+        { field: 'ProductionBatchNumber', title: 'P.B. No.' },
+        { field: 'LabTestingStateName', title: 'LT Status', filterable: 'criteria' },
+        { field: 'IsOnHold', title: 'A.H.' },
+        { field: 'PackagedDate', title: 'Date' },
+        { field: 'ReceivedDateTime', title: "Rcv'd" },
+        { field: 'LabTestResultExpirationDateTime', title: 'L.T.E.' },
+    ];
+    const ALERTS = [
+        ['MetrcHideNotificationAlert', 'alert-warning', 'Scheduled maintenance this Sunday from 02:00 to 04:00.'],
+        ['MetrcPackagesHideOnHoldNotice', 'alert-danger', 'Some packages are on hold pending an administrative review.'],
+    ];
+    const CSV_MODAL_SEEN = 'standinCsvTemplatesSeen';
+
+    const hasCookie = name => document.cookie.split(';').some(part => part.trim().startsWith(`${name}=`));
+
+    const showAlerts = () => {
+        const holder = document.getElementById('system-alerts');
+        for (const [cookieName, kind, text] of ALERTS) {
+            if (hasCookie(cookieName)) { continue; }
+            const alert = document.createElement('div');
+            alert.className = `alert ${kind}`;
+            alert.setAttribute('role', 'alert');
+            alert.innerHTML = `<span class="close" data-dismiss="alert" data-donotshow-cookiename="${cookieName}">&times;</span>${text}`;
+            holder.appendChild(alert);
+        }
+        holder.addEventListener('click', event => {
+            const close = event.target.closest("span[data-dismiss='alert']");
+            if (!close) { return; }
+            document.cookie = `${close.dataset.donotshowCookiename}=true; path=/`;
+            close.closest('.alert').remove();
+        });
+    };
+
+    const showCsvModal = () => {
+        if (window.localStorage.getItem(CSV_MODAL_SEEN)) { return; }
+        const backdrop = document.createElement('div');
+        backdrop.className = 'csv-templates-backdrop';
+        backdrop.innerHTML = (
+            '<div class="csv-templates-modal" role="dialog" aria-modal="true" aria-labelledby="csv-templates-title">' +
+            '<h2 id="csv-templates-title">New: CSV Templates</h2>' +
+            '<p>Download ready-made CSV templates for every bulk action from the toolbar.</p>' +
+            '<button type="button" class="Button__StyledButton-sc-3ecdced5-0">' +
+            '<div class="Button__StyledButtonInterior-sc-3ecdced5-4">Got It</div></button>' +
+            '</div>'
+        );
+        backdrop.querySelector('button').addEventListener('click', () => {
+            window.localStorage.setItem(CSV_MODAL_SEEN, '1');
+            backdrop.remove();
+        });
+        document.body.appendChild(backdrop);
+    };
+
+    const wireTabs = () => {
+        const tabs = Array.from(document.querySelectorAll('#packages_tabstrip li.k-item'));
+        tabs.forEach((tab, index) => tab.addEventListener('click', () => {
+            tabs.forEach((other, otherIndex) => {
+                other.classList.toggle('k-state-active', other === tab);
+                document.getElementById(`packages_tabstrip-${otherIndex + 1}`).style.display = other === tab ? 'block' : 'none';
+            });
+        }));
+    };
+
+    document.addEventListener('DOMContentLoaded', () => {
+        wireTabs();
+        if (config.system_alerts) { showAlerts(); }
+        new window.kendo.ui.Grid(document.getElementById('active-grid'), {
+            columns: COLUMNS,
+            pageable: { pageSizes: config.page_sizes },
+            dataSource: {
+                transport: { read: { url: config.data_url, type: 'POST', contentType: 'application/json' } },
+                pageSize: config.page_size,
+                schema: { dateFields: ['PackagedDate', 'ReceivedDateTime', 'LabTestResultExpirationDateTime'] },
+            },
+        });
+        if (config.csv_modal) { window.setTimeout(showCsvModal, config.modal_delay_ms); }
+    });
+})(window, document);
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+
+class FakePage:
+    def __init__(self, name: str, fail_after: int = -1) -> None:
+        self.name = name
+        self.fail_after = fail_after
+        self.verified = []
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def robot(offline_env, monkeypatch):
+    from src.automation.async_robot import AsyncMetrcRobot
+
+    robot = AsyncMetrcRobot(offline_env.playwright, tag_batch_size=2, verify_workers=4)
+    main = FakePage("main")
+    # One worker page never opens; another fails on its second unit.
+    openings = iter([FakePage("flaky", fail_after=1), RuntimeError("page crashed"), FakePage("steady")])
+
+    @asynccontextmanager
+    async def routine_page():
+        yield main
+
+    async def open_worker_page():
+        opened = next(openings)
+        if isinstance(opened, Exception):
+            raise opened
+        return opened
+
+    async def verify_unit(page, unit):
+        await asyncio.sleep(0)
+        if len(page.verified) == page.fail_after:
+            raise RuntimeError(f"{page.name} lost its session")
+        page.verified.append(unit)
+        return [{"metrc_id": metrc_id, "current_status": status, "fetched_status": status} for metrc_id, status in unit]
+
+    monkeypatch.setattr(robot, "_routine_page", routine_page)
+    monkeypatch.setattr(robot, "_open_worker_page", open_worker_page)
+    monkeypatch.setattr(robot, "_verify_unit", verify_unit)
+    return robot
+
+
+def test_failed_worker_pages_do_not_lose_their_tags(robot):
+    records = [{"Tag": f"TAG{index}", "LT Status": "TestingInProgress"} for index in range(12)]
+    emitted = []
+
+    outcomes = asyncio.run(robot.verify_status_by_tag(records, on_outcome=emitted.extend))
+
+    expected = [record["Tag"] for record in records]
+    assert [outcome["metrc_id"] for outcome in outcomes] == expected
+    assert sorted(outcome["metrc_id"] for outcome in emitted) == sorted(expected)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pytest
+
+WINDOW = (date(2026, 9, 18), date(2026, 10, 18))
+OTHER_WINDOW = (date(2026, 9, 19), date(2026, 10, 19))
+
+
+@pytest.fixture
+def RunCheckpoint(offline_env):
+    # src.services imports the pipeline, which needs src.config and its environment.
+    from src.services.checkpoint import RunCheckpoint
+
+    return RunCheckpoint
+
+
+def _records(*tags: str):
+    return [{"Tag": tag, "LT Status": "TestingInProgress"} for tag in tags]
+
+
+def _tags(records):
+    return [record["Tag"] for record in records]
+
+
+def _entries(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()[1:]]
+
+
+def test_fresh_checkpoint_writes_header_and_keeps_every_record(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = RunCheckpoint(path, WINDOW)
+
+    assert checkpoint.resumed == 0
+    assert checkpoint.carried == 0
+    assert json.loads(path.read_text(encoding="utf-8").splitlines()[0])["window"] == ["2026-09-18", "2026-10-18"]
+    assert _tags(checkpoint.pending(_records("A", "B", "C"))) == ["A", "B", "C"]
+
+
+def test_open_without_path_disables_the_checkpoint(RunCheckpoint):
+    assert RunCheckpoint.open("", WINDOW) is None
+
+
+def test_resume_on_same_window_skips_settled_tags(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    interrupted = RunCheckpoint(path, WINDOW)
+    interrupted.mark_done("A")
+    interrupted.mark_done("C")
+    interrupted.mark_done("A")  # Recorded once.
+
+    resumed = RunCheckpoint(path, WINDOW)
+
+    assert resumed.resumed == 2
+    assert _tags(resumed.pending(_records("A", "B", "C", "D"))) == ["B", "D"]
+    assert _entries(path) == [{"tag": "A"}, {"tag": "C"}]
+
+
+def test_resume_tolerates_a_truncated_last_line(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    interrupted = RunCheckpoint(path, WINDOW)
+    interrupted.mark_done("A")
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"tag": "B')
+
+    resumed = RunCheckpoint(path, WINDOW)
+    resumed.mark_done("C")
+
+    assert _tags(resumed.pending(_records("A", "B", "C"))) == ["B"]
+    assert RunCheckpoint(path, WINDOW).resumed == 2
+
+
+def test_other_window_discards_done_tags_but_carries_deferred_ones(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    previous = RunCheckpoint(path, WINDOW)
+    previous.mark_done("A")
+    previous.mark_deferred("D")
+    previous.mark_deferred("E")
+
+    current = RunCheckpoint(path, OTHER_WINDOW)
+
+    assert current.resumed == 0
+    assert current.carried == 2
+    assert json.loads(path.read_text(encoding="utf-8").splitlines()[0])["window"] == ["2026-09-19", "2026-10-19"]
+    assert _entries(path) == [{"deferred": "D"}, {"deferred": "E"}]
+    assert _tags(current.pending(_records("A", "B", "E", "D"))) == ["D", "E", "A", "B"]
+
+
+def test_pending_puts_carried_tags_first_in_deferral_order(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    previous = RunCheckpoint(path, WINDOW)
+    previous.mark_deferred("E")
+    previous.mark_deferred("C")
+    previous.complete()
+
+    current = RunCheckpoint(path, WINDOW)
+
+    assert _tags(current.pending(_records("A", "B", "C", "D", "E"))) == ["E", "C", "A", "B", "D"]
+
+
+def test_carried_tag_settled_before_a_crash_is_not_carried_again(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    previous = RunCheckpoint(path, WINDOW)
+    previous.mark_deferred("D")
+    previous.complete()
+    crashed = RunCheckpoint(path, WINDOW)
+    crashed.mark_done("D")
+
+    resumed = RunCheckpoint(path, WINDOW)
+
+    assert resumed.carried == 0
+    assert _tags(resumed.pending(_records("A", "D"))) == ["A"]
+
+
+def test_complete_removes_the_file_without_deferred_tags(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = RunCheckpoint(path, WINDOW)
+    checkpoint.mark_done("A")
+
+    checkpoint.complete()
+
+    assert not path.exists()
+
+
+def test_complete_keeps_only_this_runs_deferred_tags(RunCheckpoint, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    previous = RunCheckpoint(path, WINDOW)
+    previous.mark_deferred("C")
+    previous.complete()
+    checkpoint = RunCheckpoint(path, WINDOW)
+    checkpoint.mark_done("A")
+    checkpoint.mark_done("C")
+    checkpoint.mark_deferred("B")
+
+    checkpoint.complete()
+
+    assert _entries(path) == [{"deferred": "B"}]
+    following = RunCheckpoint(path, WINDOW)
+    assert following.resumed == 0
+    assert _tags(following.pending(_records("A", "B", "C"))) == ["B", "A", "C"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from tests.standin import DATA_PATH, StandInConfig, StandInServer
+from tests.standin.server import SESSION_COOKIE
+
+
+@pytest.fixture
+def fetch_labels(offline_env):
+    from playwright.sync_api import sync_playwright
+
+    from src.automation.data_client import GridEndpoint, MetrcDataClient
+
+    def fetch(config: StandInConfig, page_size: int = MetrcDataClient.DEFAULT_PAGE_SIZE, packages=None, **query):
+        with StandInServer(config) as server, sync_playwright() as playwright:
+            if packages is not None:
+                server.packages = packages
+            cookie = f"{SESSION_COOKIE}={server.open_session()}"
+            request = playwright.request.new_context(extra_http_headers={"Cookie": cookie})
+            try:
+                client = MetrcDataClient(request, GridEndpoint(server.url.rstrip("/") + DATA_PATH))
+                pages = list(client.iter_pages(page_size=page_size, **query))
+            finally:
+                request.dispose()
+            return [len(page) for page in pages], [row["Label"] for page in pages for row in page], server
+
+    return fetch
+
+
+def test_iter_pages_reads_every_page(fetch_labels):
+    sizes, labels, server = fetch_labels(StandInConfig(rows=45), page_size=20)
+
+    assert sizes == [20, 20, 5]
+    assert labels == [package["Label"] for package in server.packages]
+
+
+def test_iter_pages_keeps_going_when_the_server_caps_the_page_size(fetch_labels):
+    sizes, labels, server = fetch_labels(StandInConfig(rows=45, max_page_size=10), page_size=20)
+
+    assert sizes == [10, 10, 10, 10, 5]
+    assert labels == [package["Label"] for package in server.packages]
+
+
+def test_status_date_filter_keeps_rows_stamped_during_the_last_day(fetch_labels):
+    from src.automation.grid import status_date_filter
+
+    packages = [
+        {"Label": label, "LabTestingStateName": "TestingInProgress", "PackagedDate": packaged}
+        for label, packaged in (
+            ("before", "2026-10-11T23:59:59"),
+            ("first-day", "2026-10-12T00:00:00"),
+            ("last-day", "2026-10-18T14:30:00"),
+            ("after", "2026-10-19T00:00:00"),
+        )
+    ]
+    window = status_date_filter("TestingInProgress", date(2026, 10, 12), date(2026, 10, 18))
+
+    _, labels, _ = fetch_labels(StandInConfig(rows=0), packages=packages, filter=window)
+
+    assert labels == ["first-day", "last-day"]
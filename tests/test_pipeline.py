@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+PAGE_SIZE = 3
+
+
+class RobotError(Exception):
+    pass
+
+
+@pytest.fixture
+def pipeline(offline_env, monkeypatch):
+    from src.services import pipeline
+
+    bulk_settings = replace(offline_env, database=replace(offline_env.database, bulk_load=True))
+    monkeypatch.setattr(pipeline, "settings", bulk_settings)
+    return pipeline
+
+
+@pytest.fixture
+def merged(pipeline, monkeypatch):
+    """Rows the fake bulk load merged; it only commits once the stream ends normally."""
+    from src.db import InsertSummary
+
+    committed = []
+
+    def fake_bulk_insert_rows(table_name, rows, *, chunk_size=None):
+        staged = list(rows)
+        committed.extend(staged)
+        return InsertSummary(inserted=len(staged))
+
+    monkeypatch.setattr(pipeline, "bulk_insert_rows", fake_bulk_insert_rows)
+    return committed
+
+
+def _page(number):
+    return [{"Tag": f"P{number}-{index}"} for index in range(PAGE_SIZE)]
+
+
+def _pages_failing_after(count):
+    for number in range(count):
+        yield _page(number)
+    raise RobotError("grid stopped responding")
+
+
+async def _async_pages_failing_after(count):
+    for number in range(count):
+        await asyncio.sleep(0)
+        yield _page(number)
+    raise RobotError("grid stopped responding")
+
+
+def test_bulk_load_persists_every_page(pipeline, merged):
+    extracted, persisted = pipeline._persist_pages(_page(number) for number in range(4))
+
+    assert extracted == 4 * PAGE_SIZE
+    assert persisted.inserted == 4 * PAGE_SIZE
+    assert len(merged) == 4 * PAGE_SIZE
+
+
+def test_bulk_load_keeps_pages_yielded_before_a_robot_error(pipeline, merged):
+    with pytest.raises(RobotError):
+        pipeline._persist_pages(_pages_failing_after(2))
+
+    assert [row["Tag"] for row in merged] == [row["Tag"] for number in range(2) for row in _page(number)]
+
+
+def test_async_bulk_load_keeps_pages_yielded_before_a_robot_error(pipeline, merged):
+    with pytest.raises(RobotError):
+        asyncio.run(pipeline._persist_pages_async(_async_pages_failing_after(2)))
+
+    assert len(merged) == 2 * PAGE_SIZE
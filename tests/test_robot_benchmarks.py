@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from tests.standin import StandInServer
+from tests.standin.benchmark import measure
+
+pytestmark = pytest.mark.benchmark
+
+ROW_COUNTS = (10, 100, 1_000)
+DATE_RANGE_DAYS = 30
+
+# Per-cell locator extraction and per-tag UI filtering cost several round trips per row;
+# at 1,000 rows they only measure patience, so those cases stop at 100.
+FETCH_MODES = {
+    "widget": {"extraction_mode": "widget"},
+    "network": {"extraction_mode": "network"},
+    "dom": {"extraction_mode": "dom"},
+    "client": {"data_client": True},
+}
+FETCH_CASES = [
+    pytest.param(mode, rows, id=f"{mode}-{rows}")
+    for mode in FETCH_MODES
+    for rows in ROW_COUNTS
+    if mode != "dom" or rows <= 100
+]
+# Batch size per mode.
+VERIFY_MODES = {
+    "batch": (25, {}),
+    "single": (1, {}),
+    "client": (25, {"data_client": True}),
+}
+VERIFY_CASES = [
+    pytest.param(mode, rows, id=f"{mode}-{rows}")
+    for mode in VERIFY_MODES
+    for rows in ROW_COUNTS
+    if mode != "single" or rows <= 100
+]
+
+
+def _robot_config(settings, server: StandInServer, **overrides: object):
+    changes = {
+        "base_url": server.url,
+        "username": "standin",
+        "password": "standin",
+        "data_client": False,
+        "grid_data_url": "",
+        "grid_page_size": 0,
+        "storage_state_path": "",
+        "strategy_stats_path": "",
+    }
+    changes.update(overrides)
+    return replace(settings.playwright, **changes)
+
+
+@pytest.mark.parametrize("mode, rows", FETCH_CASES)
+def test_benchmark_fetch_table_rows(offline_env, chromium, standin, monkeypatch, mode, rows):
+    from src.automation.robot import MetrcRobot
+
+    server = standin(rows)
+    robot = MetrcRobot(_robot_config(offline_env, server, **FETCH_MODES[mode]), date_range_days=DATE_RANGE_DAYS)
+
+    with measure(f"fetch_table_rows[{mode}]", rows, server, monkeypatch):
+        fetched = robot.fetch_table_rows()
+
+    expected = {package["Label"] for package in server.target_packages(DATE_RANGE_DAYS)}
+    assert sorted(row["Tag"] for row in fetched) == sorted(expected)
+
+
+@pytest.mark.parametrize("mode, rows", VERIFY_CASES)
+def test_benchmark_verify_status_by_tag(offline_env, chromium, standin, monkeypatch, mode, rows):
+    from src.automation.robot import MetrcRobot
+
+    server = standin(rows)
+    batch_size, overrides = VERIFY_MODES[mode]
+    robot = MetrcRobot(
+        _robot_config(offline_env, server, **overrides),
+        date_range_days=DATE_RANGE_DAYS,
+        tag_batch_size=batch_size,
+    )
+    records = [{"Tag": package["Label"], "LT Status": "TestingInProgress"} for package in server.packages]
+
+    with measure(f"verify_status_by_tag[{mode}]", rows, server, monkeypatch):
+        outcomes = robot.verify_status_by_tag(records)
+
+    assert all(outcome["success"] for outcome in outcomes)
+    assert [outcome["fetched_status"] for outcome in outcomes] == [
+        package["LabTestingStateName"] for package in server.packages
+    ]
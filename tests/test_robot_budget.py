@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+
+class RecordingBudget:
+    def __init__(self, admit: bool = True) -> None:
+        self.allow = admit
+        self.admitted = []
+        self.recorded = []
+
+    def admit(self, tag_count):
+        self.admitted.append(tag_count)
+        return self.allow
+
+    def record(self, tag_count, seconds):
+        self.recorded.append(tag_count)
+
+
+@pytest.fixture
+def robot(offline_env, monkeypatch):
+    from src.automation.robot import MetrcRobot
+
+    robot = MetrcRobot(offline_env.playwright, tag_batch_size=3)
+    robot._budget = RecordingBudget()
+
+    def verify_single_tag(page, metrc_id, current_status):
+        return {"metrc_id": metrc_id, "current_status": current_status, "fetched_status": current_status}
+
+    monkeypatch.setattr(robot, "_verify_single_tag", verify_single_tag)
+    return robot
+
+
+def _items(count):
+    return [(f"TAG{index}", "TestingInProgress") for index in range(count)]
+
+
+def test_failed_batch_is_admitted_once_and_its_attempt_recorded(robot, monkeypatch):
+    def broken_batch(page, batch):
+        raise RuntimeError("grid widget went away")
+
+    monkeypatch.setattr(robot, "_verify_tag_batch", broken_batch)
+
+    outcomes = robot._verify_tags_in_batches(None, _items(5))
+
+    assert [outcome["metrc_id"] for outcome in outcomes] == [f"TAG{index}" for index in range(5)]
+    assert robot._budget.admitted == [3, 2]
+    # The failed batch attempt, then each tag verified one by one.
+    assert robot._budget.recorded == [3, 1, 1, 1, 2, 1, 1]
+
+
+def test_refused_batch_defers_its_tags(robot):
+    robot._budget.allow = False
+
+    outcomes = robot._verify_tags_in_batches(None, _items(4))
+
+    assert all(outcome["deferred"] for outcome in outcomes)
+    assert robot._budget.admitted == [3]
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import logging
 
-from src.automation.robot import MetrcRobot
-from src.config import settings
+import pytest
+
+try:
+    from src.automation.robot import MetrcRobot
+    from src.config import settings
+except RuntimeError as exc:  # src.config could not find the live METRC/PostgreSQL environment.
+    pytest.skip(str(exc), allow_module_level=True)
 
 
 def test_smoke_fetch_rows():
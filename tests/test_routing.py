@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def RequestBlocker(offline_env):
+    from src.automation.routing import RequestBlocker
+
+    return RequestBlocker
+
+
+def _routed(patterns, url):
+    return any(pattern.search(url) for pattern in patterns)
+
+
+def test_only_blocked_domains_and_extensions_are_routed(RequestBlocker):
+    patterns = RequestBlocker(["image", "font"], ["stonly.com"]).url_patterns()
+
+    assert _routed(patterns, "https://stonly.com/guide.js")
+    assert _routed(patterns, "https://cdn.stonly.com:443/widget?v=2")
+    assert _routed(patterns, "https://ca.metrc.com/Content/logo.PNG?v=7")
+    assert _routed(patterns, "https://ca.metrc.com/fonts/icons.woff2")
+    assert not _routed(patterns, "https://ca.metrc.com/industry/packages")
+    assert not _routed(patterns, "https://ca.metrc.com/api/packages/active?take=500")
+    assert not _routed(patterns, "https://notstonly.com/guide.js")
+    assert not _routed(patterns, "https://ca.metrc.com/media/mp4-notes.js")
+
+
+def test_resource_type_without_extensions_routes_everything(RequestBlocker):
+    assert RequestBlocker(["image", "stylesheet"], []).url_patterns() is None
+    assert RequestBlocker(["image", "stylesheet"], [])._routes() == ["**/*"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def scheduler_module(offline_env):
+    # src.services imports the pipeline, which needs src.config and its environment.
+    from src.services import scheduler
+
+    return scheduler
+
+
+@pytest.fixture
+def RunScheduler(scheduler_module):
+    return scheduler_module.RunScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch, scheduler_module):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler_module, "time", fake)
+    return fake
+
+
+def test_from_budget_disabled_without_a_positive_budget(RunScheduler):
+    assert RunScheduler.from_budget(0, 90) is None
+    assert RunScheduler.from_budget(None, 90) is None
+    assert RunScheduler.from_budget(-5, 90) is None
+
+
+def test_admit_uses_the_initial_estimate_before_any_sample(RunScheduler, clock):
+    scheduler = RunScheduler(100, reserve_seconds=20, initial_tag_seconds=5)
+
+    assert scheduler.admit(16)  # 16 * 5 + 20 == 100
+    assert not scheduler.admit(17)
+    assert scheduler.exhausted
+
+
+def test_admit_follows_the_remaining_time(RunScheduler, clock):
+    scheduler = RunScheduler(100, reserve_seconds=20, initial_tag_seconds=5)
+    clock.now += 70
+
+    assert scheduler.remaining() == 30
+    assert scheduler.admit(2)
+    assert not scheduler.admit(3)
+
+
+def test_record_turns_unit_durations_into_per_tag_samples(RunScheduler, clock):
+    scheduler = RunScheduler(1_000, reserve_seconds=0, initial_tag_seconds=5)
+
+    scheduler.record(10, 20.0)
+    scheduler.record(0, 99.0)  # Ignored: no tags verified.
+
+    assert scheduler.tag_latency() == 2.0
+    assert scheduler.admit(500)
+    assert not scheduler.admit(501)
+
+
+def test_tag_latency_is_the_rolling_p90(RunScheduler, clock):
+    scheduler = RunScheduler(1_000, window=10)
+    for seconds in range(1, 11):
+        scheduler.record(1, float(seconds))
+    assert scheduler.tag_latency() == 9.0
+
+    # Only the last ``window`` samples count.
+    for _ in range(10):
+        scheduler.record(1, 1.0)
+    assert scheduler.tag_latency() == 1.0
+
+
+def test_slow_units_shrink_what_is_admitted(RunScheduler, clock):
+    scheduler = RunScheduler(300, reserve_seconds=60, initial_tag_seconds=1)
+    assert scheduler.admit(25)
+
+    scheduler.record(1, 40.0)
+    clock.now += 40
+
+    assert scheduler.admit(5)  # 5 * 40 + 60 == 260 == remaining
+    assert not scheduler.admit(6)